@@ -0,0 +1,118 @@
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class ScoreSketch:
+    """Quantile sketch for validation scores, which always lie in [0, 10].
+
+    Scores are counted in fixed bins of width ``resolution``, so memory does
+    not grow with the number of emails. Quantiles are exact for scores on the
+    bin grid (such as the judge's integer scores) and within half a bin otherwise.
+    """
+    resolution: float = 0.01
+    low: float = 0.0
+    high: float = 10.0
+    counts: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.counts = np.zeros(int(round((self.high - self.low) / self.resolution)) + 1, dtype=np.int64)
+
+    def add(self, score: float) -> None:
+        position = int(round((min(max(score, self.low), self.high) - self.low) / self.resolution))
+        self.counts[position] += 1
+
+    def quantile(self, q: float) -> float:
+        total = int(self.counts.sum())
+        if total == 0:
+            return float("nan")
+        # The smallest bin whose cumulative count reaches a share q of all scores
+        rank = max(math.ceil(q * total), 1)
+        position = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return round(self.low + position * self.resolution, 10)
+
+
+@dataclass
+class RunningStats:
+    """Counts, costs and Welford mean/variance of one run's validation scores."""
+    scored: int = 0
+    score_total: float = 0.0
+    score_mean: float = 0.0
+    score_m2: float = 0.0
+    classification_cost: float = 0.0
+    evaluation_cost: float = 0.0
+    saved_cost: float = 0.0
+    sketch: ScoreSketch = field(default_factory=ScoreSketch, repr=False)
+
+    def add(self, result) -> None:
+        self.classification_cost += result.classification_cost
+        self.evaluation_cost += result.evaluation_cost
+        self.saved_cost += result.saved_cost
+        score = result.validation_score
+        if score is None:
+            # Errored; a later retry of the email may still be scored
+            return
+        self.score_total += score
+        self.scored += 1
+        delta = score - self.score_mean
+        self.score_mean += delta / self.scored
+        self.score_m2 += delta * (score - self.score_mean)
+        self.sketch.add(score)
+
+    @property
+    def score_std(self) -> float:
+        """Sample standard deviation of the scored emails."""
+        return math.sqrt(self.score_m2 / (self.scored - 1)) if self.scored > 1 else 0.0
+
+    def accuracy(self, num_emails: int) -> float:
+        """Mean score over ``num_emails``, counting errored and missing emails as 0."""
+        return self.score_total / num_emails if num_emails > 0 else 0
+
+
+class RunAggregator:
+    """Per-run RunningStats, updated one result at a time.
+
+    Only a fixed amount of state is kept per run, so the statistics of an
+    evaluation never require its results to be held in memory.
+    """
+
+    def __init__(self):
+        self.runs: Dict[int, RunningStats] = {}
+
+    def add(self, result) -> None:
+        stats = self.runs.get(result.run_id)
+        if stats is None:
+            stats = self.runs[result.run_id] = RunningStats()
+        stats.add(result)
+
+    def run(self, run_id: int) -> RunningStats:
+        return self.runs.get(run_id) or RunningStats()
+
+    def accuracies(self, email_counts: List[int]) -> List[float]:
+        return [self.run(run_id).accuracy(num_emails) for run_id, num_emails in enumerate(email_counts)]
+
+    def summaries(self, email_counts: List[int], quantiles: Optional[List[float]] = None) -> List[dict]:
+        """One row per run with its accuracy, costs and score distribution."""
+        quantiles = quantiles or [0.1, 0.5, 0.9]
+        rows = []
+        for run_id, num_emails in enumerate(email_counts):
+            stats = self.run(run_id)
+            row = {
+                'run_id': run_id,
+                'accuracy': stats.accuracy(num_emails),
+                'emails': num_emails,
+                'scored': stats.scored,
+                'unscored': max(num_emails - stats.scored, 0),
+                'score_mean': stats.score_mean if stats.scored else float("nan"),
+                'score_std': stats.score_std,
+                'classification_cost': stats.classification_cost,
+                'evaluation_cost': stats.evaluation_cost,
+                'saved_cost': stats.saved_cost
+            }
+            for q in quantiles:
+                row[f'score_p{round(q * 100)}'] = stats.sketch.quantile(q)
+            rows.append(row)
+        return rows
@@ -0,0 +1,404 @@
+import json
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pre_scorer import RuleBasedPreScorer
+from prompt_evaluation_pipeline import (
+    CallStats,
+    CostCalculator,
+    EmailSource,
+    EvaluationResult,
+    PromptEvaluationPipeline,
+    PromptExecutor,
+    TokenUsage,
+    _build_messages,
+    _parse_json_content,
+)
+from prompt_template import PromptTemplate
+from rate_limiter import estimate_tokens
+
+if TYPE_CHECKING:
+    from metrics import GoldLabels
+
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+# The Batch API accepts input files of up to 200 MB; stay safely below that
+MAX_BATCH_FILE_BYTES = 190 * 1024 * 1024
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchBackend(ABC):
+    """Submits JSONL request files in the OpenAI Batch API format and returns their results."""
+
+    @abstractmethod
+    def submit(self, input_path: str) -> str:
+        """Submit a request file and return the batch id."""
+
+    @abstractmethod
+    def status(self, batch_id: str) -> str:
+        """Return the batch status, e.g. ``in_progress`` or ``completed``."""
+
+    @abstractmethod
+    def output_lines(self, batch_id: str) -> Iterator[dict]:
+        """Yield the result line of every finished request, successful or not."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """Runs batches through the OpenAI Batch API."""
+
+    def __init__(self, api_key: str, completion_window: str = "24h"):
+        import openai
+
+        self.client = openai.OpenAI(api_key=api_key)
+        self.completion_window = completion_window
+
+    def submit(self, input_path: str) -> str:
+        with open(input_path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def output_lines(self, batch_id: str) -> Iterator[dict]:
+        batch = self.client.batches.retrieve(batch_id)
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if line.strip():
+                    yield json.loads(line)
+
+
+class LocalBatchBackend(BatchBackend):
+    """File-based stand-in for the Batch API, for tests and dry runs.
+
+    ``respond`` receives the chat messages of each request and returns the
+    completion text. Token usage is estimated from the text lengths. A batch
+    reports ``in_progress`` for ``polls_until_complete`` status checks before
+    it completes.
+    """
+
+    def __init__(self, work_dir: str, respond: Callable[[List[dict]], str], polls_until_complete: int = 0):
+        self.work_dir = work_dir
+        self.respond = respond
+        self.polls_until_complete = polls_until_complete
+        self.remaining_polls: Dict[str, int] = {}
+        os.makedirs(work_dir, exist_ok=True)
+
+    def _output_path(self, batch_id: str) -> str:
+        return os.path.join(self.work_dir, f"{batch_id}_output.jsonl")
+
+    def submit(self, input_path: str) -> str:
+        batch_id = f"batch_local_{uuid.uuid4().hex[:12]}"
+        with open(input_path, encoding="utf-8") as source, \
+                open(self._output_path(batch_id), "w", encoding="utf-8") as output:
+            for line in source:
+                request = json.loads(line)
+                messages = request["body"]["messages"]
+                result = {"id": f"req_{uuid.uuid4().hex[:12]}", "custom_id": request["custom_id"]}
+                try:
+                    content = self.respond(messages)
+                except Exception as e:
+                    result.update(response=None, error={"code": type(e).__name__, "message": str(e)})
+                else:
+                    prompt_text = "".join(message["content"] for message in messages)
+                    result.update(error=None, response={
+                        "status_code": 200,
+                        "body": {
+                            "model": request["body"]["model"],
+                            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                            "usage": {
+                                "prompt_tokens": estimate_tokens(prompt_text),
+                                "completion_tokens": estimate_tokens(content)
+                            }
+                        }
+                    })
+                output.write(json.dumps(result) + "\n")
+        self.remaining_polls[batch_id] = self.polls_until_complete
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        if self.remaining_polls[batch_id] > 0:
+            self.remaining_polls[batch_id] -= 1
+            return "in_progress"
+        return "completed"
+
+    def output_lines(self, batch_id: str) -> Iterator[dict]:
+        with open(self._output_path(batch_id), encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class BatchRequestError(Exception):
+    """A request that did not produce a usable result; carries its call bookkeeping."""
+
+    def __init__(self, message: str, stats: Optional[CallStats] = None):
+        super().__init__(message)
+        self.stats = stats
+
+
+@dataclass
+class BatchResult:
+    output: Optional[dict]
+    cost: float
+    stats: CallStats = field(default_factory=CallStats)
+    error: Optional[str] = None
+
+
+class BatchExecutor(PromptExecutor):
+    """Executes prompts through an offline batch backend at batch prices.
+
+    ``execute_batch`` writes the prompts as JSONL request files to
+    ``work_dir``, starting a new file before one would exceed
+    ``max_requests_per_batch`` requests or ``max_bytes_per_batch`` bytes. It
+    submits them, polls every ``poll_interval`` seconds until they finish and
+    returns the results keyed like the input.
+    ``execute`` runs a single prompt as its own batch, which is slow; it only
+    exists so the executor fits where a PromptExecutor is expected.
+    """
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        model: str,
+        temperature: float = 0.0,
+        work_dir: str = "evaluation_results/batches",
+        poll_interval: float = 60.0,
+        max_requests_per_batch: int = 50000,
+        max_bytes_per_batch: int = MAX_BATCH_FILE_BYTES,
+        timeout: Optional[float] = None,
+        split_messages: bool = False
+    ):
+        super().__init__(model, temperature)
+        CostCalculator.pricing(model)
+        self.backend = backend
+        self.work_dir = work_dir
+        self.poll_interval = poll_interval
+        self.max_requests_per_batch = max_requests_per_batch
+        self.max_bytes_per_batch = max_bytes_per_batch
+        self.timeout = timeout
+        self.split_messages = split_messages
+
+    def execute(self, prompt: str) -> Tuple[dict, float]:
+        output, cost, _ = self.execute_with_stats(prompt)
+        return output, cost
+
+    def execute_with_stats(self, prompt: str) -> Tuple[dict, float, CallStats]:
+        result = self.execute_batch({"0": prompt})["0"]
+        if result.error is not None:
+            raise BatchRequestError(result.error, result.stats)
+        return result.output, result.cost, result.stats
+
+    def _request_line(self, custom_id: str, prompt: str) -> bytes:
+        return (json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": {
+                "model": self.model,
+                "messages": _build_messages(prompt, self.split_messages),
+                "temperature": self.temperature
+            }
+        }) + "\n").encode("utf-8")
+
+    def _write_requests(self, lines: List[bytes], name: str) -> str:
+        path = os.path.join(self.work_dir, f"{name}.jsonl")
+        with open(path, "wb") as f:
+            f.writelines(lines)
+        return path
+
+    def _request_files(self, prompts: Dict[str, str]) -> Iterator[List[bytes]]:
+        """Group the request lines into files within the request and byte limits."""
+        lines: List[bytes] = []
+        size = 0
+        for custom_id, prompt in prompts.items():
+            line = self._request_line(custom_id, prompt)
+            if len(line) > self.max_bytes_per_batch:
+                raise ValueError(f"Request {custom_id} alone is larger than {self.max_bytes_per_batch} bytes")
+            if lines and (len(lines) >= self.max_requests_per_batch or size + len(line) > self.max_bytes_per_batch):
+                yield lines
+                lines, size = [], 0
+            lines.append(line)
+            size += len(line)
+        if lines:
+            yield lines
+
+    def _wait(self, batch_ids: List[str]) -> Dict[str, str]:
+        started = time.monotonic()
+        statuses = {batch_id: self.backend.status(batch_id) for batch_id in batch_ids}
+        while not all(status in TERMINAL_STATUSES for status in statuses.values()):
+            if self.timeout is not None and time.monotonic() - started > self.timeout:
+                raise TimeoutError(f"Batches still running after {self.timeout}s: {', '.join(statuses)}")
+            time.sleep(self.poll_interval)
+            for batch_id, status in statuses.items():
+                if status not in TERMINAL_STATUSES:
+                    statuses[batch_id] = self.backend.status(batch_id)
+            print(f"Batch status: {', '.join(f'{b}={s}' for b, s in statuses.items())}")
+        return statuses
+
+    def _parse_line(self, line: dict) -> BatchResult:
+        response = line.get("response") or {}
+        body = response.get("body") or {}
+        usage = body.get("usage") or {}
+        token_usage = TokenUsage(
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            cached_tokens=(usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        )
+        breakdown = CostCalculator.breakdown(token_usage, self.model, batch=True)
+        stats = CallStats()
+        stats.add_usage(breakdown)
+
+        if line.get("error") or response.get("status_code") != 200:
+            error = line.get("error") or body.get("error") or {}
+            return BatchResult(None, breakdown.total, stats, error.get("message") or "Batch request failed")
+        try:
+            output = _parse_json_content(body["choices"][0]["message"]["content"])
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            return BatchResult(None, breakdown.total, stats, f"Could not parse batch response: {e}")
+        return BatchResult(output, breakdown.total, stats)
+
+    def execute_batch(self, prompts: Dict[str, str]) -> Dict[str, BatchResult]:
+        """Run all ``prompts`` as offline batches and return their results by key."""
+        os.makedirs(self.work_dir, exist_ok=True)
+        name = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        batch_ids = []
+        for lines in self._request_files(prompts):
+            batch_ids.append(self.backend.submit(self._write_requests(lines, f"{name}_{len(batch_ids)}")))
+        print(f"Submitted {len(prompts)} requests in {len(batch_ids)} batch(es)")
+
+        statuses = self._wait(batch_ids)
+        results: Dict[str, BatchResult] = {}
+        for batch_id in batch_ids:
+            for line in self.backend.output_lines(batch_id):
+                if line.get("custom_id") in prompts:
+                    results[line["custom_id"]] = self._parse_line(line)
+        for key in prompts:
+            if key not in results:
+                results[key] = BatchResult(None, 0.0, CallStats(attempts=0), f"No result in batch output ({', '.join(set(statuses.values()))})")
+        return results
+
+
+class BatchEvaluationPipeline(PromptEvaluationPipeline):
+    """PromptEvaluationPipeline that runs each run as two offline batches.
+
+    All classification requests of a run go into one batch. Once it finishes,
+    the evaluation requests for the successful classifications are built and
+    submitted as a second batch. Results, checkpoints, statistics and plots
+    are the same as for the interactive pipeline, at batch prices. Other
+    keyword arguments, such as ``plots``, ``recorder`` or ``results_store``,
+    are passed on to PromptEvaluationPipeline.
+    """
+
+    def __init__(
+        self,
+        classification_executor: BatchExecutor,
+        evaluation_executor: Optional[BatchExecutor],
+        pre_scorer: Optional[RuleBasedPreScorer] = None,
+        gold_labels: Optional["GoldLabels"] = None,
+        **kwargs
+    ):
+        super().__init__(
+            classification_executor,
+            evaluation_executor,
+            max_threads=1,
+            pre_scorer=pre_scorer,
+            gold_labels=gold_labels,
+            **kwargs
+        )
+
+    def process_dataset(
+        self,
+        emails: EmailSource,
+        classification_prompt: PromptTemplate,
+        evaluation_prompt: PromptTemplate,
+        run_id: int,
+        completed,
+        on_result: Callable[[EvaluationResult], None]
+    ) -> int:
+        processor = self.processor
+        pending = {}
+        num_emails = 0
+        for email_id, email_data in emails:
+            num_emails += 1
+            if (run_id, email_id) not in completed:
+                pending[str(email_id)] = (email_id, email_data)
+        if not pending:
+            return num_emails
+
+        print(f"Run {run_id + 1}: classifying {len(pending)} emails in batch")
+        classifications = processor.classification_executor.execute_batch({
+            key: processor._classification_input(email_data, classification_prompt)
+            for key, (_, email_data) in pending.items()
+        })
+
+        to_evaluate = {}
+        for key, (email_id, email_data) in pending.items():
+            classification = classifications[key]
+            if classification.error is not None:
+                error = BatchRequestError(classification.error, classification.stats)
+                on_result(processor._error_result(email_data, error, email_id, run_id))
+                continue
+            pre_score = processor.pre_scorer.check(classification.output, classification_prompt) if processor.pre_scorer else None
+            if pre_score is not None and pre_score.fast_fail:
+                on_result(processor._pre_scored_result(
+                    email_data, classification.output, pre_score,
+                    classification.cost, email_id, run_id, classification.stats
+                ))
+            elif processor.gold_labels is not None:
+                try:
+                    validation_result = processor.gold_labels.validation(email_id, classification.output)
+                except KeyError as e:
+                    on_result(processor._error_result(email_data, e, email_id, run_id, classification.stats))
+                    continue
+                if pre_score is not None:
+                    validation_result = pre_score.apply(validation_result)
+                on_result(processor._success_result(
+                    email_data, classification.output, validation_result,
+                    classification.cost, 0.0, email_id, run_id,
+                    classification.stats, CallStats(attempts=0), pre_score
+                ))
+            else:
+                to_evaluate[key] = (classification, pre_score)
+
+        if to_evaluate:
+            print(f"Run {run_id + 1}: evaluating {len(to_evaluate)} classifications in batch")
+            evaluations = processor.evaluation_executor.execute_batch({
+                key: processor._validation_input(pending[key][1], evaluation_prompt, classification.output)
+                for key, (classification, _) in to_evaluate.items()
+            })
+            for key, (classification, pre_score) in to_evaluate.items():
+                email_id, email_data = pending[key]
+                evaluation = evaluations[key]
+                if evaluation.error is not None:
+                    error = BatchRequestError(evaluation.error, evaluation.stats)
+                    on_result(processor._error_result(email_data, error, email_id, run_id, classification.stats))
+                    continue
+                try:
+                    validation_result = evaluation.output
+                    if pre_score is not None:
+                        validation_result = pre_score.apply(validation_result)
+                    result = processor._success_result(
+                        email_data, classification.output, validation_result,
+                        classification.cost, evaluation.cost, email_id, run_id,
+                        classification.stats, evaluation.stats, pre_score
+                    )
+                except (KeyError, TypeError) as e:
+                    # The judge answered without a usable score
+                    error = BatchRequestError(f"Malformed evaluation response: {e}", evaluation.stats)
+                    result = processor._error_result(email_data, error, email_id, run_id, classification.stats)
+                on_result(result)
+
+        return num_emails
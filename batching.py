@@ -0,0 +1,239 @@
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from prompt_evaluation_pipeline import CallStats, CostCalculator, PromptExecutor, TokenUsage
+from prompt_template import RenderedPrompt
+from rate_limiter import estimate_tokens
+
+
+# (context window, maximum output tokens) per model; dated snapshots match by prefix
+MODEL_LIMITS: Dict[str, Tuple[int, int]] = {
+    "gpt-4o-mini": (128000, 16384),
+    "gpt-4o": (128000, 16384),
+    "gpt-4": (8192, 8192),
+}
+
+BATCH_INSTRUCTIONS = """
+## Batch Input
+
+The input contains {count} emails, each introduced by a `### Email <id>` heading. Classify every email independently, exactly as described above for a single email. Return a **JSON array** with one object per email, in input order. Each object uses the output format above plus an `"id"` field holding the email's id as a number.
+"""
+
+
+def model_limits(model: str) -> Tuple[int, int]:
+    """Look up the context window and output limit of ``model``."""
+    matches = [name for name in MODEL_LIMITS if model == name or model.startswith(name + "-")]
+    if not matches:
+        raise ValueError(f"No context limits known for model {model}; pass context_tokens and max_output_tokens")
+    return MODEL_LIMITS[max(matches, key=len)]
+
+
+def _merge_stats(first: CallStats, second: CallStats) -> CallStats:
+    return CallStats(
+        attempts=first.attempts + second.attempts,
+        backoff_seconds=first.backoff_seconds + second.backoff_seconds,
+        cache_hit=first.cache_hit and second.cache_hit,
+        saved_cost=first.saved_cost + second.saved_cost,
+        prompt_tokens=first.prompt_tokens + second.prompt_tokens,
+        cached_tokens=first.cached_tokens + second.cached_tokens,
+        completion_tokens=first.completion_tokens + second.completion_tokens,
+        rate_limit_wait_seconds=first.rate_limit_wait_seconds + second.rate_limit_wait_seconds,
+        parse_seconds=first.parse_seconds + second.parse_seconds
+    )
+
+
+def _stats_cost(stats: CallStats, model: str) -> float:
+    """Cost of the tokens recorded in ``stats``."""
+    if not (stats.prompt_tokens or stats.completion_tokens):
+        return 0.0
+    usage = TokenUsage(stats.prompt_tokens, stats.completion_tokens, stats.cached_tokens)
+    return CostCalculator.calculate(usage, model)
+
+
+class BatchingExecutor(PromptExecutor):
+    """Packs concurrent single-email calls into one request that returns a JSON array.
+
+    Calls made from the pipeline's worker threads are queued. Once
+    ``batch_size`` prompts that share the same static prefix and suffix are
+    waiting, or ``max_wait`` seconds have passed, they are sent as one request:
+    the shared instructions appear once, followed by each email under an id.
+    Each caller then gets its own entry of the returned array, with an even
+    share of the request's cost and tokens.
+
+    Batches also stop growing when the estimated input would exceed the
+    model's context window, or the expected output its output limit, scaled
+    by ``headroom``. A missing, malformed or truncated entry falls back to a
+    single-email call. When this happens, ``batch_size`` is halved. It grows
+    back by one after every ``grow_after`` clean batches, up to ``max_batch_size``.
+    """
+
+    def __init__(
+        self,
+        executor: PromptExecutor,
+        max_batch_size: int = 10,
+        max_wait: float = 0.05,
+        expected_output_tokens: int = 256,
+        context_tokens: Optional[int] = None,
+        max_output_tokens: Optional[int] = None,
+        headroom: float = 0.8,
+        grow_after: int = 3
+    ):
+        super().__init__(executor.model, executor.temperature)
+        if context_tokens is None or max_output_tokens is None:
+            default_context, default_output = model_limits(executor.model)
+            context_tokens = context_tokens or default_context
+            max_output_tokens = max_output_tokens or default_output
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.expected_output_tokens = expected_output_tokens
+        self.input_budget = int(context_tokens * headroom)
+        self.output_budget = int(max_output_tokens * headroom)
+        self.grow_after = grow_after
+        self.clean_batches = 0
+        self.batches = 0
+        self.batched_calls = 0
+        self.fallbacks = 0
+        self.lock = threading.Lock()
+        self.pending: List[Tuple[RenderedPrompt, Future]] = []
+        self.timer: Optional[threading.Timer] = None
+
+    def execute(self, prompt: str) -> Tuple[dict, float]:
+        output, cost, _ = self.execute_with_stats(prompt)
+        return output, cost
+
+    def execute_with_stats(self, prompt: str) -> Tuple[dict, float, CallStats]:
+        if not (isinstance(prompt, RenderedPrompt) and prompt.prefix_length and prompt.suffix_length):
+            return self.executor.execute_with_stats(prompt)
+
+        future: Future = Future()
+        with self.lock:
+            self.pending.append((prompt, future))
+            batch = self._take_batch(force=False)
+            if self.pending and self.timer is None:
+                self.timer = threading.Timer(self.max_wait, self._flush)
+                self.timer.daemon = True
+                self.timer.start()
+        if batch:
+            self._run_batch(batch)
+
+        output, cost, stats = future.result()
+        if output is not None:
+            return output, cost, stats
+
+        # Not answered by the batch: classify on its own, keeping the batch share
+        with self.lock:
+            self.fallbacks += 1
+        single_output, single_cost, single_stats = self.executor.execute_with_stats(prompt)
+        return single_output, cost + single_cost, _merge_stats(stats, single_stats)
+
+    def _take_batch(self, force: bool) -> Optional[List[Tuple[RenderedPrompt, Future]]]:
+        """Remove and return the next batch, or None if it is not full yet. Caller holds the lock."""
+        if not self.pending:
+            return None
+        head = self.pending[0][0]
+        prefix, suffix = head[:head.prefix_length], head[len(head) - head.suffix_length:]
+        input_tokens = estimate_tokens(prefix + suffix + BATCH_INSTRUCTIONS)
+        output_tokens = 0
+        selected = []
+        budget_exhausted = False
+        for item in self.pending:
+            prompt = item[0]
+            if (prompt.prefix_length != len(prefix) or prompt.suffix_length != len(suffix)
+                    or not prompt.startswith(prefix) or not prompt.endswith(suffix)):
+                continue
+            item_tokens = estimate_tokens(prompt.variable_part) + self.expected_output_tokens
+            if selected and (
+                input_tokens + item_tokens > self.input_budget
+                or output_tokens + self.expected_output_tokens > self.output_budget
+            ):
+                budget_exhausted = True
+                break
+            selected.append(item)
+            input_tokens += item_tokens
+            output_tokens += self.expected_output_tokens
+            if len(selected) >= self.batch_size:
+                break
+
+        if not force and not budget_exhausted and len(selected) < self.batch_size:
+            return None
+        taken = {id(item) for item in selected}
+        self.pending = [item for item in self.pending if id(item) not in taken]
+        return selected
+
+    def _flush(self) -> None:
+        """Send everything still queued once ``max_wait`` has passed."""
+        batches = []
+        with self.lock:
+            self.timer = None
+            while self.pending:
+                batches.append(self._take_batch(force=True))
+        for batch in batches[1:]:
+            threading.Thread(target=self._run_batch, args=(batch,), daemon=True).start()
+        if batches:
+            self._run_batch(batches[0])
+
+    def _batch_prompt(self, batch: List[Tuple[RenderedPrompt, Future]]) -> RenderedPrompt:
+        head = batch[0][0]
+        prefix = head[:head.prefix_length]
+        suffix = head[len(head) - head.suffix_length:]
+        items = "".join(
+            f"### Email {item_id}\n\n{prompt.variable_part}\n"
+            for item_id, (prompt, _) in enumerate(batch, start=1)
+        )
+        batch_instructions = BATCH_INSTRUCTIONS.format(count=len(batch))
+        return RenderedPrompt(prefix + items + suffix + batch_instructions, len(prefix))
+
+    def _run_batch(self, batch: List[Tuple[RenderedPrompt, Future]]) -> None:
+        if len(batch) == 1:
+            batch[0][1].set_result((None, 0.0, CallStats(attempts=0)))
+            return
+
+        try:
+            output, cost, stats = self.executor.execute_with_stats(self._batch_prompt(batch))
+        except Exception as error:
+            # Typically a failed parse of the whole array; retry every item on its own.
+            # The tokens of the failed attempts were still billed, so price them
+            output = []
+            stats = getattr(error, "stats", None) or CallStats()
+            cost = _stats_cost(stats, self.executor.model)
+
+        entries = output.get("results", []) if isinstance(output, dict) else output
+        answers: Dict[int, dict] = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                item_id = int(entry.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if 1 <= item_id <= len(batch) and item_id not in answers:
+                answers[item_id] = {key: value for key, value in entry.items() if key != "id"}
+
+        count = len(batch)
+        share = CallStats(
+            attempts=stats.attempts,
+            backoff_seconds=stats.backoff_seconds,
+            saved_cost=stats.saved_cost / count,
+            prompt_tokens=stats.prompt_tokens // count,
+            cached_tokens=stats.cached_tokens // count,
+            completion_tokens=stats.completion_tokens // count,
+            rate_limit_wait_seconds=stats.rate_limit_wait_seconds,
+            parse_seconds=stats.parse_seconds
+        )
+        with self.lock:
+            self.batches += 1
+            self.batched_calls += len(answers)
+            if len(answers) < count:
+                self.batch_size = max(1, count // 2)
+                self.clean_batches = 0
+            else:
+                self.clean_batches += 1
+                if self.clean_batches >= self.grow_after and self.batch_size < self.max_batch_size:
+                    self.batch_size += 1
+                    self.clean_batches = 0
+
+        for item_id, (_, future) in enumerate(batch, start=1):
+            future.set_result((answers.get(item_id), cost / count, share))
@@ -0,0 +1,207 @@
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing import get_context
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from batching import BatchingExecutor
+from prompt_evaluation_pipeline import EmailStore, PromptEvaluationPipeline
+from replay import AsyncReplayExecutor, Latency, ReplayExecutor, ReplayResponses
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+MODES = ("threaded", "async", "batched")
+SIZES = (720, 10_000, 100_000, 1_000_000)
+
+# Interpreter arguments of each cold-start case; "interpreter" is the baseline
+STARTUP_CASES = {
+    "interpreter": ["-c", "pass"],
+    "import pipeline": ["-c", "import prompt_evaluation_pipeline"],
+    "run_evaluation.py --help": ["run_evaluation.py", "--help"],
+    "import openai": ["-c", "import openai"],
+    "import pandas": ["-c", "import pandas"],
+    "import plotly": ["-c", "import plotly.express"],
+}
+
+
+@dataclass
+class BenchmarkResult:
+    mode: str
+    emails: int
+    concurrency: int
+    seconds: float
+    emails_per_second: float
+    finalize_seconds: float
+    busy_seconds: float
+    overhead_seconds: float
+    overhead_us_per_email: float
+    peak_memory_mb: Optional[float]
+    memory_growth_mb: Optional[float]
+
+
+class _BenchmarkPipeline(PromptEvaluationPipeline):
+    """Times the finalization step."""
+
+    finalize_seconds = 0.0
+
+    def _finalize_runs(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super()._finalize_runs(*args, **kwargs)
+        finally:
+            self.finalize_seconds = time.perf_counter() - started
+
+
+def synthetic_emails(size: int, dataset_path: str = "datasets/combined_dataset.csv") -> EmailStore:
+    """An EmailStore of ``size`` emails that cycles through the rows of ``dataset_path``.
+
+    Repeated rows share their strings, so even a million emails take only a
+    few tens of megabytes.
+    """
+    source = EmailStore.from_csv(dataset_path)
+    positions = [position % len(source) for position in range(size)]
+    return EmailStore(
+        ids=range(size),
+        subjects=[source.subjects[p] for p in positions],
+        senders=[source.senders[p] for p in positions],
+        recipients=[source.recipients[p] for p in positions],
+        bodies=[source.bodies[p] for p in positions]
+    )
+
+
+def _peak_memory_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_case(
+    mode: str,
+    size: int,
+    concurrency: int = 16,
+    latency: Optional[Latency] = None,
+    error_rate: float = 0.0,
+    results_pattern: str = "evaluation_results/**/all_runs_*.csv",
+    dataset_path: str = "datasets/combined_dataset.csv"
+) -> BenchmarkResult:
+    """Run one evaluation run of ``size`` synthetic emails against replayed responses.
+
+    Wall time covers the whole run_multiple_evaluations call, including the
+    checkpoint and the results CSV but not the plots. Scheduler overhead is
+    the wall time, minus finalization, minus the simulated API time divided
+    by ``concurrency``.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}; expected one of {MODES}")
+    from prompts.evaluation_prompt_01 import system_prompt as evaluation_prompt
+    from prompts.prompt_03 import system_prompt as classification_prompt
+
+    responses = ReplayResponses.from_results(results_pattern)
+    emails = synthetic_emails(size, dataset_path)
+    executor_class = AsyncReplayExecutor if mode == "async" else ReplayExecutor
+    executors = [
+        executor_class(responses, stage, model="gpt-4o-mini", latency=latency, error_rate=error_rate, seed=seed)
+        for seed, stage in enumerate(("classification", "evaluation"))
+    ]
+    classification_executor = BatchingExecutor(executors[0]) if mode == "batched" else executors[0]
+    pipeline = _BenchmarkPipeline(
+        classification_executor, executors[1], max_threads=concurrency, plots=False
+    )
+    baseline_mb = _peak_memory_mb()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        started = time.perf_counter()
+        if mode == "async":
+            asyncio.run(pipeline.arun_multiple_evaluations(
+                emails, output_dir, classification_prompt, evaluation_prompt, num_runs=1
+            ))
+        else:
+            pipeline.run_multiple_evaluations(
+                emails, output_dir, classification_prompt, evaluation_prompt, num_runs=1
+            )
+        seconds = time.perf_counter() - started
+
+    peak_mb = _peak_memory_mb()
+    busy_seconds = sum(executor.busy_seconds for executor in executors)
+    overhead = max(seconds - pipeline.finalize_seconds - busy_seconds / concurrency, 0.0)
+    return BenchmarkResult(
+        mode=mode,
+        emails=size,
+        concurrency=concurrency,
+        seconds=seconds,
+        emails_per_second=size / seconds,
+        finalize_seconds=pipeline.finalize_seconds,
+        busy_seconds=busy_seconds,
+        overhead_seconds=overhead,
+        overhead_us_per_email=overhead / size * 1e6,
+        peak_memory_mb=peak_mb,
+        memory_growth_mb=peak_mb - baseline_mb if peak_mb is not None else None
+    )
+
+
+def run_benchmark(
+    modes: Sequence[str] = MODES,
+    sizes: Sequence[int] = SIZES,
+    isolate: bool = True,
+    **case_options
+) -> "pd.DataFrame":
+    """Run every (mode, size) case and return one row per case.
+
+    With ``isolate``, each case runs in a fresh process, so the peak memory
+    of one case does not carry over into the next. ``case_options`` are
+    passed to run_case.
+    """
+    import pandas as pd
+
+    rows: List[dict] = []
+    for size in sizes:
+        for mode in modes:
+            print(f"Benchmarking {mode} pipeline on {size} emails")
+            if isolate:
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                    result = pool.submit(run_case, mode, size, **case_options).result()
+            else:
+                result = run_case(mode, size, **case_options)
+            rows.append(asdict(result))
+    return pd.DataFrame(rows)
+
+
+def startup_benchmark(cases: Optional[Dict[str, List[str]]] = None, repeats: int = 5) -> "pd.DataFrame":
+    """Cold-start time of each case, each attempt in a fresh interpreter.
+
+    Cases run from the repository directory with the current interpreter.
+    ``over_interpreter_seconds`` subtracts the bare interpreter's median, so
+    it is the time the imports themselves take.
+    """
+    import pandas as pd
+
+    cases = cases or STARTUP_CASES
+    directory = os.path.dirname(os.path.abspath(__file__))
+    rows = []
+    for name, args in cases.items():
+        times = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, *args], cwd=directory, check=True, stdout=subprocess.DEVNULL)
+            times.append(time.perf_counter() - started)
+        rows.append({"case": name, "median_seconds": statistics.median(times), "min_seconds": min(times)})
+    results = pd.DataFrame(rows)
+    baseline = results.loc[results["case"] == "interpreter", "median_seconds"]
+    if not baseline.empty:
+        results["over_interpreter_seconds"] = results["median_seconds"] - baseline.iloc[0]
+    return results
@@ -0,0 +1,377 @@
+import csv
+import io
+import itertools
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from prompt_evaluation_pipeline import CostCalculator, RetryPolicy
+from prompts.dataset_generation import general_instruction_01
+from rate_limiter import RateLimiter
+
+
+FIELDNAMES = ("subject", "sender", "recipients", "body")
+CONFIG_PATH = "./config/prompt_configs.json"
+COMBINED_NAME = "combined_dataset.csv"
+
+# Sends chat messages and returns the reply text and its cost
+Completion = Callable[[List[dict]], Tuple[str, float]]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One entry of ``config/prompt_configs.json``."""
+    name: str
+    instructions: str
+    emails_to_generate: int
+
+    @property
+    def file_name(self) -> str:
+        return self.name.replace(" ", "_").replace("/", "_") + ".csv"
+
+
+def load_scenarios(path: str = CONFIG_PATH, total: Optional[int] = None) -> List[Scenario]:
+    """Read the scenarios, optionally rescaling their targets to sum to ``total``.
+
+    Rescaled targets keep the configured proportions; rounding remainders go
+    to the scenarios with the largest fractional parts.
+    """
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    scenarios = [
+        Scenario(entry["name"], entry["instructions"], entry["emails_to_generate"])
+        for entry in config.get("prompts", [])
+    ]
+    if total is None or not scenarios:
+        return scenarios
+    configured = sum(s.emails_to_generate for s in scenarios)
+    shares = [s.emails_to_generate * total / configured for s in scenarios]
+    targets = [int(share) for share in shares]
+    by_remainder = sorted(range(len(shares)), key=lambda i: shares[i] - targets[i], reverse=True)
+    for i in by_remainder[:total - sum(targets)]:
+        targets[i] += 1
+    return [
+        Scenario(s.name, s.instructions, target)
+        for s, target in zip(scenarios, targets)
+    ]
+
+
+def build_messages(general_instructions: str, scenario: Scenario, batch_size: int) -> List[dict]:
+    """Combine the general guidelines with the scenario's instructions."""
+    system_content = f"""
+    {general_instructions}
+
+    SPECIFIC SCENARIO FOCUS: {scenario.name}
+    {scenario.instructions}
+    """
+
+    user_content = f"""
+    Generate {batch_size} unique emails **one per each purpose categories** following these strict formatting guidelines:
+
+    1. Use ";" as the separator between fields
+    2. Enclose all field values in double quotes (e.g., "value1";"value2";"value3")
+    3. Include only the raw CSV content with these fields: {'; '.join(FIELDNAMES)}
+    4. No explanatory text or formatting markers
+
+    """
+
+    return [
+        {"role": "system", "content": system_content},
+        {"role": "user", "content": user_content}
+    ]
+
+
+class MalformedBatchError(ValueError):
+    """A generated batch had rows that are not four non-empty fields.
+
+    ``rows`` holds the batch's valid rows.
+    """
+
+    def __init__(self, message: str, rows: List[Dict[str, str]]):
+        super().__init__(message)
+        self.rows = rows
+
+
+def _is_valid(row: Dict[str, Optional[str]]) -> bool:
+    # DictReader puts surplus fields under None and fills missing ones with None
+    return None not in row and all(row.get(name) and row[name].strip() for name in FIELDNAMES)
+
+
+def parse_email_batch(content: str) -> List[Dict[str, str]]:
+    """Parse the model's CSV reply into rows; raise MalformedBatchError on bad rows."""
+    lines = [
+        line for line in content.strip().split("\n")
+        if line.strip() and not line.startswith("```")
+    ]
+    rows, invalid = [], 0
+    for row in csv.DictReader(lines, fieldnames=FIELDNAMES, delimiter=";"):
+        if row.get("subject") == "subject":
+            continue  # header line
+        if _is_valid(row):
+            rows.append({name: row[name] for name in FIELDNAMES})
+        else:
+            invalid += 1
+    if invalid or not rows:
+        raise MalformedBatchError(f"{invalid} malformed rows, {len(rows)} valid", rows)
+    return rows
+
+
+def _read_rows(path: str):
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f, delimiter=";"):
+            if row.get("subject") != "subject":
+                yield row
+
+
+def count_emails(path: str) -> int:
+    """Emails already in a scenario file; 0 if it does not exist."""
+    if not os.path.exists(path):
+        return 0
+    return sum(1 for _ in _read_rows(path))
+
+
+def combine_datasets(scenarios: Sequence[Scenario], directory: str = "./datasets", output_name: str = COMBINED_NAME) -> int:
+    """Stream the scenario files into one dataset and return its number of emails.
+
+    Files are read one row at a time in file name order, so email ids match
+    earlier combined datasets. Each file contributes at most its scenario's
+    target, so extra rows from a larger earlier run are left out. The output
+    is written to a temporary file and then moved into place.
+    """
+    output_path = os.path.join(directory, output_name)
+    temporary_path = output_path + ".tmp"
+    written = 0
+    with open(temporary_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";", lineterminator="\n")
+        writer.writerow(FIELDNAMES)
+        for scenario in sorted(scenarios, key=lambda s: s.file_name):
+            path = os.path.join(directory, scenario.file_name)
+            if not os.path.exists(path):
+                continue
+            for row in itertools.islice(_read_rows(path), scenario.emails_to_generate):
+                writer.writerow([row[name] for name in FIELDNAMES])
+                written += 1
+    os.replace(temporary_path, output_path)
+    return written
+
+
+class OpenAICompletion:
+    """Plain-text chat completions for dataset generation.
+
+    Transient API errors are retried according to ``retry_policy``, and an
+    optional RateLimiter keeps many parallel batches under the account limits.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o",
+        temperature: float = 0.7,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        CostCalculator.pricing(model)  # fail fast on models without pricing
+        import openai
+
+        self.client = openai.OpenAI(api_key=api_key, max_retries=0)
+        self.model = model
+        self.temperature = temperature
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    def __call__(self, messages: List[dict]) -> Tuple[str, float]:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self._create(messages)
+            except Exception as e:
+                if not self.retry_policy.should_retry(e, attempt):
+                    raise
+                time.sleep(self.retry_policy.backoff(attempt, e))
+                continue
+            cost = CostCalculator.breakdown(response.usage, self.model).total
+            return response.choices[0].message.content or "", cost
+
+    def _create(self, messages: List[dict]):
+        if self.rate_limiter:
+            estimated_tokens = self.rate_limiter.estimate("".join(m["content"] for m in messages))
+            self.rate_limiter.acquire(self.model, estimated_tokens)
+
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature
+        )
+
+        if self.rate_limiter:
+            usage = response.usage
+            self.rate_limiter.reconcile(self.model, estimated_tokens, usage.prompt_tokens + usage.completion_tokens)
+        return response
+
+
+@dataclass
+class ScenarioProgress:
+    name: str
+    target: int
+    existing: int
+    generated: int = 0
+    batches: int = 0
+    malformed_attempts: int = 0
+    failed_batches: int = 0
+
+    @property
+    def emails(self) -> int:
+        return self.existing + self.generated
+
+
+@dataclass
+class GenerationReport:
+    scenarios: List[ScenarioProgress]
+    cost: float
+    seconds: float
+    combined_path: str
+    combined_emails: int
+    missing: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        return not self.missing
+
+
+class DatasetGenerator:
+    """Generates the scenario datasets concurrently, resuming toward their targets.
+
+    Batches of all scenarios share one thread pool and are interleaved, so
+    every scenario progresses at once. Rows are appended to
+    ``{output_dir}/<scenario>.csv`` as each batch finishes, so an interrupted
+    run loses at most its in-flight batches. Rerunning only requests the
+    emails each file still lacks. A reply with malformed CSV rows is
+    re-requested up to ``max_batch_retries`` times; after that its valid rows
+    are kept. Batches that return fewer emails than asked are topped up.
+    """
+
+    def __init__(
+        self,
+        complete: Completion,
+        general_instructions: str = general_instruction_01,
+        batch_size: int = 12,
+        max_threads: int = 16,
+        max_batch_retries: int = 2
+    ):
+        self.complete = complete
+        self.general_instructions = general_instructions
+        self.batch_size = batch_size
+        self.max_threads = max_threads
+        self.max_batch_retries = max_batch_retries
+
+    def generate_batch(self, scenario: Scenario, size: int) -> Tuple[List[Dict[str, str]], float, int]:
+        """Return (valid rows, cost, malformed attempts) for one batch of ``size`` emails."""
+        messages = build_messages(self.general_instructions, scenario, size)
+        best: List[Dict[str, str]] = []
+        cost = 0.0
+        for attempt in range(self.max_batch_retries + 1):
+            content, call_cost = self.complete(messages)
+            cost += call_cost
+            try:
+                return parse_email_batch(content), cost, attempt
+            except MalformedBatchError as e:
+                if len(e.rows) > len(best):
+                    best = e.rows
+        return best, cost, self.max_batch_retries + 1
+
+    def generate(
+        self,
+        scenarios: Sequence[Scenario],
+        output_dir: str = "./datasets",
+        combined_name: str = COMBINED_NAME
+    ) -> GenerationReport:
+        """Bring every scenario file up to its target, then rebuild the combined dataset."""
+        started = time.perf_counter()
+        os.makedirs(output_dir, exist_ok=True)
+        progress = {
+            s.name: ScenarioProgress(s.name, s.emails_to_generate, count_emails(os.path.join(output_dir, s.file_name)))
+            for s in scenarios
+        }
+
+        # Round-robin over scenarios, so all of them fill up at the same pace
+        per_scenario = [
+            [(s, size) for size in self._batch_sizes(max(s.emails_to_generate - progress[s.name].existing, 0))]
+            for s in scenarios
+        ]
+        tasks: Deque[Tuple[Scenario, int]] = deque(
+            task for batch in itertools.zip_longest(*per_scenario) for task in batch if task is not None
+        )
+        for s in scenarios:
+            print(f"{s.name}: {progress[s.name].existing}/{s.emails_to_generate} emails on disk")
+
+        cost = 0.0
+        files = {}
+        pending: Dict[Future, Tuple[Scenario, int]] = {}
+        try:
+            with ThreadPoolExecutor(self.max_threads) as executor:
+                while tasks or pending:
+                    while tasks and len(pending) < 2 * self.max_threads:
+                        scenario, size = tasks.popleft()
+                        pending[executor.submit(self.generate_batch, scenario, size)] = (scenario, size)
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        scenario, size = pending.pop(future)
+                        state = progress[scenario.name]
+                        state.batches += 1
+                        try:
+                            rows, batch_cost, malformed = future.result()
+                        except Exception as e:
+                            print(f"Error in batch generation for {scenario.name}: {e}")
+                            state.failed_batches += 1
+                            continue
+                        cost += batch_cost
+                        state.malformed_attempts += malformed
+                        rows = rows[:size]
+                        if not rows:
+                            state.failed_batches += 1
+                            continue
+                        self._append(files, output_dir, scenario, rows)
+                        state.generated += len(rows)
+                        if len(rows) < size:
+                            tasks.append((scenario, size - len(rows)))
+        finally:
+            for f in files.values():
+                f.close()
+
+        combined_emails = combine_datasets(scenarios, output_dir, combined_name)
+        missing = {
+            name: state.target - state.emails
+            for name, state in progress.items() if state.emails < state.target
+        }
+        return GenerationReport(
+            scenarios=list(progress.values()),
+            cost=cost,
+            seconds=time.perf_counter() - started,
+            combined_path=os.path.join(output_dir, combined_name),
+            combined_emails=combined_emails,
+            missing=missing
+        )
+
+    def _batch_sizes(self, emails: int) -> List[int]:
+        return [min(self.batch_size, emails - start) for start in range(0, emails, self.batch_size)]
+
+    @staticmethod
+    def _append(files: dict, output_dir: str, scenario: Scenario, rows: List[Dict[str, str]]) -> None:
+        """Append one batch with a single write, adding the header to a new file."""
+        f = files.get(scenario.name)
+        if f is None:
+            path = os.path.join(output_dir, scenario.file_name)
+            new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+            f = files[scenario.name] = open(path, "a", newline="", encoding="utf-8")
+            if new_file:
+                csv.writer(f, delimiter=";", quoting=csv.QUOTE_ALL, lineterminator="\n").writerow(FIELDNAMES)
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=FIELDNAMES, delimiter=";", quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writerows(rows)
+        f.write(buffer.getvalue())
+        f.flush()
@@ -0,0 +1,156 @@
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from threading import Lock
+from typing import TYPE_CHECKING, List, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass
+class CallRecord:
+    """Timing and usage of one executor call ("classification"/"evaluation") or one whole email ("email")."""
+    stage: str
+    model: str
+    started: float
+    wall_seconds: float
+    queue_wait_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    attempts: int = 1
+    error: bool = False
+
+
+class CallRecorder:
+    """Thread-safe collector of CallRecords with percentile summaries.
+
+    Pass one to PromptEvaluationPipeline to time every executor call and
+    every email; the summary is exported next to ``all_runs_*.csv``.
+    """
+
+    def __init__(self):
+        self.records: List[CallRecord] = []
+        self.lock = Lock()
+
+    def record_call(self, stage: str, model: str, started: float, stats, error: bool = False) -> None:
+        """Record an executor call that began at ``started`` (``time.perf_counter``)."""
+        record = CallRecord(
+            stage=stage,
+            model=model,
+            started=started,
+            wall_seconds=time.perf_counter() - started,
+            queue_wait_seconds=getattr(stats, "rate_limit_wait_seconds", 0.0),
+            parse_seconds=getattr(stats, "parse_seconds", 0.0),
+            prompt_tokens=getattr(stats, "prompt_tokens", 0),
+            completion_tokens=getattr(stats, "completion_tokens", 0),
+            attempts=getattr(stats, "attempts", 1),
+            error=error
+        )
+        with self.lock:
+            self.records.append(record)
+
+    def record_email(self, started: float, queue_wait_seconds: float, result) -> None:
+        """Record a processed email; ``started`` is when it was queued for a worker."""
+        prompt_tokens = (result.classification_prompt_tokens or 0) + (result.evaluation_prompt_tokens or 0)
+        completion_tokens = (result.classification_completion_tokens or 0) + (result.evaluation_completion_tokens or 0)
+        retries = max(result.classification_attempts - 1, 0) + max(result.evaluation_attempts - 1, 0)
+        record = CallRecord(
+            stage="email",
+            model="",
+            started=started,
+            wall_seconds=time.perf_counter() - started,
+            queue_wait_seconds=queue_wait_seconds,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            attempts=1 + retries,
+            error=result.validation_score is None
+        )
+        with self.lock:
+            self.records.append(record)
+
+    def frame(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        with self.lock:
+            records = list(self.records)
+        return pd.DataFrame([asdict(r) for r in records], columns=list(CallRecord.__dataclass_fields__))
+
+    def summary(self) -> "pd.DataFrame":
+        """Latency percentiles, throughput and token rates per (stage, model)."""
+        import pandas as pd
+
+        df = self.frame()
+        rows = []
+        for (stage, model), group in df.groupby(["stage", "model"], sort=True):
+            wall = group["wall_seconds"].to_numpy()
+            elapsed = (group["started"] + group["wall_seconds"]).max() - group["started"].min()
+            tokens = int(group["prompt_tokens"].sum() + group["completion_tokens"].sum())
+            p50, p95, p99 = np.percentile(wall, [50, 95, 99])
+            rows.append({
+                "stage": stage,
+                "model": model,
+                "calls": len(group),
+                "errors": int(group["error"].sum()),
+                "retries": int((group["attempts"] - 1).clip(lower=0).sum()),
+                "latency_p50": p50,
+                "latency_p95": p95,
+                "latency_p99": p99,
+                "latency_mean": wall.mean(),
+                "queue_wait_mean": group["queue_wait_seconds"].mean(),
+                "parse_seconds_mean": group["parse_seconds"].mean(),
+                "prompt_tokens": int(group["prompt_tokens"].sum()),
+                "completion_tokens": int(group["completion_tokens"].sum()),
+                "requests_per_second": len(group) / elapsed if elapsed > 0 else float("nan"),
+                "tokens_per_second": tokens / elapsed if elapsed > 0 else float("nan"),
+            })
+        return pd.DataFrame(rows)
+
+    def export(self, output_dir: str, timestamp: str) -> None:
+        """Write ``metrics_{timestamp}.csv`` and ``metrics_{timestamp}.json``."""
+        summary = self.summary()
+        summary.to_csv(os.path.join(output_dir, f"metrics_{timestamp}.csv"), index=False)
+        with open(os.path.join(output_dir, f"metrics_{timestamp}.json"), "w", encoding="utf-8") as f:
+            json.dump(json.loads(summary.to_json(orient="records")), f, indent=2)
+
+
+class ProgressDisplay:
+    """Single-line live progress for a run, redrawn at most every ``interval`` seconds."""
+
+    def __init__(self, label: str, total: Optional[int] = None, interval: float = 0.5, stream=None):
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.done = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+        self.last_drawn = 0.0
+        self.drawn_done = -1
+
+    def update(self, result) -> None:
+        self.done += 1
+        self.errors += result.validation_score is None
+        now = time.perf_counter()
+        if now - self.last_drawn >= self.interval or self.done == self.total:
+            self.last_drawn = now
+            self._draw(now)
+
+    def _draw(self, now: float) -> None:
+        self.drawn_done = self.done
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        progress = f"{self.done}/{self.total}" if self.total else str(self.done)
+        self.stream.write(f"\r{self.label}: {progress} emails, {rate:.1f}/s, {self.errors} errors ")
+        self.stream.flush()
+
+    def close(self) -> None:
+        if self.drawn_done != self.done:
+            self._draw(time.perf_counter())
+        self.stream.write("\n")
+        self.stream.flush()
@@ -0,0 +1,242 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Classification fields that have a single predefined label
+LABEL_FIELDS = (
+    "purpose",
+    "sentiment",
+    "complexity_level",
+    "agent_type",
+    "priority_level",
+    "customer_status",
+)
+MISSING_LABEL = "<missing>"
+
+
+def _normalize_label(value) -> str:
+    if not isinstance(value, str):
+        return MISSING_LABEL
+    return " ".join(value.split()).casefold() or MISSING_LABEL
+
+
+def _normalize_labels(values: pd.Series) -> pd.Series:
+    """Case- and whitespace-insensitive categorical form of a label column.
+
+    Non-strings become MISSING_LABEL. Each distinct label is normalized once,
+    and the categorical codes let the metrics work on integers only.
+    """
+    text = [value if isinstance(value, str) else None for value in values]
+    codes, uniques = pd.factorize(np.array(text, dtype=object))
+    normalized = [_normalize_label(label) for label in uniques] + [MISSING_LABEL]
+    normalized_codes, categories = pd.factorize(np.array(normalized, dtype=object))
+    return pd.Series(
+        pd.Categorical.from_codes(normalized_codes[codes], categories).remove_unused_categories(),
+        index=values.index
+    )
+
+
+class GoldLabels:
+    """Reference labels of a dataset, indexed by email id (the dataset row index).
+
+    Label files are ``;``-separated like the datasets, with an ``id`` column
+    and one column per labelled field, and live in ``datasets/labels/`` under
+    the same file name as their dataset.
+    """
+
+    def __init__(self, labels: pd.DataFrame):
+        fields = [name for name in labels.columns if name != "id"]
+        if not fields:
+            raise ValueError("Gold labels need at least one label column besides id")
+        frame = labels.set_index("id") if "id" in labels.columns else labels
+        self.frame = pd.DataFrame({name: _normalize_labels(frame[name]) for name in fields}, index=frame.index)
+        self.fields = tuple(fields)
+        self._by_id = dict(zip(self.frame.index, self.frame.astype(object).itertuples(index=False, name=None)))
+
+    @classmethod
+    def from_csv(cls, path: str, delimiter: str = ";") -> "GoldLabels":
+        return cls(pd.read_csv(path, delimiter=delimiter))
+
+    @staticmethod
+    def path_for(dataset_path: str) -> str:
+        directory, name = os.path.split(dataset_path)
+        return os.path.join(directory, "labels", name)
+
+    @classmethod
+    def for_dataset(cls, dataset_path: str) -> Optional["GoldLabels"]:
+        """Load the label file of ``dataset_path``, or return None if it has none."""
+        path = cls.path_for(dataset_path)
+        return cls.from_csv(path) if os.path.exists(path) else None
+
+    def __contains__(self, email_id: int) -> bool:
+        return email_id in self._by_id
+
+    def validation(self, email_id: int, output: dict) -> dict:
+        """Score one classification output against its labels, in the LLM judge's format.
+
+        The score is the share of labelled fields that match, scaled to 0-10;
+        fields left empty in the label file are not scored.
+        """
+        if email_id not in self._by_id:
+            raise KeyError(f"No gold labels for email {email_id}")
+        output = output if isinstance(output, dict) else {}
+        labelled = [
+            (name, expected) for name, expected in zip(self.fields, self._by_id[email_id])
+            if expected != MISSING_LABEL
+        ]
+        if not labelled:
+            raise KeyError(f"No gold labels for email {email_id}")
+        mismatches = [
+            f"{name}: expected {expected!r}, got {_normalize_label(output.get(name))!r}"
+            for name, expected in labelled
+            if _normalize_label(output.get(name)) != expected
+        ]
+        score = 10.0 * (len(labelled) - len(mismatches)) / len(labelled)
+        return {"score": score, "evaluation": "; ".join(mismatches) if mismatches else "All labels match"}
+
+    @staticmethod
+    def write_template(
+        dataset_path: str,
+        results: Optional[Iterable] = None,
+        fields: Sequence[str] = LABEL_FIELDS,
+        delimiter: str = ";"
+    ) -> str:
+        """Write a label file for ``dataset_path`` to be completed by hand.
+
+        With ``results`` from earlier runs, each field is pre-filled with the
+        label predicted most often for the email.
+        """
+        emails = pd.read_csv(dataset_path, delimiter=delimiter)
+        template = pd.DataFrame({"id": emails.index, "subject": emails["subject"]})
+        if results is not None:
+            predictions = predictions_frame(results, fields)
+            most_common = predictions.groupby("id")[list(fields)].agg(
+                lambda labels: labels[labels != MISSING_LABEL].mode().iat[0]
+                if (labels != MISSING_LABEL).any() else ""
+            )
+            template = template.join(most_common, on="id")
+        else:
+            for name in fields:
+                template[name] = ""
+        path = GoldLabels.path_for(dataset_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        template.drop(columns="subject").to_csv(path, sep=delimiter, index=False)
+        return path
+
+
+def predictions_frame(results: Union[pd.DataFrame, Iterable], fields: Sequence[str] = LABEL_FIELDS) -> pd.DataFrame:
+    """One row per (run_id, id) with the normalized predicted label of each field.
+
+    ``results`` may be EvaluationResult objects or a DataFrame such as a
+    loaded ``all_runs_*.csv``; rows without a prediction get MISSING_LABEL.
+    """
+    if not isinstance(results, pd.DataFrame):
+        results = pd.DataFrame([vars(r) for r in results], columns=["run_id", "id", "predicted_json"])
+
+    def parse(value) -> dict:
+        if not isinstance(value, str):
+            return {}
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+
+    parsed = pd.DataFrame.from_records(
+        [parse(value) for value in results["predicted_json"]],
+        columns=list(fields),
+        index=results.index
+    )
+    frame = pd.DataFrame({"run_id": results["run_id"].to_numpy(), "id": results["id"].to_numpy()})
+    for name in fields:
+        frame[name] = _normalize_labels(parsed[name]).array
+    return frame
+
+
+@dataclass
+class FieldMetrics:
+    field: str
+    accuracy: float
+    macro_f1: float
+    run_accuracy: pd.Series
+    confusion: pd.DataFrame
+
+    @property
+    def accuracy_std(self) -> float:
+        return float(self.run_accuracy.std(ddof=1)) if len(self.run_accuracy) > 1 else 0.0
+
+
+@dataclass
+class MetricsReport:
+    fields: Dict[str, FieldMetrics]
+    rows: int
+
+    def summary(self) -> pd.DataFrame:
+        return pd.DataFrame([
+            {
+                "field": m.field,
+                "accuracy": m.accuracy,
+                "accuracy_std": m.accuracy_std,
+                "macro_f1": m.macro_f1,
+            }
+            for m in self.fields.values()
+        ]).set_index("field")
+
+
+def _field_metrics(name: str, gold: pd.Series, predicted: pd.Series, run_ids: np.ndarray) -> FieldMetrics:
+    labels = np.array(sorted(set(gold.cat.categories) | set(predicted.cat.categories)), dtype=object)
+    gold_codes = gold.cat.set_categories(labels).cat.codes.to_numpy()
+    predicted_codes = predicted.cat.set_categories(labels).cat.codes.to_numpy()
+    # Rows whose gold label is empty are not scored
+    labelled = gold_codes != (labels.tolist().index(MISSING_LABEL) if MISSING_LABEL in labels else -1)
+    gold_codes, predicted_codes, run_ids = gold_codes[labelled], predicted_codes[labelled], run_ids[labelled]
+    k = len(labels)
+    confusion = np.bincount(gold_codes * k + predicted_codes, minlength=k * k).reshape(k, k)
+
+    correct = gold_codes == predicted_codes
+    true_positives = np.diag(confusion).astype(float)
+    support = confusion.sum(axis=1)
+    predicted_counts = confusion.sum(axis=0)
+    # Macro-F1 over the gold classes; MISSING_LABEL is never a valid answer
+    classes = (support > 0) & (labels != MISSING_LABEL)
+    denominator = support + predicted_counts
+    f1 = np.divide(2 * true_positives, denominator, out=np.zeros(k), where=denominator > 0)
+
+    run_accuracy = pd.Series(correct).groupby(run_ids).mean()
+    return FieldMetrics(
+        field=name,
+        accuracy=float(correct.mean()) if len(correct) else float("nan"),
+        macro_f1=float(f1[classes].mean()) if classes.any() else float("nan"),
+        run_accuracy=run_accuracy,
+        confusion=pd.DataFrame(confusion, index=labels, columns=labels)
+    )
+
+
+def compute_metrics(
+    results: Union[pd.DataFrame, Iterable],
+    gold: GoldLabels,
+    fields: Optional[Sequence[str]] = None
+) -> MetricsReport:
+    """Per-field exact-match accuracy, macro-F1 and confusion matrix over all runs at once.
+
+    Confusion matrices have gold labels as rows and predictions as columns.
+    Results for emails without gold labels, and fields left empty in the
+    label file, are ignored.
+    """
+    fields = [name for name in (fields or gold.fields) if name in gold.fields]
+    predictions = predictions_frame(results, fields)
+    predictions = predictions[predictions["id"].isin(gold.frame.index)]
+    expected = gold.frame.loc[predictions["id"], fields]
+    run_ids = predictions["run_id"].to_numpy()
+    return MetricsReport(
+        fields={
+            name: _field_metrics(name, expected[name], predictions[name], run_ids)
+            for name in fields
+        },
+        rows=len(predictions)
+    )
@@ -0,0 +1,181 @@
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from prompt_template import PromptTemplate
+
+
+# Label sets defined in prompts/prompt_03.py, used when the classification prompt
+# is not known; keep them in sync with the prompt
+PURPOSES = (
+    "Group Request",
+    "Change Request",
+    "Cancellation Request",
+    "Special Requests",
+    "Baggage Information",
+    "Unexpected Issues",
+    "Refund Request",
+    "Pricing and Promotional Offers",
+    "Travel Insurance Request",
+    "Loyalty Programs",
+    "Feedback or Complaints",
+    "Lost and Found Request",
+)
+SENTIMENTS = ("Positive", "Neutral", "Negative", "Unclear")
+LEVELS = ("Low", "Medium", "High")
+AGENT_TYPES = ("Junior", "Senior", "Expert")
+CUSTOMER_STATUSES = ("Non-Customer", "Customer", "Unknown")
+
+LABEL_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "purpose": PURPOSES,
+    "sentiment": SENTIMENTS,
+    "complexity_level": LEVELS,
+    "agent_type": AGENT_TYPES,
+    "priority_level": LEVELS,
+    "customer_status": CUSTOMER_STATUSES,
+}
+LIST_FIELDS = ("required_tools", "ssr_requests")
+TEXT_FIELDS = ("preferred_language",)
+# The prompts allow these for any attribute that is unclear
+UNCERTAIN_LABELS = ("Unknown", "Unclear")
+
+# Words in the heading of each label field's section of a classification prompt
+_SECTION_TITLES = {
+    "purpose": "purpose",
+    "sentiment": "sentiment",
+    "complexity_level": "complexity",
+    "agent_type": "agent type",
+    "priority_level": "priority",
+    "customer_status": "customer status",
+}
+# "1. **Purpose of the Email**: ..." or "#### **Step 1: Categorize the Email Purpose**"
+_HEADING = re.compile(r"^\s*(?:\d+\.\s+\*\*|#{1,6}\s)(.*)$")
+# "- **Group Request**: ..."
+_LABEL_BULLET = re.compile(r"^\s*-\s+\*\*([^*]+?)\*\*")
+
+
+def _normalize(label: str) -> str:
+    return " ".join(label.split()).casefold()
+
+
+def label_fields_from_prompt(prompt: str) -> Dict[str, Tuple[str, ...]]:
+    """Read the label sets out of a classification prompt.
+
+    Each field's labels are the bold bullets (``- **Label**: ...``) in the
+    first section whose heading names the field, as in prompts 00 to 03.
+    Fields without such a section are left out.
+    """
+    labels: Dict[str, List[str]] = {}
+    current = None
+    for line in prompt.splitlines():
+        heading = _HEADING.match(line)
+        if heading:
+            title = heading.group(1).casefold()
+            current = next(
+                (name for name, words in _SECTION_TITLES.items() if words in title and name not in labels),
+                None
+            )
+            if current is not None:
+                labels[current] = []
+            continue
+        bullet = _LABEL_BULLET.match(line)
+        if current is not None and bullet:
+            labels[current].append(bullet.group(1).strip())
+    return {name: tuple(dict.fromkeys(values)) for name, values in labels.items() if values}
+
+
+@dataclass
+class PreScore:
+    """Outcome of the rule checks on one classification output.
+
+    ``ceiling`` is the highest score the output can get; a fast-failed
+    output is scored ``ceiling`` without calling the LLM judge.
+    """
+    violations: List[str] = field(default_factory=list)
+    ceiling: float = 10.0
+    fast_fail: bool = False
+
+    def as_validation(self) -> dict:
+        """The result the LLM judge would have returned, for fast-failed outputs."""
+        return {"score": self.ceiling, "evaluation": "Rule check failed: " + "; ".join(self.violations)}
+
+    def apply(self, validation_result: dict) -> dict:
+        """Cap the judge's score at ``ceiling`` and list the violations it was capped for."""
+        if not self.violations:
+            return validation_result
+        return {
+            **validation_result,
+            "score": min(validation_result["score"], self.ceiling),
+            "evaluation": f"{validation_result['evaluation']} [Rule check: {'; '.join(self.violations)}]"
+        }
+
+
+class RuleBasedPreScorer:
+    """Validates classification outputs against the predefined label sets.
+
+    Without ``label_fields``, the label sets are read from the classification
+    prompt each output was produced with (see label_fields_from_prompt), so
+    one scorer can check several prompt versions; the prompt_03 sets are used
+    when no prompt is given. "Unknown" and "Unclear" are accepted for every
+    label field. Each missing field, unknown label or wrongly typed list lowers the score
+    ceiling by ``penalty_per_violation``. Outputs with at least
+    ``fast_fail_violations`` violations, or that are not a JSON object, are
+    scored locally; all others are forwarded to the LLM judge, whose score is
+    capped at the ceiling.
+    """
+
+    def __init__(
+        self,
+        penalty_per_violation: float = 1.5,
+        fast_fail_violations: int = 3,
+        label_fields: Optional[Dict[str, Tuple[str, ...]]] = None
+    ):
+        self.penalty_per_violation = penalty_per_violation
+        self.fast_fail_violations = fast_fail_violations
+        self.derive_labels = label_fields is None
+        label_fields = LABEL_FIELDS if label_fields is None else label_fields
+        self.labels = self._label_sets(label_fields)
+        self.required_fields = tuple(label_fields) + LIST_FIELDS + TEXT_FIELDS
+        self._prompt_labels: Dict[str, Dict[str, FrozenSet[str]]] = {}
+
+    @staticmethod
+    def _label_sets(label_fields: Dict[str, Tuple[str, ...]]) -> Dict[str, FrozenSet[str]]:
+        return {
+            name: frozenset(_normalize(label) for label in labels + UNCERTAIN_LABELS)
+            for name, labels in label_fields.items()
+        }
+
+    def labels_for(
+        self, classification_prompt: Union[str, "PromptTemplate", None] = None
+    ) -> Dict[str, FrozenSet[str]]:
+        """The normalised label sets that outputs of ``classification_prompt`` are checked against."""
+        if not self.derive_labels or classification_prompt is None:
+            return self.labels
+        # A PromptTemplate or the prompt text
+        text = getattr(classification_prompt, "template", classification_prompt)
+        labels = self._prompt_labels.get(text)
+        if labels is None:
+            labels = self._prompt_labels[text] = self._label_sets(label_fields_from_prompt(text))
+        return labels
+
+    def check(self, output: dict, classification_prompt: Union[str, "PromptTemplate", None] = None) -> PreScore:
+        if not isinstance(output, dict):
+            return PreScore([f"output is a {type(output).__name__}, not a JSON object"], 0.0, True)
+
+        violations = []
+        for name in self.required_fields:
+            if name not in output:
+                violations.append(f"missing {name}")
+        for name, allowed in self.labels_for(classification_prompt).items():
+            value = output.get(name)
+            if name in output and not (isinstance(value, str) and _normalize(value) in allowed):
+                violations.append(f"{name} {value!r} is not a predefined label")
+        for name in LIST_FIELDS:
+            # The prompt allows an empty string when there is nothing to list
+            value = output.get(name)
+            if name in output and not isinstance(value, list) and value != "":
+                violations.append(f"{name} is not a list")
+
+        ceiling = max(10.0 - self.penalty_per_violation * len(violations), 0.0)
+        return PreScore(violations, ceiling, len(violations) >= self.fast_fail_violations)
@@ -0,0 +1,244 @@
+import itertools
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from metrics import LABEL_FIELDS, GoldLabels, predictions_frame
+from pre_scorer import RuleBasedPreScorer
+from prompt_evaluation_pipeline import (
+    EmailProcessor,
+    EmailSource,
+    EvaluationResult,
+    PromptExecutor,
+    load_emails,
+    mean_confidence_interval,
+)
+from prompt_template import PromptTemplate
+
+
+@dataclass
+class PairedComparison:
+    """Paired score difference ``prompt_a - prompt_b`` over the same emails.
+
+    ``p_value`` is two-sided, from a sign-flip permutation test of the
+    per-email deltas; the interval is a Student t interval on their mean.
+    """
+    prompt_a: str
+    prompt_b: str
+    emails: int
+    mean_delta: float
+    ci_lower: float
+    ci_upper: float
+    p_value: float
+    wins_a: int
+    wins_b: int
+    ties: int
+
+    @property
+    def significant(self) -> bool:
+        return not self.ci_lower <= 0.0 <= self.ci_upper
+
+
+@dataclass
+class ComparisonReport:
+    accuracies: Dict[str, float]
+    pairs: List[PairedComparison]
+    email_scores: pd.DataFrame
+    disagreements: Dict[Tuple[str, str], Dict[str, pd.DataFrame]]
+    confidence: float
+
+    def summary(self) -> pd.DataFrame:
+        rows = [{**asdict(pair), "significant": pair.significant} for pair in self.pairs]
+        return pd.DataFrame(rows)
+
+    def agreement(self) -> pd.DataFrame:
+        """Share of (run, email) pairs with the same label, per field and prompt pair."""
+        def share_on_diagonal(matrix: pd.DataFrame) -> float:
+            counts = matrix.to_numpy()
+            return float(np.trace(counts) / counts.sum()) if counts.sum() else float("nan")
+
+        return pd.DataFrame({
+            f"{a} vs {b}": {name: share_on_diagonal(matrix) for name, matrix in matrices.items()}
+            for (a, b), matrices in self.disagreements.items()
+        })
+
+    def to_dict(self) -> dict:
+        return {
+            "confidence": self.confidence,
+            "accuracies": self.accuracies,
+            "pairs": [{**asdict(pair), "significant": pair.significant} for pair in self.pairs],
+            "agreement": json.loads(self.agreement().to_json()),
+        }
+
+
+def _sign_flip_p_value(deltas: np.ndarray, permutations: int, rng: np.random.Generator) -> float:
+    """Two-sided p-value of a zero mean delta under random sign flips."""
+    if len(deltas) == 0 or not deltas.any():
+        return 1.0
+    observed = abs(deltas.mean())
+    exceed = 0
+    # Batches keep the sign matrix small for large datasets
+    batch = max(1, min(permutations, 1_000_000 // len(deltas)))
+    for start in range(0, permutations, batch):
+        count = min(batch, permutations - start)
+        signs = rng.choice((-1.0, 1.0), size=(count, len(deltas)))
+        exceed += int((np.abs(signs @ deltas) / len(deltas) >= observed - 1e-12).sum())
+    return (exceed + 1) / (permutations + 1)
+
+
+class PromptComparison:
+    """Evaluates several classification prompts on the same emails in one schedule.
+
+    Every (run, email) is classified with each prompt back to back on one
+    shared thread pool, so all prompts see the same emails under the same
+    load, and a shared RateLimiter stays fully used. Scores are compared per
+    email, which removes the email-to-email variance from the comparison.
+    """
+
+    def __init__(
+        self,
+        classification_executor: PromptExecutor,
+        evaluation_executor: Optional[PromptExecutor],
+        max_threads: int = 5,
+        pre_scorer: Optional[RuleBasedPreScorer] = None,
+        gold_labels: Optional[GoldLabels] = None,
+        permutations: int = 10000,
+        seed: int = 0
+    ):
+        self.processor = EmailProcessor(classification_executor, evaluation_executor, pre_scorer, gold_labels)
+        self.max_threads = max_threads
+        self.permutations = permutations
+        self.seed = seed
+
+    def run(
+        self,
+        dataset: Union[str, EmailSource],
+        classification_prompts: Dict[str, Union[str, PromptTemplate]],
+        evaluation_prompt: Union[str, PromptTemplate],
+        num_runs: int = 1,
+        output_dir: Optional[str] = None,
+        confidence: float = 0.95,
+        fields: Sequence[str] = LABEL_FIELDS
+    ) -> ComparisonReport:
+        if len(classification_prompts) < 2:
+            raise ValueError("A comparison needs at least two classification prompts")
+        templates = {
+            name: PromptTemplate.for_classification(prompt) for name, prompt in classification_prompts.items()
+        }
+        evaluation_prompt = PromptTemplate.for_evaluation(evaluation_prompt)
+        emails = load_emails(dataset)
+
+        results: List[Tuple[str, EvaluationResult]] = []
+        owners: Dict[Future, str] = {}
+        max_pending = 2 * self.max_threads
+        schedule = (
+            (run_id, email_id, email_data, name)
+            for run_id in range(num_runs)
+            for email_id, email_data in emails
+            for name in templates
+        )
+
+        with ThreadPoolExecutor(self.max_threads) as executor:
+            for run_id, email_id, email_data, name in schedule:
+                if len(owners) >= max_pending:
+                    self._collect(owners, results)
+                future = executor.submit(
+                    self.processor.process_single_email,
+                    email_data,
+                    templates[name],
+                    evaluation_prompt,
+                    email_id,
+                    run_id
+                )
+                owners[future] = name
+            while owners:
+                self._collect(owners, results)
+
+        report = self._report(results, list(templates), confidence, fields)
+        if output_dir:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            rows = pd.DataFrame([{"prompt": name, **vars(result)} for name, result in results])
+            rows.to_csv(os.path.join(output_dir, f"comparison_results_{timestamp}.csv"), index=False)
+            with open(os.path.join(output_dir, f"comparison_report_{timestamp}.json"), "w", encoding="utf-8") as f:
+                json.dump(report.to_dict(), f, indent=2)
+        return report
+
+    @staticmethod
+    def _collect(owners: Dict[Future, str], results: List[Tuple[str, EvaluationResult]]) -> None:
+        done, _ = wait(owners, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = owners.pop(future)
+            try:
+                results.append((name, future.result()))
+            except Exception as e:
+                print(f"Error processing email: {e}")
+
+    def _report(
+        self,
+        results: List[Tuple[str, EvaluationResult]],
+        names: List[str],
+        confidence: float,
+        fields: Sequence[str]
+    ) -> ComparisonReport:
+        frame = pd.DataFrame({
+            "prompt": [name for name, _ in results],
+            "run_id": [result.run_id for _, result in results],
+            "id": [result.id for _, result in results],
+            # Errored emails count as 0, as in the main pipeline
+            "score": [result.validation_score or 0.0 for _, result in results],
+            "predicted_json": [result.predicted_json for _, result in results],
+        })
+        # A prompt whose calls all failed has no results; it gets empty columns
+        email_scores = frame.pivot_table(index="id", columns="prompt", values="score", aggfunc="mean")
+        email_scores = email_scores.reindex(columns=names)
+        predictions = predictions_frame(frame, fields)
+        predictions["prompt"] = frame["prompt"].to_numpy()
+        by_prompt = {name: group.set_index(["run_id", "id"]) for name, group in predictions.groupby("prompt")}
+        no_predictions = predictions.iloc[:0].set_index(["run_id", "id"])
+
+        rng = np.random.default_rng(self.seed)
+        pairs = []
+        disagreements = {}
+        for a, b in itertools.combinations(names, 2):
+            both = email_scores[[a, b]].dropna()
+            deltas = (both[a] - both[b]).to_numpy()
+            ci_lower, ci_upper = mean_confidence_interval(deltas.tolist(), confidence)
+            pairs.append(PairedComparison(
+                prompt_a=a,
+                prompt_b=b,
+                emails=len(deltas),
+                mean_delta=float(deltas.mean()) if len(deltas) else float("nan"),
+                ci_lower=ci_lower,
+                ci_upper=ci_upper,
+                p_value=_sign_flip_p_value(deltas, self.permutations, rng),
+                wins_a=int((deltas > 0).sum()),
+                wins_b=int((deltas < 0).sum()),
+                ties=int((deltas == 0).sum())
+            ))
+            # Rows: prompt a's label, columns: prompt b's label, over matching (run, email) pairs
+            predictions_a = by_prompt.get(a, no_predictions)[list(fields)]
+            predictions_b = by_prompt.get(b, no_predictions)[list(fields)]
+            joined = predictions_a.join(predictions_b, how="inner", lsuffix="_a", rsuffix="_b")
+            disagreements[(a, b)] = {name: self._label_matrix(joined[f"{name}_a"], joined[f"{name}_b"]) for name in fields}
+
+        return ComparisonReport(
+            accuracies={name: float(frame.loc[frame["prompt"] == name, "score"].mean()) for name in names},
+            pairs=pairs,
+            email_scores=email_scores,
+            disagreements=disagreements,
+            confidence=confidence
+        )
+
+    @staticmethod
+    def _label_matrix(labels_a: pd.Series, labels_b: pd.Series) -> pd.DataFrame:
+        """Square count matrix over the labels either prompt used; the diagonal is agreement."""
+        labels_a, labels_b = labels_a.astype(str), labels_b.astype(str)
+        labels = sorted(set(labels_a) | set(labels_b))
+        matrix = pd.crosstab(labels_a, labels_b)
+        return matrix.reindex(index=labels, columns=labels, fill_value=0)
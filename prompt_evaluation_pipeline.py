@@ -1,29 +1,140 @@
-import openai
-import pandas as pd
+import asyncio
 import numpy as np
 import json
-import plotly.express as px
-import plotly.graph_objects as go
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, NamedTuple
+import math
+import os
+import queue
+import random
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from threading import Lock, Thread
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, NamedTuple, Type, Union
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from statistics import NormalDist
+
+from aggregation import RunAggregator
+from instrumentation import CallRecorder, ProgressDisplay
+from pre_scorer import PreScore, RuleBasedPreScorer
+from prompt_template import PromptTemplate
+from rate_limiter import RateLimiter
+
+# openai, pandas and plotly are imported where first used: replay and offline
+# runs never need openai, and a plain import of this module stays fast
+if TYPE_CHECKING:
+    import pandas as pd
+    from metrics import GoldLabels
+    from results_store import ResultsStore
 
 
 @dataclass
 class TokenUsage:
     prompt_tokens: int
     completion_tokens: int
+    cached_tokens: int = 0
 
-@dataclass
+@dataclass(frozen=True)
 class EmailData:
+    __slots__ = ("subject", "sender", "recipients", "body")
     subject: str
     sender: str
     recipients: str
     body: str
 
+class EmailStore:
+    """Immutable, indexable column store of the emails in a dataset.
+    
+    The CSV is parsed once into one tuple per column, so a single store can be
+    shared by every run and by several prompt comparisons. Iterating yields
+    ``(email_id, EmailData)`` pairs, where ``email_id`` is the dataset row index.
+    """
+    
+    __slots__ = ("ids", "subjects", "senders", "recipients", "bodies")
+    
+    def __init__(
+        self,
+        ids: Sequence[int],
+        subjects: Sequence[str],
+        senders: Sequence[str],
+        recipients: Sequence[str],
+        bodies: Sequence[str]
+    ):
+        self.ids = tuple(ids)
+        self.subjects = tuple(subjects)
+        self.senders = tuple(senders)
+        self.recipients = tuple(recipients)
+        self.bodies = tuple(bodies)
+    
+    @classmethod
+    def from_dataframe(cls, df: "pd.DataFrame") -> "EmailStore":
+        return cls(
+            ids=df.index.tolist(),
+            subjects=df["subject"].tolist(),
+            senders=df["sender"].tolist(),
+            recipients=df["recipients"].tolist(),
+            bodies=df["body"].tolist()
+        )
+    
+    @classmethod
+    def from_csv(cls, dataset_path: str, delimiter: str = ";") -> "EmailStore":
+        import pandas as pd
+        
+        return cls.from_dataframe(pd.read_csv(dataset_path, delimiter=delimiter))
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __getitem__(self, position: int) -> EmailData:
+        return EmailData(
+            subject=self.subjects[position],
+            sender=self.senders[position],
+            recipients=self.recipients[position],
+            body=self.bodies[position]
+        )
+    
+    def __iter__(self) -> Iterator[Tuple[int, EmailData]]:
+        for position, email_id in enumerate(self.ids):
+            yield email_id, self[position]
+    
+    def subset(self, positions: Sequence[int]) -> "EmailStore":
+        """Return a store with the emails at ``positions``, keeping their ids."""
+        return EmailStore(
+            ids=[self.ids[p] for p in positions],
+            subjects=[self.subjects[p] for p in positions],
+            senders=[self.senders[p] for p in positions],
+            recipients=[self.recipients[p] for p in positions],
+            bodies=[self.bodies[p] for p in positions]
+        )
+
+class StreamingEmailSource:
+    """Re-iterable view of a CSV dataset that is parsed lazily in chunks.
+    
+    Use it instead of EmailStore for datasets too large to hold in memory;
+    each iteration re-reads the file, keeping at most ``chunksize`` rows parsed.
+    """
+    
+    def __init__(self, dataset_path: str, delimiter: str = ";", chunksize: int = 10000):
+        self.dataset_path = dataset_path
+        self.delimiter = delimiter
+        self.chunksize = chunksize
+    
+    def __iter__(self) -> Iterator[Tuple[int, EmailData]]:
+        import pandas as pd
+        
+        for chunk in pd.read_csv(self.dataset_path, delimiter=self.delimiter, chunksize=self.chunksize):
+            yield from EmailStore.from_dataframe(chunk)
+
+EmailSource = Union[EmailStore, StreamingEmailSource]
+
+def load_emails(dataset: Union[str, EmailSource]) -> EmailSource:
+    """Return ``dataset`` as an email source, parsing it if given a CSV path."""
+    if isinstance(dataset, str):
+        return EmailStore.from_csv(dataset)
+    return dataset
+
 @dataclass
 class EvaluationResult:
     id: int
@@ -34,6 +145,51 @@ class EvaluationResult:
     classification_cost: float
     evaluation_cost: float
     run_id: int
+    classification_attempts: int = 0
+    evaluation_attempts: int = 0
+    backoff_seconds: float = 0.0
+    saved_cost: float = 0.0
+    classification_prompt_tokens: int = 0
+    classification_cached_tokens: int = 0
+    classification_completion_tokens: int = 0
+    evaluation_prompt_tokens: int = 0
+    evaluation_cached_tokens: int = 0
+    evaluation_completion_tokens: int = 0
+    carried_over: bool = False
+    rule_violations: int = 0
+
+@dataclass
+class CostBreakdown:
+    """Token counts and cost of one or more calls, split by token type."""
+    model: str
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    uncached_input_cost: float = 0.0
+    cached_input_cost: float = 0.0
+    output_cost: float = 0.0
+    
+    @property
+    def total(self) -> float:
+        return self.uncached_input_cost + self.cached_input_cost + self.output_cost
+
+@dataclass
+class CallStats:
+    """Bookkeeping for one executor call, including any retries."""
+    attempts: int = 1
+    backoff_seconds: float = 0.0
+    cache_hit: bool = False
+    saved_cost: float = 0.0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    rate_limit_wait_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    
+    def add_usage(self, breakdown: CostBreakdown) -> None:
+        self.prompt_tokens += breakdown.prompt_tokens
+        self.cached_tokens += breakdown.cached_tokens
+        self.completion_tokens += breakdown.completion_tokens
 
 class RunStatistics(NamedTuple):
     mean_accuracy: float
@@ -44,35 +200,229 @@ class RunStatistics(NamedTuple):
     total_classification_cost: float
     total_evaluation_cost: float
     run_count: int
+    total_saved_cost: float = 0.0
+    ci_lower: float = float("nan")
+    ci_upper: float = float("nan")
+    ci_confidence: float = 0.95
+
+def _t_critical(confidence: float, df: int) -> float:
+    """Two-sided Student t critical value.
+    
+    Exact for 1 and 2 degrees of freedom, Cornish-Fisher expansion around the
+    normal quantile otherwise (within about 1% from df=3 on).
+    """
+    p = 0.5 + confidence / 2
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = NormalDist().inv_cdf(p)
+    return (
+        z
+        + (z ** 3 + z) / (4 * df)
+        + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+        + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3)
+        + (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / (92160 * df ** 4)
+    )
+
+def mean_confidence_interval(values: Sequence[float], confidence: float = 0.95) -> Tuple[float, float]:
+    """Student t confidence interval for the mean of ``values`` (NaN for fewer than two)."""
+    n = len(values)
+    if n < 2:
+        return float("nan"), float("nan")
+    mean = sum(values) / n
+    std = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+    half_width = _t_critical(confidence, n - 1) * std / math.sqrt(n)
+    return mean - half_width, mean + half_width
+
+def run_statistics(run_summaries: Sequence[dict], ci_confidence: float = 0.95) -> RunStatistics:
+    """Statistics across runs from per-run rows with accuracy and cost columns."""
+    accuracies = [s['accuracy'] for s in run_summaries]
+    ci_lower, ci_upper = mean_confidence_interval(accuracies, ci_confidence)
+    return RunStatistics(
+        mean_accuracy=np.mean(accuracies),
+        median_accuracy=np.median(accuracies),
+        std_accuracy=np.std(accuracies),
+        min_accuracy=min(accuracies),
+        max_accuracy=max(accuracies),
+        total_classification_cost=sum(s['classification_cost'] for s in run_summaries),
+        total_evaluation_cost=sum(s['evaluation_cost'] for s in run_summaries),
+        run_count=len(run_summaries),
+        total_saved_cost=sum(s.get('saved_cost', 0.0) for s in run_summaries),
+        ci_lower=ci_lower,
+        ci_upper=ci_upper,
+        ci_confidence=ci_confidence
+    )
+
+@dataclass(frozen=True)
+class ModelPricing:
+    """Per-token prices for one model. Cached input falls back to the input price.
+    
+    ``batch_discount`` is the share of every price saved by the offline Batch API.
+    """
+    input: float
+    output: float
+    cached_input: Optional[float] = None
+    batch_discount: float = 0.5
 
 class CostCalculator:
-    """Handles cost calculations for different models and token usage."""
-    
-    COST_PER_TOKEN = {
-        "gpt-4": {"input": 30 / 1000000, "output": 60 / 1000000},
-        "gpt-4o": {"input": 2.5 / 1000000, 
-                   "cached_input": 1.25 / 1000000,
-                   "output": 10 / 1000000},
-        "gpt-4o-mini": {
-            "input": 0.15 / 1000000,
-            "cached_input": 0.075 / 1000000,
-            "output": 0.600 / 1000000,
+    """Handles cost calculations for different models and token usage.
+    
+    Prices come from a registry loaded from ``config/model_pricing.json``
+    (USD per 1M tokens). Models not in the file, such as local models, can be
+    added with register_model; dated snapshot names like
+    ``gpt-4o-mini-2024-07-18`` resolve to their base model's entry. Calls
+    made through the Batch API are priced with ``batch=True``.
+    """
+    
+    PRICING_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "model_pricing.json")
+    _registry: Optional[Dict[str, ModelPricing]] = None
+    
+    @classmethod
+    def load_pricing(cls, path: Optional[str] = None) -> None:
+        """(Re)load the pricing registry from a JSON file."""
+        with open(path or cls.PRICING_PATH, encoding="utf-8") as f:
+            config = json.load(f)
+        default_batch_discount = config.get("batch_discount", ModelPricing.batch_discount)
+        cls._registry = {
+            name: ModelPricing(
+                input=prices["input"] / 1000000,
+                output=prices["output"] / 1000000,
+                cached_input=prices["cached_input"] / 1000000 if prices.get("cached_input") is not None else None,
+                batch_discount=prices.get("batch_discount", default_batch_discount)
+            )
+            for name, prices in config["models"].items()
         }
-    }
-
+    
     @classmethod
-    def calculate(cls, usage: TokenUsage, model: str) -> float:
-        if model not in cls.COST_PER_TOKEN:
-            raise ValueError(f"Unsupported model: {model}")
-            
-        costs = cls.COST_PER_TOKEN[model]
-        if model == "gpt-4":
-            return (usage.prompt_tokens * costs["input"] +  usage.completion_tokens * costs["output"])
-        elif model == "gpt-4o-mini":
-            return (usage.prompt_tokens * costs["input"] +  usage.prompt_tokens * costs["cached_input"] + usage.completion_tokens * costs["output"])
-        elif model == "gpt-4o":
-            return (usage.prompt_tokens * costs["input"] +  usage.prompt_tokens * costs["cached_input"] + usage.completion_tokens * costs["output"])
+    def register_model(
+        cls,
+        model: str,
+        input_per_million: float = 0.0,
+        output_per_million: float = 0.0,
+        cached_input_per_million: Optional[float] = None,
+        batch_discount: float = ModelPricing.batch_discount
+    ) -> None:
+        """Add or override a model's prices, e.g. a free local model."""
+        if cls._registry is None:
+            cls.load_pricing()
+        cls._registry[model] = ModelPricing(
+            input=input_per_million / 1000000,
+            output=output_per_million / 1000000,
+            cached_input=cached_input_per_million / 1000000 if cached_input_per_million is not None else None,
+            batch_discount=batch_discount
+        )
+    
+    @classmethod
+    def pricing(cls, model: str) -> ModelPricing:
+        if cls._registry is None:
+            cls.load_pricing()
+        if model in cls._registry:
+            return cls._registry[model]
+        # Fall back to the registered model this is a dated snapshot of; other
+        # variants such as gpt-4-turbo have their own prices and must be listed
+        candidates = [name for name in cls._registry if re.fullmatch(re.escape(name) + r"-\d{4}-\d{2}-\d{2}", model)]
+        if not candidates:
+            raise ValueError(f"Unsupported model: {model}; add it to {cls.PRICING_PATH} or call register_model")
+        return cls._registry[max(candidates, key=len)]
+    
+    @classmethod
+    def breakdown(cls, usage: TokenUsage, model: str, batch: bool = False) -> CostBreakdown:
+        """Split the cost of a call into uncached input, cached input and output."""
+        prices = cls.pricing(model)
+        cached_tokens = cached_prompt_tokens(usage)
+        cached_price = prices.cached_input if prices.cached_input is not None else prices.input
+        factor = 1 - prices.batch_discount if batch else 1.0
+        return CostBreakdown(
+            model=model,
+            prompt_tokens=usage.prompt_tokens,
+            cached_tokens=cached_tokens,
+            completion_tokens=usage.completion_tokens,
+            uncached_input_cost=(usage.prompt_tokens - cached_tokens) * prices.input * factor,
+            cached_input_cost=cached_tokens * cached_price * factor,
+            output_cost=usage.completion_tokens * prices.output * factor
+        )
+    
+    @classmethod
+    def calculate(cls, usage: TokenUsage, model: str, batch: bool = False) -> float:
+        return cls.breakdown(usage, model, batch).total
+
+def cached_prompt_tokens(usage) -> int:
+    """Number of prompt tokens the provider reports as served from its prompt cache."""
+    if isinstance(usage, TokenUsage):
+        return usage.cached_tokens
+    details = getattr(usage, "prompt_tokens_details", None)
+    return (getattr(details, "cached_tokens", None) or 0) if details is not None else 0
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the server's Retry-After hint from an API error, if it sent one."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+def _transient_openai_errors() -> Tuple[Type[Exception], ...]:
+    import openai
+    
+    return openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError
 
+@dataclass
+class RetryPolicy:
+    """Retry settings for executor calls.
+    
+    API errors listed in ``retryable_errors`` are retried up to ``max_attempts``
+    calls in total, waiting ``base_delay * 2 ** (attempt - 1)`` seconds (capped
+    at ``max_delay``, randomised by ``jitter``) or whatever Retry-After asks for,
+    up to ``max_delay``.
+    Responses that are not valid JSON have their own budget of
+    ``max_json_retries`` immediate re-requests.
+    """
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    jitter: float = 0.5
+    max_json_retries: int = 2
+    retryable_errors: Tuple[Type[Exception], ...] = field(default_factory=_transient_openai_errors)
+    
+    def should_retry(self, error: Exception, attempt: int) -> bool:
+        return attempt < self.max_attempts and isinstance(error, self.retryable_errors)
+    
+    def backoff(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """Seconds to wait after the given (1-based) failed attempt."""
+        retry_after = _retry_after_seconds(error) if error is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
+class RetriesExhaustedError(Exception):
+    """Raised when an executor call still fails after its retry budget is spent."""
+    
+    def __init__(self, last_error: Exception, stats: CallStats):
+        super().__init__(f"{last_error} (after {stats.attempts} attempts)")
+        self.last_error = last_error
+        self.stats = stats
 
 class PromptExecutor(ABC):
     """Abstract base class for executing prompts."""
@@ -84,271 +434,1272 @@ class PromptExecutor(ABC):
     @abstractmethod
     def execute(self, prompt: str) -> Tuple[dict, float]:
         pass
+    
+    def execute_with_stats(self, prompt: str) -> Tuple[dict, float, CallStats]:
+        """Like execute, but also report call bookkeeping such as retries."""
+        output, cost = self.execute(prompt)
+        return output, cost, CallStats()
+
+class AsyncPromptExecutor(ABC):
+    """Abstract base class for executing prompts on an asyncio event loop."""
+    
+    def __init__(self, model: str, temperature: float = 0.0):
+        self.model = model
+        self.temperature = temperature
+    
+    @abstractmethod
+    async def execute(self, prompt: str) -> Tuple[dict, float]:
+        pass
+    
+    async def execute_with_stats(self, prompt: str) -> Tuple[dict, float, CallStats]:
+        output, cost = await self.execute(prompt)
+        return output, cost, CallStats()
+
+def _completion_json(response) -> dict:
+    """Extract the JSON payload from a chat completion response."""
+    return _parse_json_content(response.choices[0].message.content)
+
+def _parse_json_content(content: Optional[str]) -> dict:
+    if content is None:
+        # Refusals and content-filtered completions have no content; treat them
+        # like invalid JSON so they use the JSON retry budget
+        raise json.JSONDecodeError("Response has no content", "", 0)
+    # Clean up JSON response
+    content = content.replace('```json\n', '').replace('```', '').strip()
+    return json.loads(content)
+
+def _usage_tokens(response) -> int:
+    return response.usage.prompt_tokens + response.usage.completion_tokens
+
+def _build_messages(prompt: str, split_messages: bool) -> List[dict]:
+    """Lay out a prompt as chat messages.
+    
+    With ``split_messages`` and a RenderedPrompt, the static instruction prefix
+    goes in the system message and the per-email remainder in a user message,
+    so every call shares an identical leading block the provider can cache.
+    """
+    prefix_length = getattr(prompt, "prefix_length", 0)
+    if split_messages and 0 < prefix_length < len(prompt):
+        return [
+            {"role": "system", "content": prompt[:prefix_length]},
+            {"role": "user", "content": prompt[prefix_length:]}
+        ]
+    return [{"role": "system", "content": prompt}]
 
 class OpenAIExecutor(PromptExecutor):
-    """Handles OpenAI API calls."""
+    """Handles OpenAI API calls.
     
-    def __init__(self, api_key: str, model: str, temperature: float = 0.0):
+    An optional RateLimiter shared with other executors paces the calls so
+    they stay under the provider's per-model request and token limits.
+    Failed calls are retried according to ``retry_policy``; the OpenAI
+    client's own retries are disabled so the two do not compound.
+    ``split_messages`` enables the prefix-cache-friendly message layout.
+    """
+    
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        temperature: float = 0.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        split_messages: bool = False
+    ):
         super().__init__(model, temperature)
-        self.client = openai.OpenAI(api_key=api_key)
+        CostCalculator.pricing(model)  # fail fast on models without pricing
+        import openai
+        
+        self.client = openai.OpenAI(api_key=api_key, max_retries=0)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.split_messages = split_messages
     
-    def execute(self, prompt: str) -> Tuple[dict, float]:
+    def _create(self, prompt: str, stats: CallStats):
+        if self.rate_limiter:
+            estimated_tokens = self.rate_limiter.estimate(prompt)
+            stats.rate_limit_wait_seconds += self.rate_limiter.acquire(self.model, estimated_tokens)
+        
         response = self.client.chat.completions.create(
             model=self.model,
-            messages=[{"role": "system", "content": prompt}],
+            messages=_build_messages(prompt, self.split_messages),
+            temperature=self.temperature
+        )
+        
+        if self.rate_limiter:
+            self.rate_limiter.reconcile(self.model, estimated_tokens, _usage_tokens(response))
+        return response
+    
+    def execute(self, prompt: str) -> Tuple[dict, float]:
+        output, cost, _ = self.execute_with_stats(prompt)
+        return output, cost
+    
+    def execute_with_stats(self, prompt: str) -> Tuple[dict, float, CallStats]:
+        policy = self.retry_policy
+        stats = CallStats(attempts=0)
+        cost = 0.0
+        error_attempts = 0
+        json_retries = 0
+        
+        while True:
+            stats.attempts += 1
+            try:
+                response = self._create(prompt, stats)
+            except Exception as e:
+                error_attempts += 1
+                if not policy.should_retry(e, error_attempts):
+                    raise RetriesExhaustedError(e, stats) from e
+                delay = policy.backoff(error_attempts, e)
+                stats.backoff_seconds += delay
+                time.sleep(delay)
+                continue
+            
+            breakdown = CostCalculator.breakdown(response.usage, self.model)
+            cost += breakdown.total
+            stats.add_usage(breakdown)
+            parse_started = time.perf_counter()
+            try:
+                return _completion_json(response), cost, stats
+            except json.JSONDecodeError as e:
+                json_retries += 1
+                if json_retries > policy.max_json_retries:
+                    raise RetriesExhaustedError(e, stats) from e
+            finally:
+                stats.parse_seconds += time.perf_counter() - parse_started
+
+class AsyncOpenAIExecutor(AsyncPromptExecutor):
+    """Handles OpenAI API calls through the async client."""
+    
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        temperature: float = 0.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        split_messages: bool = False
+    ):
+        super().__init__(model, temperature)
+        CostCalculator.pricing(model)  # fail fast on models without pricing
+        import openai
+        
+        self.client = openai.AsyncOpenAI(api_key=api_key, max_retries=0)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.split_messages = split_messages
+    
+    async def _create(self, prompt: str, stats: CallStats):
+        if self.rate_limiter:
+            estimated_tokens = self.rate_limiter.estimate(prompt)
+            stats.rate_limit_wait_seconds += await self.rate_limiter.aacquire(self.model, estimated_tokens)
+        
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=_build_messages(prompt, self.split_messages),
             temperature=self.temperature
         )
         
-        cost = CostCalculator.calculate(response.usage, self.model)
-        content = response.choices[0].message.content
+        if self.rate_limiter:
+            self.rate_limiter.reconcile(self.model, estimated_tokens, _usage_tokens(response))
+        return response
+    
+    async def execute(self, prompt: str) -> Tuple[dict, float]:
+        output, cost, _ = await self.execute_with_stats(prompt)
+        return output, cost
+    
+    async def execute_with_stats(self, prompt: str) -> Tuple[dict, float, CallStats]:
+        policy = self.retry_policy
+        stats = CallStats(attempts=0)
+        cost = 0.0
+        error_attempts = 0
+        json_retries = 0
+        
+        while True:
+            stats.attempts += 1
+            try:
+                response = await self._create(prompt, stats)
+            except Exception as e:
+                error_attempts += 1
+                if not policy.should_retry(e, error_attempts):
+                    raise RetriesExhaustedError(e, stats) from e
+                delay = policy.backoff(error_attempts, e)
+                stats.backoff_seconds += delay
+                await asyncio.sleep(delay)
+                continue
+            
+            breakdown = CostCalculator.breakdown(response.usage, self.model)
+            cost += breakdown.total
+            stats.add_usage(breakdown)
+            parse_started = time.perf_counter()
+            try:
+                return _completion_json(response), cost, stats
+            except json.JSONDecodeError as e:
+                json_retries += 1
+                if json_retries > policy.max_json_retries:
+                    raise RetriesExhaustedError(e, stats) from e
+            finally:
+                stats.parse_seconds += time.perf_counter() - parse_started
+
+def _token_columns(classification_stats: Optional[CallStats], evaluation_stats: Optional[CallStats]) -> dict:
+    """Per-stage token counts for an EvaluationResult."""
+    columns = {}
+    for stage, stats in (("classification", classification_stats), ("evaluation", evaluation_stats)):
+        if stats is not None:
+            columns[f"{stage}_prompt_tokens"] = stats.prompt_tokens
+            columns[f"{stage}_cached_tokens"] = stats.cached_tokens
+            columns[f"{stage}_completion_tokens"] = stats.completion_tokens
+    return columns
+
+class ResultCheckpoint:
+    """Append-only JSONL log of EvaluationResult rows.
+    
+    Each result is written and flushed as soon as its email completes, so an
+    interrupted evaluation keeps everything it already paid for. When a
+    (run_id, id) pair appears more than once, the last record wins.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = Lock()
+        self.file = None
+    
+    def rows(self) -> Iterator[dict]:
+        """Stream the raw records in file order, without de-duplicating them."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by a crash; that email is simply redone
+                    continue
+    
+    def load(self) -> List[EvaluationResult]:
+        latest = {}
+        for row in self.rows():
+            latest[(row["run_id"], row["id"])] = row
+        return [EvaluationResult(**row) for row in latest.values()]
+    
+    def completed_keys(self) -> Set[Tuple[int, int]]:
+        """(run_id, email id) pairs that finished with a score and can be skipped."""
+        return {(row["run_id"], row["id"]) for row in self.rows() if row.get("validation_score") is not None}
+    
+    def frames(self, chunksize: int = 10000) -> Iterator["pd.DataFrame"]:
+        """Stream the de-duplicated results as DataFrames of up to ``chunksize`` rows.
+        
+        Scored pairs are never re-run, so only pairs that errored can have
+        several records; a first pass remembers the last record of just those.
+        Always yields at least one, possibly empty, frame.
+        """
+        import pandas as pd
+        
+        last_record = {}
+        for position, row in enumerate(self.rows()):
+            key = (row["run_id"], row["id"])
+            if key in last_record or row.get("validation_score") is None:
+                last_record[key] = position
+        
+        fields = list(EvaluationResult.__dataclass_fields__)
+        chunk = []
+        yielded = False
+        for position, row in enumerate(self.rows()):
+            if last_record.get((row["run_id"], row["id"]), position) != position:
+                continue
+            chunk.append(vars(EvaluationResult(**row)))
+            if len(chunk) >= chunksize:
+                yield pd.DataFrame(chunk, columns=fields)
+                yielded = True
+                chunk = []
+        if chunk or not yielded:
+            yield pd.DataFrame(chunk, columns=fields)
+    
+    def export_csv(self, path: str, extra_columns: Optional[Dict[str, str]] = None, chunksize: int = 10000) -> None:
+        """Write the de-duplicated results to ``path``, one chunk at a time."""
+        for number, frame in enumerate(self.frames(chunksize)):
+            for name, value in (extra_columns or {}).items():
+                frame[name] = value
+            frame.to_csv(path, mode="w" if number == 0 else "a", header=number == 0, index=False)
+    
+    def append(self, result: EvaluationResult) -> None:
+        with self.lock:
+            if self.file is None:
+                needs_newline = os.path.exists(self.path) and os.path.getsize(self.path) > 0 and not self._ends_with_newline()
+                self.file = open(self.path, "a", encoding="utf-8")
+                if needs_newline:
+                    self.file.write("\n")
+            self.file.write(json.dumps(vars(result)) + "\n")
+            self.file.flush()
+    
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    
+    def close(self) -> None:
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+class _EmailProcessorBase:
+    """Prompt formatting and result construction shared by the email processors."""
+    
+    recorder: Optional[CallRecorder] = None
+    
+    def _record_call(self, stage: str, executor, started: float, stats: Optional[CallStats], error: bool = False) -> None:
+        if self.recorder is not None:
+            self.recorder.record_call(stage, executor.model, started, stats, error)
+    
+    @staticmethod
+    def _classification_input(email_data: EmailData, classification_prompt: Union[str, PromptTemplate]) -> str:
+        render = classification_prompt.render if isinstance(classification_prompt, PromptTemplate) else classification_prompt.format
+        return render(
+            subject=email_data.subject,
+            sender=email_data.sender,
+            recipients=email_data.recipients,
+            body=email_data.body
+        )
+    
+    @staticmethod
+    def _validation_input(email_data: EmailData, evaluation_prompt: Union[str, PromptTemplate], primary_output: dict) -> str:
+        render = evaluation_prompt.render if isinstance(evaluation_prompt, PromptTemplate) else evaluation_prompt.format
+        return render(
+            subject=email_data.subject,
+            sender=email_data.sender,
+            recipients=email_data.recipients,
+            body=email_data.body,
+            output=json.dumps(primary_output)
+        )
+    
+    @staticmethod
+    def _success_result(
+        email_data: EmailData,
+        primary_output: dict,
+        validation_result: dict,
+        classification_cost: float,
+        evaluation_cost: float,
+        email_id: int,
+        run_id: int,
+        classification_stats: CallStats,
+        evaluation_stats: CallStats,
+        pre_score: Optional[PreScore] = None
+    ) -> EvaluationResult:
+        return EvaluationResult(
+            id=email_id,
+            subject=email_data.subject,
+            predicted_json=json.dumps(primary_output),
+            validation_score=validation_result["score"],
+            validation_evaluation=validation_result["evaluation"],
+            classification_cost=classification_cost,
+            evaluation_cost=evaluation_cost,
+            run_id=run_id,
+            classification_attempts=classification_stats.attempts,
+            evaluation_attempts=evaluation_stats.attempts,
+            backoff_seconds=classification_stats.backoff_seconds + evaluation_stats.backoff_seconds,
+            saved_cost=classification_stats.saved_cost + evaluation_stats.saved_cost,
+            rule_violations=len(pre_score.violations) if pre_score else 0,
+            **_token_columns(classification_stats, evaluation_stats)
+        )
+    
+    @classmethod
+    def _pre_scored_result(
+        cls,
+        email_data: EmailData,
+        primary_output: dict,
+        pre_score: PreScore,
+        classification_cost: float,
+        email_id: int,
+        run_id: int,
+        classification_stats: CallStats
+    ) -> EvaluationResult:
+        return cls._success_result(
+            email_data, primary_output, pre_score.as_validation(),
+            classification_cost, 0.0, email_id, run_id,
+            classification_stats, CallStats(attempts=0), pre_score
+        )
+    
+    @staticmethod
+    def _error_result(
+        email_data: EmailData,
+        error: Exception,
+        email_id: int,
+        run_id: int,
+        classification_stats: Optional[CallStats] = None
+    ) -> EvaluationResult:
+        # Executors attach their retry bookkeeping to RetriesExhaustedError
+        failed_stats = getattr(error, "stats", None)
+        if classification_stats is None:
+            classification_stats, evaluation_stats = failed_stats, None
+        else:
+            evaluation_stats = failed_stats
+        stats = [s for s in (classification_stats, evaluation_stats) if s is not None]
         
-        # Clean up JSON response
-        content = content.replace('```json\n', '').replace('```', '').strip()
-        return json.loads(content), cost
+        return EvaluationResult(
+            id=email_id,
+            subject=email_data.subject,
+            predicted_json=None,
+            validation_score=None,
+            validation_evaluation=str(error),
+            classification_cost=0.0,
+            evaluation_cost=0.0,
+            run_id=run_id,
+            classification_attempts=classification_stats.attempts if classification_stats else 0,
+            evaluation_attempts=evaluation_stats.attempts if evaluation_stats else 0,
+            backoff_seconds=sum(s.backoff_seconds for s in stats),
+            saved_cost=sum(s.saved_cost for s in stats),
+            **_token_columns(classification_stats, evaluation_stats)
+        )
+
+@dataclass
+class ClassifiedEmail:
+    """An email between the classification and the evaluation stage."""
+    email_data: EmailData
+    email_id: int
+    run_id: int
+    primary_output: dict
+    classification_cost: float
+    classification_stats: CallStats
+    pre_score: Optional[PreScore] = None
 
-class EmailProcessor:
-    """Handles the processing of individual emails."""
+class EmailProcessor(_EmailProcessorBase):
+    """Handles the processing of individual emails.
+    
+    ``classify`` and ``evaluate`` are the two stages of process_single_email;
+    the pipeline can also run them on separate worker pools.
+    """
     
-    def __init__(self, classification_executor: PromptExecutor, evaluation_executor: PromptExecutor):
+    def __init__(
+        self,
+        classification_executor: PromptExecutor,
+        evaluation_executor: Optional[PromptExecutor],
+        pre_scorer: Optional[RuleBasedPreScorer] = None,
+        gold_labels: Optional["GoldLabels"] = None,
+        recorder: Optional[CallRecorder] = None
+    ):
+        if evaluation_executor is None and gold_labels is None:
+            raise ValueError("An evaluation executor is required unless gold labels are given")
         self.classification_executor = classification_executor
         self.evaluation_executor = evaluation_executor
+        self.pre_scorer = pre_scorer
+        self.gold_labels = gold_labels
+        self.recorder = recorder
     
     def process_single_email(
         self, 
         email_data: EmailData, 
-        classification_prompt: str, 
-        evaluation_prompt: str, 
+        classification_prompt: Union[str, PromptTemplate], 
+        evaluation_prompt: Union[str, PromptTemplate], 
         email_id: int,
         run_id: int
     ) -> EvaluationResult:
+        classified = self.classify(email_data, classification_prompt, email_id, run_id)
+        if isinstance(classified, EvaluationResult):
+            return classified
+        return self.evaluate(classified, evaluation_prompt)
+    
+    def _execute(self, stage: str, executor: PromptExecutor, prompt: str) -> Tuple[dict, float, CallStats]:
+        started = time.perf_counter()
+        try:
+            output, cost, stats = executor.execute_with_stats(prompt)
+        except Exception as e:
+            self._record_call(stage, executor, started, getattr(e, "stats", None), error=True)
+            raise
+        self._record_call(stage, executor, started, stats)
+        return output, cost, stats
+    
+    def classify(
+        self,
+        email_data: EmailData,
+        classification_prompt: Union[str, PromptTemplate],
+        email_id: int,
+        run_id: int
+    ) -> Union[ClassifiedEmail, EvaluationResult]:
+        """Run the classification stage; returns a final result if there is nothing to evaluate."""
+        classification_stats = None
         try:
             # Execute classification prompt with classification executor
-            classification_input = classification_prompt.format(
-                subject=email_data.subject,
-                sender=email_data.sender,
-                recipients=email_data.recipients,
-                body=email_data.body
+            classification_input = self._classification_input(email_data, classification_prompt)
+            primary_output, classification_cost, classification_stats = self._execute(
+                "classification", self.classification_executor, classification_input
             )
-            primary_output, classification_cost = self.classification_executor.execute(classification_input)
             
-            # Execute validation prompt with evaluation executor
-            validation_input = evaluation_prompt.format(
-                subject=email_data.subject,
-                sender=email_data.sender,
-                recipients=email_data.recipients,
-                body=email_data.body,
-                output=json.dumps(primary_output)
+            # Score malformed outputs locally instead of calling the evaluator
+            pre_score = self.pre_scorer.check(primary_output, classification_prompt) if self.pre_scorer else None
+            if pre_score is not None and pre_score.fast_fail:
+                return self._pre_scored_result(
+                    email_data, primary_output, pre_score,
+                    classification_cost, email_id, run_id, classification_stats
+                )
+            
+            return ClassifiedEmail(
+                email_data, email_id, run_id, primary_output,
+                classification_cost, classification_stats, pre_score
             )
-            validation_result, evaluation_cost = self.evaluation_executor.execute(validation_input)
             
-            return EvaluationResult(
-                id=email_id,
-                subject=email_data.subject,
-                predicted_json=json.dumps(primary_output),
-                validation_score=validation_result["score"],
-                validation_evaluation=validation_result["evaluation"],
-                classification_cost=classification_cost,
-                evaluation_cost=evaluation_cost,
-                run_id=run_id
+        except Exception as e:
+            return self._error_result(email_data, e, email_id, run_id, classification_stats)
+    
+    def evaluate(self, classified: ClassifiedEmail, evaluation_prompt: Union[str, PromptTemplate]) -> EvaluationResult:
+        """Run the evaluation stage for a classified email."""
+        email_data = classified.email_data
+        try:
+            # Score against gold labels locally, or execute validation prompt with evaluation executor
+            if self.gold_labels is not None:
+                validation_result, evaluation_cost, evaluation_stats = (
+                    self.gold_labels.validation(classified.email_id, classified.primary_output), 0.0, CallStats(attempts=0)
+                )
+            else:
+                validation_input = self._validation_input(email_data, evaluation_prompt, classified.primary_output)
+                validation_result, evaluation_cost, evaluation_stats = self._execute(
+                    "evaluation", self.evaluation_executor, validation_input
+                )
+            if classified.pre_score is not None:
+                validation_result = classified.pre_score.apply(validation_result)
+            
+            return self._success_result(
+                email_data, classified.primary_output, validation_result,
+                classified.classification_cost, evaluation_cost, classified.email_id, classified.run_id,
+                classified.classification_stats, evaluation_stats, classified.pre_score
             )
             
         except Exception as e:
-            return EvaluationResult(
-                id=email_id,
-                subject=email_data.subject,
-                predicted_json=None,
-                validation_score=None,
-                validation_evaluation=str(e),
-                classification_cost=0.0,
-                evaluation_cost=0.0,
-                run_id=run_id
+            return self._error_result(
+                email_data, e, classified.email_id, classified.run_id, classified.classification_stats
             )
 
+class AsyncEmailProcessor(_EmailProcessorBase):
+    """Async counterpart of EmailProcessor, driven by AsyncPromptExecutor instances."""
+    
+    def __init__(
+        self,
+        classification_executor: AsyncPromptExecutor,
+        evaluation_executor: Optional[AsyncPromptExecutor],
+        pre_scorer: Optional[RuleBasedPreScorer] = None,
+        gold_labels: Optional["GoldLabels"] = None,
+        recorder: Optional[CallRecorder] = None
+    ):
+        if evaluation_executor is None and gold_labels is None:
+            raise ValueError("An evaluation executor is required unless gold labels are given")
+        self.classification_executor = classification_executor
+        self.evaluation_executor = evaluation_executor
+        self.pre_scorer = pre_scorer
+        self.gold_labels = gold_labels
+        self.recorder = recorder
+    
+    async def process_single_email(
+        self, 
+        email_data: EmailData, 
+        classification_prompt: Union[str, PromptTemplate], 
+        evaluation_prompt: Union[str, PromptTemplate], 
+        email_id: int,
+        run_id: int
+    ) -> EvaluationResult:
+        classified = await self.classify(email_data, classification_prompt, email_id, run_id)
+        if isinstance(classified, EvaluationResult):
+            return classified
+        return await self.evaluate(classified, evaluation_prompt)
+    
+    async def _execute(self, stage: str, executor: AsyncPromptExecutor, prompt: str) -> Tuple[dict, float, CallStats]:
+        started = time.perf_counter()
+        try:
+            output, cost, stats = await executor.execute_with_stats(prompt)
+        except Exception as e:
+            self._record_call(stage, executor, started, getattr(e, "stats", None), error=True)
+            raise
+        self._record_call(stage, executor, started, stats)
+        return output, cost, stats
+    
+    async def classify(
+        self,
+        email_data: EmailData,
+        classification_prompt: Union[str, PromptTemplate],
+        email_id: int,
+        run_id: int
+    ) -> Union[ClassifiedEmail, EvaluationResult]:
+        classification_stats = None
+        try:
+            classification_input = self._classification_input(email_data, classification_prompt)
+            primary_output, classification_cost, classification_stats = await self._execute(
+                "classification", self.classification_executor, classification_input
+            )
+            
+            pre_score = self.pre_scorer.check(primary_output, classification_prompt) if self.pre_scorer else None
+            if pre_score is not None and pre_score.fast_fail:
+                return self._pre_scored_result(
+                    email_data, primary_output, pre_score,
+                    classification_cost, email_id, run_id, classification_stats
+                )
+            
+            return ClassifiedEmail(
+                email_data, email_id, run_id, primary_output,
+                classification_cost, classification_stats, pre_score
+            )
+            
+        except Exception as e:
+            return self._error_result(email_data, e, email_id, run_id, classification_stats)
+    
+    async def evaluate(self, classified: ClassifiedEmail, evaluation_prompt: Union[str, PromptTemplate]) -> EvaluationResult:
+        email_data = classified.email_data
+        try:
+            if self.gold_labels is not None:
+                validation_result, evaluation_cost, evaluation_stats = (
+                    self.gold_labels.validation(classified.email_id, classified.primary_output), 0.0, CallStats(attempts=0)
+                )
+            else:
+                validation_input = self._validation_input(email_data, evaluation_prompt, classified.primary_output)
+                validation_result, evaluation_cost, evaluation_stats = await self._execute(
+                    "evaluation", self.evaluation_executor, validation_input
+                )
+            if classified.pre_score is not None:
+                validation_result = classified.pre_score.apply(validation_result)
+            
+            return self._success_result(
+                email_data, classified.primary_output, validation_result,
+                classified.classification_cost, evaluation_cost, classified.email_id, classified.run_id,
+                classified.classification_stats, evaluation_stats, classified.pre_score
+            )
+            
+        except Exception as e:
+            return self._error_result(
+                email_data, e, classified.email_id, classified.run_id, classified.classification_stats
+            )
+
+@dataclass
+class StageMetrics:
+    """Queue depth and wait times between the classification and evaluation stages of one run.
+    
+    Classification workers blocked on a full queue mean the evaluation stage
+    is the bottleneck; evaluation workers idle on an empty queue mean the
+    classification stage is.
+    """
+    run_id: int
+    queue_size: int
+    classified: int = 0
+    evaluated: int = 0
+    max_queue_depth: int = 0
+    queue_depth_total: int = 0
+    queue_samples: int = 0
+    classification_blocked_seconds: float = 0.0
+    evaluation_idle_seconds: float = 0.0
+    lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+    
+    def record_put(self, depth: int, blocked_seconds: float) -> None:
+        with self.lock:
+            self.classified += 1
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+            self.queue_depth_total += depth
+            self.queue_samples += 1
+            self.classification_blocked_seconds += blocked_seconds
+    
+    def record_get(self, idle_seconds: float) -> None:
+        with self.lock:
+            self.evaluation_idle_seconds += idle_seconds
+    
+    @property
+    def mean_queue_depth(self) -> float:
+        return self.queue_depth_total / self.queue_samples if self.queue_samples else 0.0
+    
+    @property
+    def bottleneck(self) -> str:
+        return "evaluation" if self.classification_blocked_seconds > self.evaluation_idle_seconds else "classification"
+    
+    def summary(self) -> str:
+        return (
+            f"Stage queue: mean depth {self.mean_queue_depth:.1f}, max {self.max_queue_depth}/{self.queue_size}; "
+            f"classification blocked {self.classification_blocked_seconds:.1f}s, "
+            f"evaluation idle {self.evaluation_idle_seconds:.1f}s; bottleneck: {self.bottleneck}"
+        )
+
+_STAGE_DONE = object()
+
+class _RunTracker:
+    """Running per-run statistics, plus per-email score history when re-sampling."""
+    
+    def __init__(self, track_emails: bool = False):
+        self.runs = RunAggregator()
+        self.track_emails = track_emails
+        self.email_scores: Dict[int, List[Optional[float]]] = {}
+        self.last_results: Dict[int, EvaluationResult] = {}
+    
+    def record(self, result: EvaluationResult) -> None:
+        self.runs.add(result)
+        if self.track_emails:
+            self.email_scores.setdefault(result.id, []).append(result.validation_score)
+            self.last_results[result.id] = result
+    
+    def run_accuracies(self, email_counts: List[int]) -> List[float]:
+        return self.runs.accuracies(email_counts)
+    
+    def stable_results(self) -> List[EvaluationResult]:
+        """Latest result of every email that got the same score in all runs so far."""
+        return [
+            self.last_results[email_id]
+            for email_id, scores in self.email_scores.items()
+            if len(scores) >= 2 and scores[0] is not None and all(score == scores[0] for score in scores)
+        ]
+
+def _carried_result(result: EvaluationResult, run_id: int) -> EvaluationResult:
+    """Copy a stable email's result into a later run without calling the models."""
+    return replace(
+        result,
+        run_id=run_id,
+        classification_cost=0.0,
+        evaluation_cost=0.0,
+        classification_attempts=0,
+        evaluation_attempts=0,
+        backoff_seconds=0.0,
+        saved_cost=0.0,
+        classification_prompt_tokens=0,
+        classification_cached_tokens=0,
+        classification_completion_tokens=0,
+        evaluation_prompt_tokens=0,
+        evaluation_cached_tokens=0,
+        evaluation_completion_tokens=0,
+        carried_over=True
+    )
+
 class PromptEvaluationPipeline:
-    """Main pipeline for evaluating prompts on a dataset with multiple runs."""
+    """Main pipeline for evaluating prompts on a dataset with multiple runs.
+    
+    Pass PromptExecutor instances to use the threaded run_multiple_evaluations,
+    or AsyncPromptExecutor instances to use arun_multiple_evaluations.
+    
+    With ``evaluation_threads`` set, the threaded pipeline runs classification
+    on ``max_threads`` workers and evaluation on ``evaluation_threads`` workers,
+    joined by a queue of ``stage_queue_size`` classified emails. A full queue
+    pauses classification. Each run's StageMetrics are kept in ``stage_metrics``.
+    
+    A CallRecorder passed as ``recorder`` times every executor call and
+    every email; its summary is saved as ``metrics_{timestamp}.csv`` and
+    ``.json`` next to the results. ``show_progress`` prints a live progress
+    line while emails complete.
+    
+    With a ResultsStore as ``results_store``, every finished evaluation is
+    also written to it, keyed by ``prompt_name`` and the prompt's fingerprint.
+    
+    ``plots=False`` skips the HTML plots, and with them the Plotly import;
+    ``reporting.regenerate_report`` can draw them later from the results CSV.
+    Runs with more than ``max_plot_points`` scored results are plotted from
+    per-run quartiles and a sample, so the plot files stay small.
+    """
     
     def __init__(
         self,
-        classification_executor: PromptExecutor,
-        evaluation_executor: PromptExecutor,
-        max_threads: int = 5
+        classification_executor: Union[PromptExecutor, AsyncPromptExecutor],
+        evaluation_executor: Optional[Union[PromptExecutor, AsyncPromptExecutor]],
+        max_threads: int = 5,
+        pre_scorer: Optional[RuleBasedPreScorer] = None,
+        gold_labels: Optional["GoldLabels"] = None,
+        evaluation_threads: Optional[int] = None,
+        stage_queue_size: Optional[int] = None,
+        recorder: Optional[CallRecorder] = None,
+        show_progress: bool = False,
+        results_store: Optional["ResultsStore"] = None,
+        plots: bool = True,
+        max_plot_points: int = 5000
     ):
-        self.processor = EmailProcessor(classification_executor, evaluation_executor)
+        if isinstance(classification_executor, AsyncPromptExecutor):
+            if evaluation_threads is not None:
+                raise ValueError("Separate stage worker pools are only supported with PromptExecutor instances")
+            self.processor = AsyncEmailProcessor(
+                classification_executor, evaluation_executor, pre_scorer, gold_labels, recorder
+            )
+        else:
+            self.processor = EmailProcessor(classification_executor, evaluation_executor, pre_scorer, gold_labels, recorder)
         self.max_threads = max_threads
+        self.evaluation_threads = evaluation_threads
+        self.stage_queue_size = stage_queue_size or 2 * (evaluation_threads or max_threads)
+        self.stage_metrics: List[StageMetrics] = []
+        self.recorder = recorder
+        self.show_progress = show_progress
+        self.results_store = results_store
+        self.plots = plots
+        self.max_plot_points = max_plot_points
         self.classification_model = classification_executor.model
-        self.evaluation_model = evaluation_executor.model
+        self.evaluation_model = evaluation_executor.model if evaluation_executor is not None else "gold-labels"
     
     def run_multiple_evaluations(
         self,
-        dataset_path: str,
+        dataset_path: Union[str, EmailSource],
         output_dir: str,
-        classification_prompt: str,
-        evaluation_prompt: str,
-        num_runs: int = 5
+        classification_prompt: Union[str, PromptTemplate],
+        evaluation_prompt: Union[str, PromptTemplate],
+        num_runs: int = 5,
+        resume: Optional[str] = None,
+        target_ci_width: Optional[float] = None,
+        max_runs: int = 10,
+        resample_varied_only: bool = False,
+        ci_confidence: float = 0.95,
+        prompt_name: Optional[str] = None
     ) -> RunStatistics:
-        """Execute multiple evaluation runs and compute statistics."""
+        """Execute multiple evaluation runs and compute statistics.
+        
+        ``dataset_path`` may be a CSV path or an already loaded EmailStore /
+        StreamingEmailSource; a path is parsed once and shared by all runs.
+        Prompts are compiled into PromptTemplate objects before the first
+        call, so placeholder errors surface immediately.
+        
+        Results are streamed to ``{output_dir}/checkpoint_{timestamp}.jsonl``
+        as they complete. Pass that file as ``resume`` to continue an
+        interrupted evaluation; (run, email) pairs that already have a score
+        are skipped and the checkpoint is appended to.
+        
+        With ``target_ci_width`` set, ``num_runs`` becomes the minimum number
+        of runs: further runs are added until the ``ci_confidence`` interval
+        on the mean accuracy is no wider than ``target_ci_width`` or
+        ``max_runs`` is reached. ``resample_varied_only`` re-evaluates, from
+        the third run on, only emails whose score differed between earlier
+        runs; the others are carried over at no cost.
+        
+        ``prompt_name`` labels the evaluation in the results store; it
+        defaults to the classification prompt's fingerprint.
+        """
+        if not isinstance(self.processor, EmailProcessor):
+            raise TypeError("run_multiple_evaluations requires PromptExecutor instances; use arun_multiple_evaluations")
+        
+        classification_prompt = PromptTemplate.for_classification(classification_prompt)
+        evaluation_prompt = PromptTemplate.for_evaluation(evaluation_prompt)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        all_results = []
-        run_summaries = []
-
-        for run_id in range(num_runs):
-            print(f"\nStarting run {run_id + 1}/{num_runs}")
-            results, run_accuracy, run_classification_cost, run_evaluation_cost = self._process_dataset(
-                dataset_path,
-                classification_prompt,
-                evaluation_prompt,
-                run_id
-            )
-            all_results.extend(results)
-            run_summaries.append({
-                'run_id': run_id,
-                'accuracy': run_accuracy,
-                'classification_cost': run_classification_cost,
-                'evaluation_cost': run_evaluation_cost
-            })
+        emails = load_emails(dataset_path)
+        checkpoint, completed = self._open_checkpoint(output_dir, timestamp, resume)
+        tracker = self._start_tracker(checkpoint, resume, resample_varied_only)
+        email_counts = []
+        progress = self._start_progress(emails, num_runs if target_ci_width is None else None)
+        
+        def on_result(result: EvaluationResult) -> None:
+            checkpoint.append(result)
+            tracker.record(result)
+            if progress is not None:
+                progress.update(result)
+
+        try:
+            run_id = 0
+            while self._should_start_run(
+                run_id, num_runs, target_ci_width, max_runs, tracker, email_counts, ci_confidence
+            ):
+                if resample_varied_only:
+                    self._carry_stable_results(tracker, run_id, completed, on_result)
+                print(f"\nStarting run {run_id + 1}/{num_runs if target_ci_width is None else max_runs}")
+                email_counts.append(self.process_dataset(
+                    emails,
+                    classification_prompt,
+                    evaluation_prompt,
+                    run_id,
+                    completed,
+                    on_result
+                ))
+                run_id += 1
+        finally:
+            checkpoint.close()
+            if progress is not None:
+                progress.close()
+
+        stats = self._finalize_runs(checkpoint, tracker, email_counts, output_dir, timestamp, ci_confidence)
+        self._store_results(checkpoint, timestamp, classification_prompt, evaluation_prompt, prompt_name)
+        return stats
+
+    async def arun_multiple_evaluations(
+        self,
+        dataset_path: Union[str, EmailSource],
+        output_dir: str,
+        classification_prompt: Union[str, PromptTemplate],
+        evaluation_prompt: Union[str, PromptTemplate],
+        num_runs: int = 5,
+        max_concurrency: Optional[int] = None,
+        resume: Optional[str] = None,
+        target_ci_width: Optional[float] = None,
+        max_runs: int = 10,
+        resample_varied_only: bool = False,
+        ci_confidence: float = 0.95,
+        prompt_name: Optional[str] = None
+    ) -> RunStatistics:
+        """Execute all runs on one event loop and compute statistics.
+        
+        (run, email) pairs are scheduled in order; a semaphore caps the number
+        of emails in flight at ``max_concurrency`` (default ``max_threads``),
+        and no task is created until a slot is free. Runs overlap unless the
+        adaptive options are used, which need each run to finish before the
+        next one is planned. Output files, checkpoint, ``resume`` and the
+        adaptive options behave as in run_multiple_evaluations, and so does
+        ``prompt_name``.
+        """
+        if not isinstance(self.processor, AsyncEmailProcessor):
+            raise TypeError("arun_multiple_evaluations requires AsyncPromptExecutor instances")
+        
+        classification_prompt = PromptTemplate.for_classification(classification_prompt)
+        evaluation_prompt = PromptTemplate.for_evaluation(evaluation_prompt)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_threads)
+        emails = load_emails(dataset_path)
+        checkpoint, completed = self._open_checkpoint(output_dir, timestamp, resume)
+        tracker = self._start_tracker(checkpoint, resume, resample_varied_only)
+        wait_between_runs = target_ci_width is not None or resample_varied_only
+        email_counts = []
+        pending = set()
+        progress = self._start_progress(emails, num_runs if target_ci_width is None else None)
+        
+        def on_result(result: EvaluationResult) -> None:
+            checkpoint.append(result)
+            tracker.record(result)
+            if progress is not None:
+                progress.update(result)
+        
+        def on_done(task: asyncio.Task) -> None:
+            semaphore.release()
+            pending.discard(task)
+            # Report failures like the threaded path instead of leaving them
+            # to the event loop's exception handler
+            if task.cancelled():
+                print("Error processing email: task was cancelled")
+                return
+            error = task.exception()
+            if error is not None:
+                print(f"Error processing email: {error}")
+                return
+            try:
+                on_result(task.result())
+            except Exception as e:
+                print(f"Error processing email: {e}")
+        
+        print(f"\nStarting {num_runs if target_ci_width is None else f'up to {max_runs}'} runs")
+        try:
+            run_id = 0
+            while self._should_start_run(
+                run_id, num_runs, target_ci_width, max_runs, tracker, email_counts, ci_confidence
+            ):
+                if resample_varied_only:
+                    self._carry_stable_results(tracker, run_id, completed, on_result)
+                email_counts.append(0)
+                for email_id, email_data in emails:
+                    email_counts[run_id] += 1
+                    if (run_id, email_id) in completed:
+                        continue
+                    await semaphore.acquire()
+                    task = asyncio.ensure_future(self._aprocess_email(
+                        email_data,
+                        classification_prompt,
+                        evaluation_prompt,
+                        email_id,
+                        run_id
+                    ))
+                    pending.add(task)
+                    task.add_done_callback(on_done)
+                if wait_between_runs:
+                    # Failures were already reported by on_done
+                    await asyncio.gather(*pending, return_exceptions=True)
+                run_id += 1
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            checkpoint.close()
+            if progress is not None:
+                progress.close()
+        
+        stats = self._finalize_runs(checkpoint, tracker, email_counts, output_dir, timestamp, ci_confidence)
+        self._store_results(checkpoint, timestamp, classification_prompt, evaluation_prompt, prompt_name)
+        return stats
+
+    def _start_progress(self, emails: EmailSource, num_runs: Optional[int]) -> Optional[ProgressDisplay]:
+        if not self.show_progress:
+            return None
+        total = num_runs * len(emails) if num_runs is not None and hasattr(emails, "__len__") else None
+        return ProgressDisplay("Emails", total)
+    
+    def _process_email(self, queued_at: float, *args) -> EvaluationResult:
+        """process_single_email, recording the email's latency and time spent queued for a worker."""
+        started = time.perf_counter()
+        result = self.processor.process_single_email(*args)
+        if self.recorder is not None:
+            self.recorder.record_email(queued_at, started - queued_at, result)
+        return result
+    
+    async def _aprocess_email(self, *args) -> EvaluationResult:
+        started = time.perf_counter()
+        result = await self.processor.process_single_email(*args)
+        if self.recorder is not None:
+            self.recorder.record_email(started, 0.0, result)
+        return result
+    
+    @staticmethod
+    def _start_tracker(checkpoint: "ResultCheckpoint", resume: Optional[str], track_emails: bool) -> _RunTracker:
+        tracker = _RunTracker(track_emails)
+        if resume:
+            # De-duplicated, so a pair that errored and was redone is counted once
+            for result in checkpoint.load():
+                tracker.record(result)
+        return tracker
+
+    @staticmethod
+    def _should_start_run(
+        run_id: int,
+        num_runs: int,
+        target_ci_width: Optional[float],
+        max_runs: int,
+        tracker: _RunTracker,
+        email_counts: List[int],
+        ci_confidence: float
+    ) -> bool:
+        """Decide whether another run is needed, printing the CI in adaptive mode."""
+        if target_ci_width is None:
+            return run_id < num_runs
+        if run_id >= max(max_runs, num_runs):
+            return False
+        if run_id < max(num_runs, 2):
+            return True
+        ci_lower, ci_upper = mean_confidence_interval(tracker.run_accuracies(email_counts), ci_confidence)
+        width = ci_upper - ci_lower
+        print(f"After {run_id} runs: {ci_confidence:.0%} CI [{ci_lower:.3f}, {ci_upper:.3f}], width {width:.3f}")
+        return width > target_ci_width
+
+    @staticmethod
+    def _carry_stable_results(
+        tracker: _RunTracker,
+        run_id: int,
+        completed: Set[Tuple[int, int]],
+        on_result: Callable[[EvaluationResult], None]
+    ) -> None:
+        """Fill ``run_id`` with carried-over results for emails whose score never varied."""
+        if run_id < 2:
+            return
+        carried = 0
+        for result in tracker.stable_results():
+            if (run_id, result.id) not in completed:
+                on_result(_carried_result(result, run_id))
+                completed.add((run_id, result.id))
+                carried += 1
+        print(f"Carrying over {carried} emails with stable scores into run {run_id + 1}")
 
+    @staticmethod
+    def _open_checkpoint(
+        output_dir: str,
+        timestamp: str,
+        resume: Optional[str]
+    ) -> Tuple[ResultCheckpoint, Set[Tuple[int, int]]]:
+        if resume:
+            checkpoint = ResultCheckpoint(resume)
+            completed = checkpoint.completed_keys()
+            print(f"Resuming from {resume}: {len(completed)} results already done")
+            return checkpoint, completed
+        
+        path = f"{output_dir}/checkpoint_{timestamp}.jsonl"
+        suffix = 1
+        while os.path.exists(path):
+            path = f"{output_dir}/checkpoint_{timestamp}_{suffix}.jsonl"
+            suffix += 1
+        return ResultCheckpoint(path), set()
+
+    def _finalize_runs(
+        self,
+        checkpoint: ResultCheckpoint,
+        tracker: _RunTracker,
+        email_counts: List[int],
+        output_dir: str,
+        timestamp: str,
+        ci_confidence: float = 0.95
+    ) -> RunStatistics:
+        """Save the checkpointed results, compute statistics across runs and plot them.
+        
+        Statistics come from the tracker's running aggregates and the results
+        are streamed from the checkpoint to the CSV, so the full result set is
+        never held in memory.
+        """
+        import pandas as pd
+        
+        run_summaries = tracker.runs.summaries(email_counts)
+        
         # Save all results with model information
-        results_df = pd.DataFrame([vars(r) for r in all_results])
-        results_df['classification_model'] = self.classification_model
-        results_df['evaluation_model'] = self.evaluation_model
-        results_df.to_csv(f"{output_dir}/all_runs_{timestamp}.csv", index=False)
-        
-        # Calculate statistics
-        accuracies = [s['accuracy'] for s in run_summaries]
-        total_classification_cost = sum(s['classification_cost'] for s in run_summaries)
-        total_evaluation_cost = sum(s['evaluation_cost'] for s in run_summaries)
-        
-        stats = RunStatistics(
-            mean_accuracy=np.mean(accuracies),
-            median_accuracy=np.median(accuracies),
-            std_accuracy=np.std(accuracies),
-            min_accuracy=min(accuracies),
-            max_accuracy=max(accuracies),
-            total_classification_cost=total_classification_cost,
-            total_evaluation_cost=total_evaluation_cost,
-            run_count=num_runs
-        )
+        results_path = f"{output_dir}/all_runs_{timestamp}.csv"
+        checkpoint.export_csv(results_path, {
+            'classification_model': self.classification_model,
+            'evaluation_model': self.evaluation_model
+        })
+        pd.DataFrame(run_summaries).to_csv(f"{output_dir}/run_summary_{timestamp}.csv", index=False)
+        
+        stats = run_statistics(run_summaries, ci_confidence)
+        
+        if self.recorder is not None:
+            self.recorder.export(output_dir, timestamp)
         
         # Generate and save visualizations
-        self._plot_run_statistics(results_df, stats, output_dir, timestamp)
+        if self.plots:
+            results_df = pd.read_csv(results_path, usecols=["run_id", "validation_score"])
+            self._plot_run_statistics(results_df, stats, output_dir, timestamp)
         
         return stats
 
+    def _store_results(
+        self,
+        checkpoint: ResultCheckpoint,
+        timestamp: str,
+        classification_prompt: PromptTemplate,
+        evaluation_prompt: PromptTemplate,
+        prompt_name: Optional[str]
+    ) -> None:
+        if self.results_store is None:
+            return
+        path = self.results_store.write_checkpoint(
+            checkpoint,
+            prompt=prompt_name or classification_prompt.fingerprint,
+            template=classification_prompt.fingerprint,
+            classification_model=self.classification_model,
+            evaluation_model=self.evaluation_model,
+            timestamp=timestamp,
+            evaluation_template=evaluation_prompt.fingerprint
+        )
+        print(f"Results stored in {path}")
+
 
-    def _process_dataset(
+    def process_dataset(
             self,
-            dataset_path: str,
-            classification_prompt: str,
-            evaluation_prompt: str,
-            run_id: int
-        ) -> Tuple[List[EvaluationResult], float, float, float]:
-            """Process the dataset for a single run."""
-            df = pd.read_csv(dataset_path, delimiter=";")
-            results = []
-            total_score = 0
-            total_classification_cost = 0
-            total_evaluation_cost = 0
+            emails: EmailSource,
+            classification_prompt: PromptTemplate,
+            evaluation_prompt: PromptTemplate,
+            run_id: int,
+            completed: Set[Tuple[int, int]],
+            on_result: Callable[[EvaluationResult], None]
+        ) -> int:
+            """Process the dataset for a single run and return its email count.
+            
+            The building block of ``run_multiple_evaluations``, for callers that
+            handle results themselves: nothing is checkpointed, stored or plotted.
+            Each result is handed to ``on_result`` as it completes; pairs in
+            ``completed`` are skipped. At most ``2 * max_threads`` emails are
+            submitted ahead of the workers, so streamed datasets are never
+            fully materialised as futures.
+            """
+            if self.evaluation_threads is not None:
+                return self._process_dataset_staged(
+                    emails, classification_prompt, evaluation_prompt, run_id, completed, on_result
+                )
             
-            # Create locks for thread-safe operations
-            score_lock = Lock()
-            cost_lock = Lock()
-            results_lock = Lock()
+            num_emails = 0
+            max_pending = 2 * self.max_threads
             
             with ThreadPoolExecutor(self.max_threads) as executor:
-                futures = []
-                for index, row in df.iterrows():
-                    email_data = EmailData(
-                        subject=row["subject"],
-                        sender=row["sender"],
-                        recipients=row["recipients"],
-                        body=row["body"]
-                    )
-                    future = executor.submit(
-                        self.processor.process_single_email,
+                pending = set()
+                for email_id, email_data in emails:
+                    num_emails += 1
+                    if (run_id, email_id) in completed:
+                        continue
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        self._collect_results(done, on_result)
+                    pending.add(executor.submit(
+                        self._process_email,
+                        time.perf_counter(),
                         email_data,
                         classification_prompt,
                         evaluation_prompt,
-                        index,
+                        email_id,
                         run_id
-                    )
-                    futures.append(future)
+                    ))
                 
-                for future in as_completed(futures):
-                    try:
-                        result = future.result()
-                        
-                        # Thread-safe operations
-                        with results_lock:
-                            results.append(result)
-                        
-                        if result.validation_score is not None:
-                            with score_lock:
-                                total_score += result.validation_score
-                        
-                        with cost_lock:
-                            total_classification_cost += result.classification_cost
-                            total_evaluation_cost += result.evaluation_cost
-                            
-                    except Exception as e:
-                        print(f"Error processing email: {e}")
+                self._collect_results(as_completed(pending), on_result)
             
-            num_emails = len(df)
-            weighted_accuracy = total_score / num_emails if num_emails > 0 else 0
-            
-            return results, weighted_accuracy, total_classification_cost, total_evaluation_cost
+            return num_emails
+    
+    def _process_dataset_staged(
+        self,
+        emails: EmailSource,
+        classification_prompt: PromptTemplate,
+        evaluation_prompt: PromptTemplate,
+        run_id: int,
+        completed: Set[Tuple[int, int]],
+        on_result: Callable[[EvaluationResult], None]
+    ) -> int:
+        """Process a run with separate classification and evaluation worker pools."""
+        classified_queue = queue.Queue(maxsize=self.stage_queue_size)
+        results = queue.Queue()
+        metrics = StageMetrics(run_id, self.stage_queue_size)
+        source = iter(emails)
+        source_lock = Lock()
+        num_emails = 0
+        
+        def next_email() -> Optional[Tuple[int, EmailData]]:
+            nonlocal num_emails
+            with source_lock:
+                for email_id, email_data in source:
+                    num_emails += 1
+                    if (run_id, email_id) not in completed:
+                        return email_id, email_data
+                return None
+        
+        def record_email(email_started: float, queue_wait: float, result: EvaluationResult) -> None:
+            # The queue wait of a staged email is its time between the two stages
+            if self.recorder is not None:
+                self.recorder.record_email(email_started, queue_wait, result)
+        
+        def classification_worker() -> None:
+            while (item := next_email()) is not None:
+                email_id, email_data = item
+                email_started = time.perf_counter()
+                classified = self.processor.classify(email_data, classification_prompt, email_id, run_id)
+                if isinstance(classified, EvaluationResult):
+                    record_email(email_started, 0.0, classified)
+                    results.put(classified)
+                    continue
+                started = time.perf_counter()
+                classified_queue.put((classified, email_started, started))
+                metrics.record_put(classified_queue.qsize(), time.perf_counter() - started)
+        
+        def evaluation_worker() -> None:
+            while True:
+                started = time.perf_counter()
+                item = classified_queue.get()
+                metrics.record_get(time.perf_counter() - started)
+                if item is _STAGE_DONE:
+                    return
+                classified, email_started, queued_at = item
+                queue_wait = time.perf_counter() - queued_at
+                result = self.processor.evaluate(classified, evaluation_prompt)
+                record_email(email_started, queue_wait, result)
+                results.put(result)
+                with metrics.lock:
+                    metrics.evaluated += 1
+        
+        def close_stages(classifiers: List[Thread], evaluators: List[Thread]) -> None:
+            for thread in classifiers:
+                thread.join()
+            for _ in evaluators:
+                classified_queue.put(_STAGE_DONE)
+            for thread in evaluators:
+                thread.join()
+            results.put(_STAGE_DONE)
+        
+        classifiers = [Thread(target=classification_worker, daemon=True) for _ in range(self.max_threads)]
+        evaluators = [Thread(target=evaluation_worker, daemon=True) for _ in range(self.evaluation_threads)]
+        for thread in classifiers + evaluators:
+            thread.start()
+        Thread(target=close_stages, args=(classifiers, evaluators), daemon=True).start()
+        
+        while (result := results.get()) is not _STAGE_DONE:
+            try:
+                on_result(result)
+            except Exception as e:
+                print(f"Error processing email: {e}")
+        
+        self.stage_metrics.append(metrics)
+        print(metrics.summary())
+        return num_emails
+    
+    @staticmethod
+    def _collect_results(futures, on_result: Callable[[EvaluationResult], None]) -> None:
+        for future in futures:
+            try:
+                on_result(future.result())
+            except Exception as e:
+                print(f"Error processing email: {e}")
     
     def _plot_run_statistics(
         self,
-        results_df: pd.DataFrame,
+        results_df: "pd.DataFrame",
         stats: RunStatistics,
         output_dir: str,
         timestamp: str
     ) -> None:
         """Generate and save statistical visualizations."""
-        # 1. Box plot of accuracy distribution across runs
-        fig_box = px.box(
-            results_df,
-            x="run_id",
-            y="validation_score",
-            title="Accuracy Distribution Across Runs",
-            labels={"run_id": "Run ID", "validation_score": "Accuracy (%)"}
-        )
-        fig_box.write_html(f"{output_dir}/accuracy_distribution_{timestamp}.html")
-        
-        # 2. Violin plot for detailed distribution visualization
-        fig_violin = px.violin(
-            results_df,
-            x="run_id",
-            y="validation_score",
-            title="Detailed Accuracy Distribution",
-            box=True,
-            points="all"
-        )
-        fig_violin.write_html(f"{output_dir}/accuracy_violin_{timestamp}.html")
-        
-        # 3. Statistical summary plot
-        total_cost = stats.total_classification_cost + stats.total_evaluation_cost
-        
-        fig_stats = go.Figure()
-        fig_stats.add_trace(go.Indicator(
-            mode="number+gauge+delta",
-            value=stats.mean_accuracy,
-            delta={'reference': stats.median_accuracy},
-            gauge={
-                'axis': {'range': [stats.min_accuracy, stats.max_accuracy]},
-                'steps': [
-                    {'range': [stats.min_accuracy, stats.mean_accuracy], 'color': "lightgray"},
-                    {'range': [stats.mean_accuracy, stats.max_accuracy], 'color': "gray"}  # Fixed this line
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': stats.mean_accuracy + stats.std_accuracy
-                }
-            },
-            title={
-                'text': f"Accuracy Statistics (n={stats.run_count})<br>" +
-                    f"<span style='font-size:0.8em'>Total Cost: ${total_cost:.2f}</span>"
-            }
-        ))
-        fig_stats.write_html(f"{output_dir}/statistics_summary_{timestamp}.html")
\ No newline at end of file
+        from reporting import plot_run_statistics
+        
+        plot_run_statistics(results_df, stats, output_dir, timestamp, self.max_plot_points)
@@ -0,0 +1,125 @@
+import hashlib
+from string import Formatter
+from typing import Iterable, Optional, Tuple, Union
+
+
+CLASSIFICATION_FIELDS = ("subject", "sender", "recipients", "body")
+EVALUATION_FIELDS = CLASSIFICATION_FIELDS + ("output",)
+
+
+class PromptTemplateError(ValueError):
+    """Raised when a prompt template has missing or unknown placeholders."""
+
+
+class RenderedPrompt(str):
+    """A rendered prompt that remembers where its static prefix ends.
+
+    It behaves exactly like ``str``; executors that support a split message
+    layout use ``prefix_length`` to send ``self[:prefix_length]`` as a stable,
+    provider-cacheable instruction block and the rest as the variable part.
+    ``suffix_length`` marks the static text after the variable part, so
+    batching executors can share one prefix and suffix between several emails.
+    """
+
+    def __new__(cls, value: str, prefix_length: int = 0, suffix_length: int = 0):
+        rendered = super().__new__(cls, value)
+        rendered.prefix_length = prefix_length
+        rendered.suffix_length = suffix_length
+        return rendered
+
+    @property
+    def variable_part(self) -> str:
+        return self[self.prefix_length:len(self) - self.suffix_length]
+
+
+class PromptTemplate:
+    """A prompt parsed once into literal and placeholder segments.
+
+    Parsing follows ``str.format`` rules, so escaped ``{{ }}`` braces become
+    literal braces. Placeholders are validated when the template is built, and
+    ``render`` only joins the precomputed segments with the field values.
+    """
+
+    def __init__(
+        self,
+        template: str,
+        required_fields: Iterable[str] = (),
+        allowed_fields: Optional[Iterable[str]] = None
+    ):
+        self.template = template
+        self.required_fields = tuple(required_fields)
+
+        literals = []
+        placeholders = []
+        current_literal = []
+        for literal, field_name, format_spec, conversion in Formatter().parse(template):
+            current_literal.append(literal)
+            if field_name is None:
+                continue
+            if not field_name.isidentifier():
+                raise PromptTemplateError(f"Unsupported placeholder {{{field_name}}} in prompt template")
+            literals.append("".join(current_literal))
+            placeholders.append((field_name, format_spec, conversion))
+            current_literal = []
+        literals.append("".join(current_literal))
+
+        self.literals: Tuple[str, ...] = tuple(literals)
+        self.placeholders: Tuple[Tuple[str, str, Optional[str]], ...] = tuple(placeholders)
+        self.fields = frozenset(name for name, _, _ in placeholders)
+        # Split rendered prompts at the last line break of the static prefix, so
+        # the variable part starts with a whole line such as "- **Subject**: `...`"
+        self.split_offset = literals[0].rfind("\n") + 1
+        # Likewise the static suffix starts after the line of the last placeholder
+        suffix_start = literals[-1].find("\n")
+        self.suffix_length = len(literals[-1]) - suffix_start - 1 if placeholders and suffix_start >= 0 else 0
+
+        missing = [name for name in self.required_fields if name not in self.fields]
+        if missing:
+            raise PromptTemplateError(f"Prompt template is missing placeholders: {', '.join(missing)}")
+
+        allowed = set(allowed_fields) if allowed_fields is not None else set(self.required_fields)
+        unknown = sorted(self.fields - allowed) if allowed else []
+        if unknown:
+            raise PromptTemplateError(f"Prompt template has unknown placeholders: {', '.join(unknown)}")
+
+    @property
+    def static_prefix(self) -> str:
+        """The literal text before the first placeholder, identical for every render."""
+        return self.literals[0]
+
+    @property
+    def fingerprint(self) -> str:
+        """Short content hash of the template text, identifying a prompt version."""
+        return hashlib.sha256(self.template.encode("utf-8")).hexdigest()[:12]
+
+    def render(self, **values) -> RenderedPrompt:
+        parts = [self.literals[0]]
+        for (name, format_spec, conversion), literal in zip(self.placeholders, self.literals[1:]):
+            value = values[name]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "s":
+                value = str(value)
+            elif conversion == "a":
+                value = ascii(value)
+            parts.append(format(value, format_spec) if format_spec else str(value))
+            parts.append(literal)
+        return RenderedPrompt("".join(parts), self.split_offset, self.suffix_length)
+
+    @classmethod
+    def compile(cls, template: Union[str, "PromptTemplate"], required_fields: Iterable[str]) -> "PromptTemplate":
+        """Return ``template`` as a PromptTemplate, parsing it if it is a string."""
+        if isinstance(template, PromptTemplate):
+            missing = [name for name in required_fields if name not in template.fields]
+            if missing:
+                raise PromptTemplateError(f"Prompt template is missing placeholders: {', '.join(missing)}")
+            return template
+        return cls(template, required_fields)
+
+    @classmethod
+    def for_classification(cls, template: Union[str, "PromptTemplate"]) -> "PromptTemplate":
+        return cls.compile(template, CLASSIFICATION_FIELDS)
+
+    @classmethod
+    def for_evaluation(cls, template: Union[str, "PromptTemplate"]) -> "PromptTemplate":
+        return cls.compile(template, EVALUATION_FIELDS)
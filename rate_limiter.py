@@ -0,0 +1,117 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Optional
+
+
+# Rough characters-per-token ratio for English text with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(prompt: str, expected_completion_tokens: int = 0) -> int:
+    """Estimate the token cost of a call from the formatted prompt length."""
+    return len(prompt) // CHARS_PER_TOKEN + 1 + expected_completion_tokens
+
+
+@dataclass
+class RateLimit:
+    """Provider limits for a single model. Either limit may be left unset."""
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations.
+
+    A reservation debits the bucket immediately, even below zero, and returns
+    how long the caller has to wait before the debt is paid off by the refill.
+    Callers therefore queue up in arrival order and the sustained rate never
+    exceeds ``rate_per_minute``.
+    """
+
+    def __init__(self, rate_per_minute: float, burst_seconds: float = 1.0):
+        self.rate_per_second = rate_per_minute / 60
+        self.capacity = max(self.rate_per_second * burst_seconds, 1.0)
+        self.balance = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        self.balance = min(self.capacity, self.balance + elapsed * self.rate_per_second)
+        self.updated_at = now
+
+    def reserve(self, amount: float) -> float:
+        """Debit ``amount`` and return the number of seconds to wait."""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.balance -= amount
+            if self.balance >= 0:
+                return 0.0
+            return -self.balance / self.rate_per_second
+
+    def adjust(self, amount: float) -> None:
+        """Credit (positive) or debit (negative) the bucket after the fact."""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.balance = min(self.capacity, self.balance + amount)
+
+
+class RateLimiter:
+    """Client-side requests-per-minute and tokens-per-minute limiter, keyed per model.
+
+    Share one instance between every executor that talks to the same provider
+    account, so classification and evaluation calls draw from the same budget.
+    ``headroom`` scales the configured limits down so throughput settles just
+    under the provider limit instead of bouncing off it.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, RateLimit],
+        headroom: float = 0.9,
+        expected_completion_tokens: int = 256,
+        burst_seconds: float = 1.0
+    ):
+        self.expected_completion_tokens = expected_completion_tokens
+        self.request_buckets: Dict[str, TokenBucket] = {}
+        self.token_buckets: Dict[str, TokenBucket] = {}
+        for model, limit in limits.items():
+            if limit.requests_per_minute:
+                self.request_buckets[model] = TokenBucket(limit.requests_per_minute * headroom, burst_seconds)
+            if limit.tokens_per_minute:
+                self.token_buckets[model] = TokenBucket(limit.tokens_per_minute * headroom, burst_seconds)
+
+    def estimate(self, prompt: str) -> int:
+        return estimate_tokens(prompt, self.expected_completion_tokens)
+
+    def _reserve(self, model: str, estimated_tokens: int) -> float:
+        wait = 0.0
+        if model in self.request_buckets:
+            wait = max(wait, self.request_buckets[model].reserve(1))
+        if model in self.token_buckets:
+            wait = max(wait, self.token_buckets[model].reserve(estimated_tokens))
+        return wait
+
+    def acquire(self, model: str, estimated_tokens: int) -> float:
+        """Block the calling thread until a call of ``estimated_tokens`` may be sent.
+
+        Returns the number of seconds waited.
+        """
+        wait = self._reserve(model, estimated_tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, model: str, estimated_tokens: int) -> float:
+        """Async variant of acquire that sleeps without blocking the event loop."""
+        wait = self._reserve(model, estimated_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def reconcile(self, model: str, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once the real usage of a call is known."""
+        if model in self.token_buckets:
+            self.token_buckets[model].adjust(estimated_tokens - actual_tokens)
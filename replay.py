@@ -0,0 +1,239 @@
+import asyncio
+import glob
+import json
+import math
+import random
+import re
+import time
+import zlib
+from dataclasses import dataclass
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from prompt_evaluation_pipeline import (
+    AsyncPromptExecutor,
+    CallStats,
+    PromptExecutor,
+    RetriesExhaustedError,
+    RetryPolicy,
+    _parse_json_content,
+)
+from rate_limiter import estimate_tokens
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Every prompt in prompts/ renders the subject as "**Subject**: `...`"
+SUBJECT_PATTERN = re.compile(r"\*\*Subject\*\*: `([^`]*)`")
+# Item headings of a BatchingExecutor prompt
+BATCH_ITEM_PATTERN = re.compile(r"^### Email (\d+)$", re.MULTILINE)
+
+Latency = Callable[[random.Random], float]
+
+
+@dataclass(frozen=True)
+class ConstantLatency:
+    seconds: float
+
+    def __call__(self, rng: random.Random) -> float:
+        return self.seconds
+
+
+@dataclass(frozen=True)
+class LognormalLatency:
+    """Right-skewed latency around ``median`` seconds, like real API response times."""
+    median: float
+    sigma: float = 0.5
+
+    def __call__(self, rng: random.Random) -> float:
+        return rng.lognormvariate(math.log(self.median), self.sigma)
+
+
+class SyntheticAPIError(Exception):
+    """Injected failure of a replayed call; retried like a transient API error."""
+
+
+class ReplayResponses:
+    """Recorded classification and evaluation responses, keyed by email subject.
+
+    Built from the ``all_runs_*.csv`` files of earlier evaluations: the
+    ``predicted_json`` column holds the classification outputs and
+    ``validation_score``/``validation_evaluation`` the evaluator's answers.
+    """
+
+    def __init__(self, results: "pd.DataFrame"):
+        results = results.dropna(subset=["predicted_json", "validation_score"])
+        if results.empty:
+            raise ValueError("No successful results to replay")
+        evaluations = [
+            json.dumps({"score": score, "evaluation": evaluation})
+            for score, evaluation in zip(results["validation_score"], results["validation_evaluation"])
+        ]
+        self.responses: Dict[str, List[Tuple[str, float]]] = {
+            "classification": list(zip(results["predicted_json"], results["classification_cost"])),
+            "evaluation": list(zip(evaluations, results["evaluation_cost"])),
+        }
+        self.by_subject: Dict[str, List[int]] = {}
+        for position, subject in enumerate(results["subject"]):
+            self.by_subject.setdefault(subject, []).append(position)
+
+    @classmethod
+    def from_results(cls, pattern: str = "evaluation_results/**/all_runs_*.csv") -> "ReplayResponses":
+        paths = sorted(glob.glob(pattern, recursive=True))
+        if not paths:
+            raise FileNotFoundError(f"No result files match {pattern}")
+        import pandas as pd
+
+        return cls(pd.concat([pd.read_csv(path) for path in paths], ignore_index=True))
+
+    def lookup(self, stage: str, text: str) -> Tuple[str, float]:
+        """Return a recorded (raw JSON, cost) for the email in ``text``.
+
+        The same text always gets the same response. Emails whose subject was
+        never recorded get one picked by a hash of the text.
+        """
+        digest = zlib.crc32(text.encode("utf-8"))
+        match = SUBJECT_PATTERN.search(text)
+        positions = self.by_subject.get(match.group(1)) if match else None
+        if positions:
+            return self.responses[stage][positions[digest % len(positions)]]
+        responses = self.responses[stage]
+        return responses[digest % len(responses)]
+
+
+class _ReplayExecutorBase:
+    """Response selection, failure injection and bookkeeping shared by the replay executors."""
+
+    def _setup(
+        self,
+        responses: ReplayResponses,
+        stage: str,
+        latency: Optional[Latency],
+        error_rate: float,
+        retry_policy: Optional[RetryPolicy],
+        seed: Optional[int]
+    ) -> None:
+        if stage not in ("classification", "evaluation"):
+            raise ValueError(f"stage must be 'classification' or 'evaluation', not {stage!r}")
+        if not 0.0 <= error_rate < 1.0:
+            raise ValueError("error_rate must be in [0, 1)")
+        self.responses = responses
+        self.stage = stage
+        self.latency = latency or ConstantLatency(0.0)
+        self.error_rate = error_rate
+        self.retry_policy = retry_policy or RetryPolicy(
+            base_delay=0.01, max_delay=0.1, retryable_errors=(SyntheticAPIError,)
+        )
+        self.random = random.Random(seed)
+        self.lock = Lock()
+        self.calls = 0
+        self.busy_seconds = 0.0
+
+    def _next_attempt(self) -> Tuple[float, bool]:
+        """Draw the latency of one attempt and whether it fails."""
+        with self.lock:
+            self.calls += 1
+            delay = max(self.latency(self.random), 0.0)
+            failed = self.random.random() < self.error_rate
+            self.busy_seconds += delay
+        return delay, failed
+
+    def _on_failure(self, attempt: int, stats: CallStats) -> float:
+        """Return the backoff before the next attempt, or raise once retries are spent."""
+        error = SyntheticAPIError(f"Injected {self.stage} failure")
+        if not self.retry_policy.should_retry(error, attempt):
+            raise RetriesExhaustedError(error, stats)
+        delay = self.retry_policy.backoff(attempt, error)
+        stats.backoff_seconds += delay
+        return delay
+
+    def _answer(self, prompt: str, stats: CallStats) -> Tuple[dict, float]:
+        items = BATCH_ITEM_PATTERN.split(prompt)
+        if len(items) > 1:
+            # A BatchingExecutor prompt: answer each "### Email <id>" section
+            answers = [
+                (item_id, *self.responses.lookup(self.stage, section))
+                for item_id, section in zip(items[1::2], items[2::2])
+            ]
+            raw = json.dumps([{"id": int(item_id), **json.loads(text)} for item_id, text, _ in answers])
+            cost = sum(item_cost for _, _, item_cost in answers)
+        else:
+            raw, cost = self.responses.lookup(self.stage, prompt)
+        stats.prompt_tokens += estimate_tokens(prompt)
+        stats.completion_tokens += estimate_tokens(raw)
+        parse_started = time.perf_counter()
+        output = _parse_json_content(raw)
+        stats.parse_seconds += time.perf_counter() - parse_started
+        return output, cost
+
+
+class ReplayExecutor(_ReplayExecutorBase, PromptExecutor):
+    """Serves recorded responses instead of calling an API.
+
+    Each attempt sleeps for a ``latency`` draw and fails with probability
+    ``error_rate``; failures are retried under ``retry_policy`` like the
+    OpenAI executors' transient errors. ``busy_seconds`` sums the simulated
+    latency, so the pipeline's own overhead is what remains of the wall time.
+    """
+
+    def __init__(
+        self,
+        responses: ReplayResponses,
+        stage: str,
+        model: str = "replay",
+        latency: Optional[Latency] = None,
+        error_rate: float = 0.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        seed: Optional[int] = None
+    ):
+        super().__init__(model)
+        self._setup(responses, stage, latency, error_rate, retry_policy, seed)
+
+    def execute(self, prompt: str) -> Tuple[dict, float]:
+        output, cost, _ = self.execute_with_stats(prompt)
+        return output, cost
+
+    def execute_with_stats(self, prompt: str) -> Tuple[dict, float, CallStats]:
+        stats = CallStats(attempts=0)
+        while True:
+            stats.attempts += 1
+            delay, failed = self._next_attempt()
+            if delay:
+                time.sleep(delay)
+            if not failed:
+                output, cost = self._answer(prompt, stats)
+                return output, cost, stats
+            time.sleep(self._on_failure(stats.attempts, stats))
+
+
+class AsyncReplayExecutor(_ReplayExecutorBase, AsyncPromptExecutor):
+    """Async counterpart of ReplayExecutor."""
+
+    def __init__(
+        self,
+        responses: ReplayResponses,
+        stage: str,
+        model: str = "replay",
+        latency: Optional[Latency] = None,
+        error_rate: float = 0.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        seed: Optional[int] = None
+    ):
+        super().__init__(model)
+        self._setup(responses, stage, latency, error_rate, retry_policy, seed)
+
+    async def execute(self, prompt: str) -> Tuple[dict, float]:
+        output, cost, _ = await self.execute_with_stats(prompt)
+        return output, cost
+
+    async def execute_with_stats(self, prompt: str) -> Tuple[dict, float, CallStats]:
+        stats = CallStats(attempts=0)
+        while True:
+            stats.attempts += 1
+            delay, failed = self._next_attempt()
+            await asyncio.sleep(delay)
+            if not failed:
+                output, cost = self._answer(prompt, stats)
+                return output, cost, stats
+            await asyncio.sleep(self._on_failure(stats.attempts, stats))
@@ -0,0 +1,175 @@
+import os
+import re
+from typing import Optional
+
+import pandas as pd
+
+
+# Above this many scored rows the plots are built from quantiles and a sample
+MAX_PLOT_POINTS = 5000
+
+_TIMESTAMP_PATTERN = re.compile(r"(\d{8}_\d{6})")
+
+
+def _box_statistics(scores: pd.DataFrame) -> pd.DataFrame:
+    """Per-run quartiles and Tukey whiskers, computed over every row."""
+    grouped = scores.groupby("run_id")["validation_score"]
+    summary = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    summary.columns = ["q1", "median", "q3"]
+    summary["mean"] = grouped.mean()
+    iqr = summary["q3"] - summary["q1"]
+    low_limit = scores["run_id"].map(summary["q1"] - 1.5 * iqr)
+    high_limit = scores["run_id"].map(summary["q3"] + 1.5 * iqr)
+    inside = scores[(scores["validation_score"] >= low_limit) & (scores["validation_score"] <= high_limit)]
+    whiskers = inside.groupby("run_id")["validation_score"].agg(["min", "max"])
+    summary["lowerfence"] = whiskers["min"]
+    summary["upperfence"] = whiskers["max"]
+    return summary.reset_index()
+
+
+def _sample_per_run(scores: pd.DataFrame, max_points: int, seed: int = 0) -> pd.DataFrame:
+    """At most ``max_points`` rows, split evenly over the runs."""
+    per_run = max(max_points // max(scores["run_id"].nunique(), 1), 1)
+    shuffled = scores.sample(frac=1.0, random_state=seed)
+    return shuffled.groupby("run_id").head(per_run).sort_values("run_id", kind="stable")
+
+
+def plot_run_statistics(
+    results_df: pd.DataFrame,
+    stats,
+    output_dir: str,
+    timestamp: str,
+    max_points: int = MAX_PLOT_POINTS
+) -> None:
+    """Write the box, violin and summary plots of an evaluation.
+
+    ``results_df`` needs the ``run_id`` and ``validation_score`` columns. Up
+    to ``max_points`` scored rows, every point is plotted. Beyond that the box
+    plot is drawn from exact per-run quartiles and the violin from a per-run
+    sample of ``max_points`` rows, so file size and build time stay flat.
+    """
+    # Plotly is slow to import and not needed for headless runs without plots
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    scores = results_df[["run_id", "validation_score"]].dropna()
+    aggregated = len(scores) > max_points
+
+    # 1. Box plot of accuracy distribution across runs
+    if aggregated:
+        box = _box_statistics(scores)
+        fig_box = go.Figure(go.Box(
+            x=box["run_id"],
+            q1=box["q1"],
+            median=box["median"],
+            q3=box["q3"],
+            mean=box["mean"],
+            lowerfence=box["lowerfence"],
+            upperfence=box["upperfence"],
+            name="validation_score"
+        ))
+        fig_box.update_layout(
+            title=f"Accuracy Distribution Across Runs ({len(scores)} results)",
+            xaxis_title="Run ID",
+            yaxis_title="Accuracy (%)"
+        )
+    else:
+        fig_box = px.box(
+            scores,
+            x="run_id",
+            y="validation_score",
+            title="Accuracy Distribution Across Runs",
+            labels={"run_id": "Run ID", "validation_score": "Accuracy (%)"}
+        )
+    fig_box.write_html(f"{output_dir}/accuracy_distribution_{timestamp}.html")
+
+    # 2. Violin plot for detailed distribution visualization
+    violin_scores = _sample_per_run(scores, max_points) if aggregated else scores
+    fig_violin = px.violin(
+        violin_scores,
+        x="run_id",
+        y="validation_score",
+        title="Detailed Accuracy Distribution" + (f" (sample of {len(violin_scores)} results)" if aggregated else ""),
+        box=True,
+        points="all"
+    )
+    fig_violin.write_html(f"{output_dir}/accuracy_violin_{timestamp}.html")
+
+    # 3. Statistical summary plot
+    total_cost = stats.total_classification_cost + stats.total_evaluation_cost
+
+    fig_stats = go.Figure()
+    fig_stats.add_trace(go.Indicator(
+        mode="number+gauge+delta",
+        value=stats.mean_accuracy,
+        delta={'reference': stats.median_accuracy},
+        gauge={
+            'axis': {'range': [stats.min_accuracy, stats.max_accuracy]},
+            'steps': [
+                {'range': [stats.min_accuracy, stats.mean_accuracy], 'color': "lightgray"},
+                {'range': [stats.mean_accuracy, stats.max_accuracy], 'color': "gray"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': stats.mean_accuracy + stats.std_accuracy
+            }
+        },
+        title={
+            'text': f"Accuracy Statistics (n={stats.run_count})<br>" +
+                f"<span style='font-size:0.8em'>Total Cost: ${total_cost:.2f}</span>"
+        }
+    ))
+    fig_stats.write_html(f"{output_dir}/statistics_summary_{timestamp}.html")
+
+
+def _run_summaries(results_path: str) -> list:
+    """Per-run accuracy and cost rows for a stored ``all_runs_*.csv``.
+
+    The ``run_summary_*.csv`` saved next to it is used when present. Without
+    it, each run's email count is the number of its rows, so emails that
+    never produced a result are not counted.
+    """
+    summary_path = re.sub(r"all_runs_(\d{8}_\d{6})\.csv$", r"run_summary_\1.csv", results_path)
+    if summary_path != results_path and os.path.exists(summary_path):
+        return pd.read_csv(summary_path).to_dict("records")
+    header = pd.read_csv(results_path, nrows=0).columns
+    columns = ["run_id", "validation_score", "classification_cost", "evaluation_cost"]
+    columns += ["saved_cost"] if "saved_cost" in header else []
+    results = pd.read_csv(results_path, usecols=columns)
+    # Errored emails count as 0, as in the pipeline
+    results["validation_score"] = results["validation_score"].fillna(0.0)
+    runs = results.groupby("run_id").agg(
+        accuracy=("validation_score", "mean"),
+        classification_cost=("classification_cost", "sum"),
+        evaluation_cost=("evaluation_cost", "sum"),
+        **({"saved_cost": ("saved_cost", "sum")} if "saved_cost" in columns else {})
+    )
+    return runs.reset_index().to_dict("records")
+
+
+def regenerate_report(
+    results_path: str,
+    output_dir: Optional[str] = None,
+    timestamp: Optional[str] = None,
+    max_points: int = MAX_PLOT_POINTS,
+    ci_confidence: float = 0.95
+):
+    """Draw the plots of a finished evaluation from its ``all_runs_*.csv``.
+
+    For evaluations run with ``plots=False``, or to redraw old ones. Plots
+    go to ``output_dir`` (default: next to the CSV) under the timestamp in
+    the file name. Returns the evaluation's RunStatistics.
+    """
+    from prompt_evaluation_pipeline import run_statistics
+
+    output_dir = output_dir or os.path.dirname(os.path.abspath(results_path))
+    if timestamp is None:
+        match = _TIMESTAMP_PATTERN.search(os.path.basename(results_path))
+        if match is None:
+            raise ValueError(f"No timestamp in {results_path}; pass one explicitly")
+        timestamp = match.group(1)
+    stats = run_statistics(_run_summaries(results_path), ci_confidence)
+    results_df = pd.read_csv(results_path, usecols=["run_id", "validation_score"])
+    plot_run_statistics(results_df, stats, output_dir, timestamp, max_points)
+    return stats
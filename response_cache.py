@@ -0,0 +1,156 @@
+import hashlib
+import json
+import sqlite3
+import time
+from threading import Lock
+from typing import Optional, Tuple
+
+from prompt_evaluation_pipeline import AsyncPromptExecutor, CallStats, PromptExecutor
+
+
+class ResponseCache:
+    """Disk-backed, content-addressed store of executor responses.
+
+    Entries are keyed on a hash of (model, temperature, fully formatted prompt)
+    and kept in a SQLite file, so they survive across runs and processes.
+    When ``max_entries`` is set, the least recently used entries are evicted.
+    """
+
+    def __init__(self, path: str, max_entries: Optional[int] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.saved_cost = 0.0
+        self.lock = Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                output TEXT NOT NULL,
+                cost REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self.connection.commit()
+        self.entry_count = self.connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        with self.lock:
+            self._evict()
+
+    @staticmethod
+    def key(model: str, temperature: float, prompt: str) -> str:
+        payload = json.dumps([model, temperature, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[dict, float]]:
+        """Return the stored (output, original cost) for ``key``, counting the hit or miss."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT output, cost FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.connection.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self.connection.commit()
+            self.hits += 1
+            self.saved_cost += row[1]
+            return json.loads(row[0]), row[1]
+
+    def put(self, key: str, model: str, output: dict, cost: float) -> None:
+        with self.lock:
+            inserted = self.connection.execute(
+                "INSERT OR IGNORE INTO responses (key, model, output, cost, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(output), cost, time.time())
+            ).rowcount
+            self.entry_count += inserted
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries beyond ``max_entries``. Caller holds the lock."""
+        if self.max_entries is not None and self.entry_count > self.max_entries:
+            excess = self.entry_count - self.max_entries
+            self.connection.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                (excess,)
+            )
+            self.entry_count -= excess
+        self.connection.commit()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.connection.execute("DELETE FROM responses")
+            self.connection.commit()
+            self.entry_count = 0
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class CachedExecutor(PromptExecutor):
+    """Wraps any PromptExecutor with a ResponseCache.
+
+    Cache hits cost $0; the cost the call originally had is reported as
+    ``saved_cost`` in the CallStats instead. By default only deterministic
+    calls (temperature 0) are cached, since caching sampled outputs would
+    hide the run-to-run variance that multiple runs are meant to measure.
+    """
+
+    def __init__(self, executor: PromptExecutor, cache: ResponseCache, only_deterministic: bool = True):
+        super().__init__(executor.model, executor.temperature)
+        self.executor = executor
+        self.cache = cache
+        self.enabled = not only_deterministic or executor.temperature == 0.0
+
+    def execute(self, prompt: str) -> Tuple[dict, float]:
+        output, cost, _ = self.execute_with_stats(prompt)
+        return output, cost
+
+    def execute_with_stats(self, prompt: str) -> Tuple[dict, float, CallStats]:
+        if not self.enabled:
+            return self.executor.execute_with_stats(prompt)
+
+        key = ResponseCache.key(self.model, self.temperature, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            output, saved_cost = cached
+            return output, 0.0, CallStats(attempts=0, cache_hit=True, saved_cost=saved_cost)
+
+        output, cost, stats = self.executor.execute_with_stats(prompt)
+        self.cache.put(key, self.model, output, cost)
+        return output, cost, stats
+
+
+class AsyncCachedExecutor(AsyncPromptExecutor):
+    """Async counterpart of CachedExecutor for AsyncPromptExecutor instances."""
+
+    def __init__(self, executor: AsyncPromptExecutor, cache: ResponseCache, only_deterministic: bool = True):
+        super().__init__(executor.model, executor.temperature)
+        self.executor = executor
+        self.cache = cache
+        self.enabled = not only_deterministic or executor.temperature == 0.0
+
+    async def execute(self, prompt: str) -> Tuple[dict, float]:
+        output, cost, _ = await self.execute_with_stats(prompt)
+        return output, cost
+
+    async def execute_with_stats(self, prompt: str) -> Tuple[dict, float, CallStats]:
+        if not self.enabled:
+            return await self.executor.execute_with_stats(prompt)
+
+        key = ResponseCache.key(self.model, self.temperature, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            output, saved_cost = cached
+            return output, 0.0, CallStats(attempts=0, cache_hit=True, saved_cost=saved_cost)
+
+        output, cost, stats = await self.executor.execute_with_stats(prompt)
+        self.cache.put(key, self.model, output, cost)
+        return output, cost, stats
@@ -0,0 +1,236 @@
+import glob
+import json
+import os
+import re
+from typing import Iterable, List, Optional, Sequence
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from metrics import LABEL_FIELDS
+from pre_scorer import LIST_FIELDS, TEXT_FIELDS
+from prompt_evaluation_pipeline import EvaluationResult, ResultCheckpoint
+
+
+PARTITION_KEYS = ("prompt", "model", "template", "timestamp")
+PARTITIONING = ds.partitioning(pa.schema([(key, pa.string()) for key in PARTITION_KEYS]), flavor="hive")
+
+_ARROW_TYPES = {int: pa.int64(), float: pa.float64(), str: pa.string(), bool: pa.bool_()}
+_TIMESTAMP_PATTERN = re.compile(r"(\d{8}_\d{6})")
+
+
+def _result_schema() -> pa.Schema:
+    """EvaluationResult columns, then the run's evaluation model and the exploded prediction."""
+    columns = []
+    for name, definition in EvaluationResult.__dataclass_fields__.items():
+        # Optional[X] annotations: take X
+        python_type = getattr(definition.type, "__args__", (definition.type,))[0]
+        columns.append((name, _ARROW_TYPES[python_type]))
+    columns += [("evaluation_model", pa.string()), ("evaluation_template", pa.string())]
+    columns += [(name, pa.string()) for name in LABEL_FIELDS + TEXT_FIELDS]
+    columns += [(name, pa.list_(pa.string())) for name in LIST_FIELDS]
+    return pa.schema(columns)
+
+
+RESULT_SCHEMA = _result_schema()
+DATASET_SCHEMA = pa.schema(list(RESULT_SCHEMA) + [pa.field(key, pa.string()) for key in PARTITION_KEYS])
+
+
+def _explode_prediction(predicted_json) -> dict:
+    """Typed fields of one classification output; anything malformed becomes null."""
+    try:
+        output = json.loads(predicted_json) if isinstance(predicted_json, str) else None
+    except ValueError:
+        output = None
+    output = output if isinstance(output, dict) else {}
+    row = {}
+    for name in LABEL_FIELDS + TEXT_FIELDS:
+        value = output.get(name)
+        row[name] = value if isinstance(value, str) else None
+    for name in LIST_FIELDS:
+        value = output.get(name)
+        # The prompt allows an empty string when there is nothing to list
+        if value == "":
+            value = []
+        row[name] = [str(item) for item in value] if isinstance(value, list) else None
+    return row
+
+
+def _normalized(labels: pd.Series) -> pd.Series:
+    return labels.str.split().str.join(" ").str.casefold()
+
+
+class ResultsStore:
+    """Append-only Parquet store of evaluation results.
+
+    Every evaluation is written once, to
+    ``{root}/prompt=<name>/model=<classification model>/template=<hash>/timestamp=<ts>/``,
+    with typed columns and the classification output exploded into one
+    column per field. Queries read only the columns and partitions they need.
+    """
+
+    def __init__(self, root: str = "evaluation_results/store"):
+        self.root = root
+
+    def partition_path(self, prompt: str, model: str, template: str, timestamp: str) -> str:
+        segments = [f"{key}={quote(value, safe='')}" for key, value in zip(PARTITION_KEYS, (prompt, model, template, timestamp))]
+        return os.path.join(self.root, *segments)
+
+    def write(
+        self,
+        frames: Iterable[pd.DataFrame],
+        prompt: str,
+        template: str,
+        classification_model: str,
+        evaluation_model: str,
+        timestamp: str,
+        evaluation_template: Optional[str] = None
+    ) -> str:
+        """Write one evaluation's results, given as DataFrames of EvaluationResult columns.
+
+        Columns missing from a frame are stored as null. Returns the new
+        partition directory; an existing partition is never overwritten.
+        """
+        directory = self.partition_path(prompt, classification_model, template, timestamp)
+        if os.path.exists(directory):
+            raise FileExistsError(f"Results for {directory} are already stored")
+        os.makedirs(directory)
+        fields = list(EvaluationResult.__dataclass_fields__)
+        with pq.ParquetWriter(os.path.join(directory, "part-0.parquet"), RESULT_SCHEMA) as writer:
+            for frame in frames:
+                columns = {name: frame[name] if name in frame else None for name in fields}
+                table = pd.DataFrame(columns, index=frame.index)
+                table["evaluation_model"] = evaluation_model
+                table["evaluation_template"] = evaluation_template
+                exploded = pd.DataFrame(
+                    [_explode_prediction(value) for value in table["predicted_json"]],
+                    columns=list(LABEL_FIELDS + TEXT_FIELDS + LIST_FIELDS),
+                    index=table.index
+                )
+                table = pd.concat([table, exploded], axis=1)
+                writer.write_table(pa.Table.from_pandas(table, schema=RESULT_SCHEMA, preserve_index=False))
+        return directory
+
+    def write_checkpoint(
+        self,
+        checkpoint: ResultCheckpoint,
+        prompt: str,
+        template: str,
+        classification_model: str,
+        evaluation_model: str,
+        timestamp: str,
+        evaluation_template: Optional[str] = None
+    ) -> str:
+        return self.write(
+            checkpoint.frames(), prompt, template, classification_model,
+            evaluation_model, timestamp, evaluation_template
+        )
+
+    def import_csv(
+        self,
+        path: str,
+        prompt: Optional[str] = None,
+        template: str = "imported",
+        timestamp: Optional[str] = None
+    ) -> str:
+        """Import an ``all_runs_*.csv`` file.
+
+        The prompt name defaults to the file's directory name and the
+        timestamp to the one in its file name. The prompt text of old runs is
+        not known, so their template hash is ``template``.
+        """
+        results = pd.read_csv(path)
+        prompt = prompt or os.path.basename(os.path.dirname(os.path.abspath(path)))
+        if timestamp is None:
+            match = _TIMESTAMP_PATTERN.search(os.path.basename(path))
+            if match is None:
+                raise ValueError(f"No timestamp in {path}; pass one explicitly")
+            timestamp = match.group(1)
+        models = {
+            name: str(results[name].iloc[0]) if name in results and len(results) else "unknown"
+            for name in ("classification_model", "evaluation_model")
+        }
+        return self.write(
+            [results.drop(columns=list(models), errors="ignore")], prompt, template,
+            models["classification_model"], models["evaluation_model"], timestamp
+        )
+
+    def import_results(self, results_dir: str = "evaluation_results") -> List[str]:
+        """Import every ``all_runs_*.csv`` under ``results_dir`` that is not stored yet."""
+        imported = []
+        for path in sorted(glob.glob(os.path.join(results_dir, "**", "all_runs_*.csv"), recursive=True)):
+            try:
+                imported.append(self.import_csv(path))
+            except FileExistsError:
+                continue
+        return imported
+
+    def dataset(self) -> ds.Dataset:
+        return ds.dataset(self.root, format="parquet", partitioning=PARTITIONING, schema=DATASET_SCHEMA)
+
+    def query(self, columns: Sequence[str], prompts: Optional[Sequence[str]] = None, filter=None) -> pd.DataFrame:
+        """Read ``columns`` of the stored results, optionally only for ``prompts``.
+
+        ``filter`` is an extra ``pyarrow.dataset`` expression, such as
+        ``ds.field("model") == "gpt-4o-mini"``.
+        """
+        expression = ds.field("prompt").isin(list(prompts)) if prompts else None
+        if filter is not None:
+            expression = filter if expression is None else expression & filter
+        return self.dataset().to_table(columns=list(columns), filter=expression).to_pandas()
+
+    def accuracy_over_time(self, prompts: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Mean run accuracy of every stored evaluation, oldest first.
+
+        Accuracy follows the pipeline: errored emails count as 0.
+        """
+        keys = list(PARTITION_KEYS)
+        results = self.query(keys + ["run_id", "validation_score"], prompts)
+        results["validation_score"] = results["validation_score"].fillna(0.0)
+        runs = results.groupby(keys + ["run_id"], sort=False)["validation_score"].agg(["mean", "size"])
+        summary = runs.groupby(level=keys, sort=False).agg(
+            accuracy=("mean", "mean"),
+            accuracy_std=("mean", "std"),
+            runs=("mean", "size"),
+            emails=("size", "max")
+        ).reset_index()
+        summary["evaluated_at"] = pd.to_datetime(summary["timestamp"], format="%Y%m%d_%H%M%S")
+        return summary.sort_values(["evaluated_at", "prompt"], ignore_index=True)
+
+    def _latest_labels(self, prompt: str, field: str, timestamp: Optional[str]) -> pd.DataFrame:
+        """Most frequent label of ``field`` per email across the runs of one evaluation."""
+        filter = ds.field("timestamp") == timestamp if timestamp else None
+        labels = self.query(["timestamp", "id", "subject", field], [prompt], filter)
+        if labels.empty:
+            raise KeyError(f"No stored results for prompt {prompt}")
+        labels = labels[labels["timestamp"] == labels["timestamp"].max()]
+        labels[field] = _normalized(labels[field])
+        counts = labels.dropna(subset=[field]).groupby(["id", field]).size().rename("count").reset_index()
+        most_common = counts.sort_values(["id", "count"], ascending=[True, False]).drop_duplicates("id")
+        subjects = labels.drop_duplicates("id").set_index("id")["subject"]
+        return most_common.set_index("id")[[field]].join(subjects)
+
+    def disagreements(
+        self,
+        prompt_a: str,
+        prompt_b: str,
+        field: str = "purpose",
+        timestamp_a: Optional[str] = None,
+        timestamp_b: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Emails whose most frequent ``field`` label differs between two prompts.
+
+        Each prompt's latest evaluation is used unless a timestamp is given.
+        Labels are compared case- and whitespace-insensitively and returned,
+        normalized, as ``{field}_a`` and ``{field}_b``.
+        """
+        if field not in LABEL_FIELDS + TEXT_FIELDS:
+            raise ValueError(f"{field} is not a single-label field")
+        labels_a = self._latest_labels(prompt_a, field, timestamp_a)
+        labels_b = self._latest_labels(prompt_b, field, timestamp_b)
+        joined = labels_a.join(labels_b[[field]], how="inner", lsuffix="_a", rsuffix="_b")
+        differs = joined[f"{field}_a"] != joined[f"{field}_b"]
+        return joined[differs].reset_index()
@@ -0,0 +1,29 @@
+from datetime import datetime
+from benchmark import MODES, SIZES, run_benchmark
+
+def main():
+    
+    # Zero latency measures pure pipeline overhead; use e.g. replay.LognormalLatency(0.8)
+    # to replay at realistic API response times instead
+    latency = None
+    
+    results = run_benchmark(
+        modes=MODES,
+        sizes=SIZES,
+        concurrency=16,
+        latency=latency,
+        error_rate=0.0
+    )
+    
+    print("\nBenchmark Results:")
+    print(results[[
+        "mode", "emails", "emails_per_second", "overhead_us_per_email",
+        "finalize_seconds", "peak_memory_mb"
+    ]].to_string(index=False))
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    results.to_csv(f"evaluation_results/benchmark_{timestamp}.csv", index=False)
+    print(f"\nSaved to evaluation_results/benchmark_{timestamp}.csv")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+from dotenv import load_dotenv
+from prompt_evaluation_pipeline import OpenAIExecutor, EmailStore
+from prompt_comparison import PromptComparison
+from prompts.evaluation_prompt_01 import system_prompt as evaluation_system_prompt
+from prompts.prompt_00 import system_prompt as prompt_00
+from prompts.prompt_01 import system_prompt as prompt_01
+from prompts.prompt_02 import system_prompt as prompt_02
+from prompts.prompt_03 import system_prompt as prompt_03
+
+def main():
+    
+    # Your OpenAI API key
+    load_dotenv()  
+    OPENAI_API_KEY  = os.getenv("OPENAI_API_KEY")
+    
+    classification_executor = OpenAIExecutor(
+        api_key=OPENAI_API_KEY,
+        model="gpt-4o-mini",
+        temperature=0.0
+    )
+    
+    evaluation_executor = OpenAIExecutor(
+        api_key=OPENAI_API_KEY,
+        model="gpt-4o-mini",
+        temperature=0.0
+    )
+    
+    # All prompts share one pool and one schedule
+    comparison = PromptComparison(
+        classification_executor=classification_executor,
+        evaluation_executor=evaluation_executor,
+        max_threads=50
+    )
+    
+    report = comparison.run(
+        EmailStore.from_csv("./datasets/combined_dataset.csv"),
+        classification_prompts={
+            "prompt_00": prompt_00,
+            "prompt_01": prompt_01,
+            "prompt_02": prompt_02,
+            "prompt_03": prompt_03
+        },
+        evaluation_prompt=evaluation_system_prompt,
+        num_runs=1,
+        output_dir="evaluation_results"
+    )
+    
+    print("\nAccuracy by Prompt:")
+    for name, accuracy in report.accuracies.items():
+        print(f"{name}: {accuracy:.2f}")
+    
+    print("\nPaired Differences:")
+    for pair in report.pairs:
+        verdict = "significant" if pair.significant else "not significant"
+        print(f"{pair.prompt_a} - {pair.prompt_b}: {pair.mean_delta:+.3f} "
+              f"[{pair.ci_lower:+.3f}, {pair.ci_upper:+.3f}], p={pair.p_value:.4f} ({verdict})")
+    
+    print("\nLabel Agreement:")
+    print(report.agreement().round(3).to_string())
+
+if __name__ == "__main__":
+    main()
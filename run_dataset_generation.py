@@ -0,0 +1,51 @@
+import argparse
+import os
+from dataset_generator import CONFIG_PATH, DatasetGenerator, OpenAICompletion, combine_datasets, load_scenarios
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the synthetic email datasets of config/prompt_configs.json.")
+    parser.add_argument("--config", default=CONFIG_PATH, help="scenario configuration")
+    parser.add_argument("--output-dir", default="./datasets")
+    parser.add_argument("--total", type=int,
+                        help="scale the scenario targets to this many emails (default: as configured, 720)")
+    parser.add_argument("--model", default="gpt-4o")
+    parser.add_argument("--threads", type=int, default=16, help="batches generated in parallel")
+    parser.add_argument("--batch-size", type=int, default=12, help="emails requested per API call")
+    parser.add_argument("--combine-only", action="store_true",
+                        help="only rebuild combined_dataset.csv from the scenario files")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = load_scenarios(args.config, args.total)
+
+    if args.combine_only:
+        emails = combine_datasets(scenarios, args.output_dir)
+        print(f"Combined dataset of {emails} emails saved to {args.output_dir}")
+        return
+
+    from dotenv import load_dotenv
+
+    # Your OpenAI API key
+    load_dotenv()
+    OPENAI_API_KEY  = os.getenv("OPENAI_API_KEY")
+
+    generator = DatasetGenerator(
+        complete=OpenAICompletion(api_key=OPENAI_API_KEY, model=args.model),
+        batch_size=args.batch_size,
+        max_threads=args.threads
+    )
+    report = generator.generate(scenarios, args.output_dir)
+
+    print("\nDataset Generation Report:")
+    for scenario in report.scenarios:
+        print(f"{scenario.name}: {scenario.emails}/{scenario.target} emails "
+              f"({scenario.generated} new, {scenario.malformed_attempts} malformed replies, "
+              f"{scenario.failed_batches} failed batches)")
+    print(f"\nCombined dataset of {report.combined_emails} emails saved to {report.combined_path}")
+    print(f"Total Cost: ${report.cost:.2f}, {report.seconds:.0f} s")
+    if not report.complete:
+        print("Some scenarios are short of their target; run the same command again to top them up.")
+
+if __name__ == "__main__":
+    main()
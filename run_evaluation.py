@@ -1,48 +1,104 @@
+import argparse
+import asyncio
+import importlib
 import os
-from dotenv import load_dotenv
-from prompt_evaluation_pipeline import PromptEvaluationPipeline, OpenAIExecutor
-from prompts.evaluation_prompt_01 import system_prompt as evaluation_system_prompt
-from prompts.prompt_03 import system_prompt as classification_system_prompt
+from prompt_evaluation_pipeline import PromptEvaluationPipeline
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate a classification prompt on an email dataset.")
+    parser.add_argument("--dataset", default="./datasets/combined_dataset.csv",
+                        help="semicolon-separated email CSV")
+    parser.add_argument("--classification-prompt", default="prompt_03",
+                        help="module name under prompts/, or a path to a text file")
+    parser.add_argument("--evaluation-prompt", default="evaluation_prompt_01",
+                        help="module name under prompts/, or a path to a text file")
+    parser.add_argument("--classification-model", default="gpt-4o-mini")
+    parser.add_argument("--evaluation-model", default="gpt-4o-mini")
+    parser.add_argument("--runs", type=int, default=3, help="number of evaluation runs")
+    parser.add_argument("--threads", type=int, default=32,
+                        help="worker threads (default: 32), or in-flight emails with --async; "
+                             "use values in the hundreds or more only with --async")
+    parser.add_argument("--output-dir", default="evaluation_results")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="use the async OpenAI executors")
+    parser.add_argument("--replay", metavar="PATTERN",
+                        help="replay responses from recorded all_runs CSVs instead of calling OpenAI")
+    parser.add_argument("--resume", metavar="CHECKPOINT", help="resume from a checkpoint file")
+    parser.add_argument("--no-plots", action="store_true", help="skip the HTML plots")
+    parser.add_argument("--progress", action="store_true", help="show a live progress line")
+    parser.add_argument("--startup-benchmark", action="store_true",
+                        help="measure cold-start times instead of running an evaluation")
+    return parser.parse_args(argv)
+
+def load_prompt(name: str) -> str:
+    """A prompt file's text, or the ``system_prompt`` of ``prompts.<name>``."""
+    if os.path.isfile(name):
+        with open(name, encoding="utf-8") as f:
+            return f.read()
+    return importlib.import_module(f"prompts.{name}").system_prompt
+
+def build_executors(args):
+    if args.replay:
+        from replay import AsyncReplayExecutor, ReplayExecutor, ReplayResponses
+
+        # Recorded responses: no API key, no network
+        responses = ReplayResponses.from_results(args.replay)
+        executor_class = AsyncReplayExecutor if args.use_async else ReplayExecutor
+        return (
+            executor_class(responses, "classification", model=args.classification_model),
+            executor_class(responses, "evaluation", model=args.evaluation_model)
+        )
+
+    from dotenv import load_dotenv
+    from prompt_evaluation_pipeline import AsyncOpenAIExecutor, OpenAIExecutor
 
-def main():
-    
     # Your OpenAI API key
-    load_dotenv()  
+    load_dotenv()
     OPENAI_API_KEY  = os.getenv("OPENAI_API_KEY")
-    
-    # Define your prompts
-    CLASSIFICATION_PROMPT = classification_system_prompt
-    EVALUATION_PROMPT = evaluation_system_prompt
-    
-    # Initialize different executors for classification and evaluation
-    classification_executor = OpenAIExecutor(
-        api_key=OPENAI_API_KEY,
-        model="gpt-4o-mini",  # More powerful model for classification
-        temperature=0.0
-    )
-    
-    evaluation_executor = OpenAIExecutor(
-        api_key=OPENAI_API_KEY,
-        model="gpt-4o-mini",  # Faster model for evaluation
-        temperature=0.0
+
+    executor_class = AsyncOpenAIExecutor if args.use_async else OpenAIExecutor
+    return (
+        executor_class(api_key=OPENAI_API_KEY, model=args.classification_model, temperature=0.0),
+        executor_class(api_key=OPENAI_API_KEY, model=args.evaluation_model, temperature=0.0)
     )
-    
+
+def print_startup_benchmark():
+    from benchmark import startup_benchmark
+
+    print("\nStartup Times (fresh interpreter, median of 5):")
+    print(startup_benchmark().to_string(index=False))
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.startup_benchmark:
+        print_startup_benchmark()
+        return
+
+    classification_executor, evaluation_executor = build_executors(args)
+
     # Initialize the pipeline with both executors
     pipeline = PromptEvaluationPipeline(
         classification_executor=classification_executor,
         evaluation_executor=evaluation_executor,
-        max_threads=10000
+        max_threads=args.threads,
+        show_progress=args.progress,
+        plots=not args.no_plots
     )
-    
+
     # Run the evaluation
-    stats = pipeline.run_multiple_evaluations(
-        dataset_path="./datasets/combined_dataset.csv",
-        output_dir="evaluation_results",
-        classification_prompt=CLASSIFICATION_PROMPT,
-        evaluation_prompt=EVALUATION_PROMPT,
-        num_runs=3
+    options = dict(
+        dataset_path=args.dataset,
+        output_dir=args.output_dir,
+        classification_prompt=load_prompt(args.classification_prompt),
+        evaluation_prompt=load_prompt(args.evaluation_prompt),
+        num_runs=args.runs,
+        resume=args.resume
     )
-    
+    if args.use_async:
+        stats = asyncio.run(pipeline.arun_multiple_evaluations(**options))
+    else:
+        stats = pipeline.run_multiple_evaluations(**options)
+
     # Print the results
     print("\nEvaluation Complete!")
     print("\nModels used:")
@@ -51,15 +107,15 @@ def main():
     print("\nStatistics:")
     print(f"Mean Accuracy: {stats.mean_accuracy:.2f}%")
     print(f"Median Accuracy: {stats.median_accuracy:.2f}%")
-    print(f"Standard Deviation: {stats.std_accuracy:.2f}%") 
+    print(f"Standard Deviation: {stats.std_accuracy:.2f}%")
     print(f"Accuracy Range: {stats.min_accuracy:.2f}% - {stats.max_accuracy:.2f}%")
     print(f"\nCosts:")
     print(f"Total Classification Cost: ${stats.total_classification_cost:.2f}")
     print(f"Total Evaluation Cost: ${stats.total_evaluation_cost:.2f}")
     print(f"Total Combined Cost: ${(stats.total_classification_cost + stats.total_evaluation_cost):.2f}")
     print(f"Number of Runs: {stats.run_count}")
-    
-    print("\nDetailed results and visualizations have been saved to the 'evaluation_results' directory")
+
+    print(f"\nDetailed results and visualizations have been saved to the '{args.output_dir}' directory")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,60 @@
+import os
+import sys
+from dotenv import load_dotenv
+from prompt_evaluation_pipeline import OpenAIExecutor
+from threshold_gate import ThresholdGate, load_manifest
+from prompts.evaluation_prompt_01 import system_prompt as evaluation_system_prompt
+from prompts.prompt_03 import system_prompt as classification_system_prompt
+
+def main():
+    
+    # Your OpenAI API key
+    load_dotenv()  
+    OPENAI_API_KEY  = os.getenv("OPENAI_API_KEY")
+    
+    # Datasets and the accuracy each one must reach
+    datasets, settings = load_manifest("./config/dataset_thresholds.json")
+    
+    classification_executor = OpenAIExecutor(
+        api_key=OPENAI_API_KEY,
+        model="gpt-4o-mini",
+        temperature=0.0
+    )
+    
+    evaluation_executor = OpenAIExecutor(
+        api_key=OPENAI_API_KEY,
+        model="gpt-4o-mini",
+        temperature=0.0
+    )
+    
+    # One shared pool for every dataset
+    gate = ThresholdGate(
+        classification_executor=classification_executor,
+        evaluation_executor=evaluation_executor,
+        max_threads=50,
+        settings=settings
+    )
+    
+    report = gate.run(
+        datasets,
+        classification_prompt=classification_system_prompt,
+        evaluation_prompt=evaluation_system_prompt,
+        output_dir="evaluation_results"
+    )
+    
+    print("\nThreshold Gate Report:")
+    for result in report.results:
+        status = "PASS" if result.passed else "FAIL"
+        early = " (stopped early)" if result.early_stopped else ""
+        print(f"{status} {result.name}: {result.accuracy:.2f} "
+              f"[{result.lower_bound:.2f}, {result.upper_bound:.2f}] vs {result.threshold:.2f}, "
+              f"{result.emails_evaluated}/{result.emails_total} emails{early}")
+    
+    total_cost = sum(r.classification_cost + r.evaluation_cost for r in report.results)
+    print(f"\nTotal Cost: ${total_cost:.2f}")
+    print(f"Overall: {'PASS' if report.passed else 'FAIL'}")
+    
+    sys.exit(0 if report.passed else 1)
+
+if __name__ == "__main__":
+    main()
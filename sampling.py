@@ -0,0 +1,276 @@
+import json
+import math
+import os
+import random
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from statistics import NormalDist
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from prompt_evaluation_pipeline import (
+    EmailProcessor,
+    EmailStore,
+    EvaluationResult,
+    PromptEvaluationPipeline,
+)
+from prompt_template import PromptTemplate
+
+
+@dataclass
+class StratumEstimate:
+    name: str
+    population: int
+    sampled: int
+    accuracy: float
+    std_error: float
+
+
+@dataclass
+class SampleEstimate:
+    """Accuracy of the full population (mean score, 0-10) estimated from a stratified sample."""
+    accuracy: float
+    std_error: float
+    ci_lower: float
+    ci_upper: float
+    confidence: float
+    emails_evaluated: int
+    emails_total: int
+    strata: List[StratumEstimate]
+    classification_cost: float = 0.0
+    evaluation_cost: float = 0.0
+
+
+class StratifiedPopulation:
+    """All emails of an evaluation, each labelled with the stratum it belongs to.
+
+    Email ids are positions in the population, so results from a full run on
+    ``emails`` can later be used to refine the strata.
+    """
+
+    def __init__(self, emails: EmailStore, strata: Sequence[str]):
+        if len(strata) != len(emails):
+            raise ValueError(f"Got {len(strata)} stratum labels for {len(emails)} emails")
+        self.emails = emails
+        self.strata = tuple(strata)
+
+    @classmethod
+    def from_files(cls, paths: Dict[str, str], delimiter: str = ";") -> "StratifiedPopulation":
+        """Combine dataset files into one population, one stratum per file."""
+        frames = []
+        strata: List[str] = []
+        for name, path in paths.items():
+            df = pd.read_csv(path, delimiter=delimiter)
+            frames.append(df)
+            strata.extend([name] * len(df))
+        emails = EmailStore.from_dataframe(pd.concat(frames, ignore_index=True))
+        return cls(emails, strata)
+
+    def stratum_sizes(self) -> Dict[str, int]:
+        return dict(Counter(self.strata))
+
+    def with_predicted_purpose(
+        self,
+        results: Iterable[EvaluationResult],
+        min_stratum_size: int = 10
+    ) -> "StratifiedPopulation":
+        """Split each stratum by the ``purpose`` most often predicted for its emails.
+
+        ``results`` come from earlier runs on this population. Purposes with
+        fewer than ``min_stratum_size`` emails in a stratum, and emails without
+        a prediction, are grouped as "<stratum> / other". Raises ValueError
+        for results whose id is not an email id of this population.
+        """
+        known_ids = set(self.emails.ids)
+        votes: Dict[int, Counter] = defaultdict(Counter)
+        for result in results:
+            if result.id not in known_ids:
+                raise ValueError(f"Result id {result.id!r} is not an email id of this population")
+            try:
+                purpose = json.loads(result.predicted_json).get("purpose")
+            except (TypeError, ValueError, AttributeError):
+                continue
+            if isinstance(purpose, str) and purpose:
+                votes[result.id][purpose] += 1
+
+        purposes = [
+            votes[email_id].most_common(1)[0][0] if votes[email_id] else None
+            for email_id in self.emails.ids
+        ]
+        group_sizes = Counter(zip(self.strata, purposes))
+        refined = [
+            f"{stratum} / {purpose}"
+            if purpose is not None and group_sizes[(stratum, purpose)] >= min_stratum_size
+            else f"{stratum} / other"
+            for stratum, purpose in zip(self.strata, purposes)
+        ]
+        return StratifiedPopulation(self.emails, refined)
+
+    def sample(
+        self,
+        size: Optional[int] = None,
+        fraction: Optional[float] = None,
+        seed: int = 0,
+        min_per_stratum: int = 2
+    ) -> "StratifiedSample":
+        """Draw a reproducible sample, allocated to strata in proportion to their size.
+
+        Give either ``size`` or ``fraction``. Every stratum gets at least
+        ``min_per_stratum`` emails (or all of them, if it is smaller), so the
+        sample can be slightly larger than requested.
+        """
+        if (size is None) == (fraction is None):
+            raise ValueError("Pass exactly one of size or fraction")
+        total = len(self.emails)
+        if size is None:
+            size = math.ceil(fraction * total)
+        size = min(size, total)
+
+        positions_by_stratum: Dict[str, List[int]] = defaultdict(list)
+        for position, stratum in enumerate(self.strata):
+            positions_by_stratum[stratum].append(position)
+
+        # Largest-remainder proportional allocation
+        quotas = {name: size * len(positions) / total for name, positions in positions_by_stratum.items()}
+        allocation = {name: math.floor(quota) for name, quota in quotas.items()}
+        remaining = size - sum(allocation.values())
+        for name in sorted(quotas, key=lambda n: quotas[n] - allocation[n], reverse=True)[:remaining]:
+            allocation[name] += 1
+
+        rng = random.Random(seed)
+        selected: List[int] = []
+        for name in sorted(positions_by_stratum):
+            positions = positions_by_stratum[name]
+            count = min(max(allocation[name], min_per_stratum), len(positions))
+            selected.extend(rng.sample(positions, count))
+        selected.sort()
+        return StratifiedSample(self, selected, seed)
+
+
+class StratifiedSample:
+    """A subset of a StratifiedPopulation that can be evaluated like any dataset."""
+
+    def __init__(self, population: StratifiedPopulation, positions: Sequence[int], seed: int = 0):
+        self.population = population
+        self.positions = tuple(positions)
+        self.seed = seed
+        self.emails = population.emails.subset(self.positions)
+        self.strata = {population.emails.ids[p]: population.strata[p] for p in self.positions}
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def estimate(self, results: Iterable[EvaluationResult], confidence: float = 0.95) -> SampleEstimate:
+        """Scale sample results back to the population with a stratified estimator.
+
+        Scores of several runs are averaged per email first; an email that
+        errored counts as 0, as in the pipeline. The standard error includes
+        the finite population correction of each stratum.
+        """
+        scores: Dict[int, List[float]] = defaultdict(list)
+        classification_cost = 0.0
+        evaluation_cost = 0.0
+        for result in results:
+            if result.id in self.strata:
+                scores[result.id].append(result.validation_score or 0.0)
+                classification_cost += result.classification_cost
+                evaluation_cost += result.evaluation_cost
+
+        email_means: Dict[str, List[float]] = defaultdict(list)
+        for email_id, stratum in self.strata.items():
+            if scores[email_id]:
+                email_means[stratum].append(sum(scores[email_id]) / len(scores[email_id]))
+
+        population_sizes = self.population.stratum_sizes()
+        total = len(self.population.emails)
+        all_means = [m for means in email_means.values() for m in means]
+        pooled_variance = _sample_variance(all_means)
+
+        accuracy = 0.0
+        variance = 0.0
+        strata = []
+        for name in sorted(population_sizes):
+            means = email_means.get(name, [])
+            size = population_sizes[name]
+            if not means:
+                strata.append(StratumEstimate(name, size, 0, math.nan, math.nan))
+                continue
+            n = len(means)
+            stratum_mean = sum(means) / n
+            stratum_variance = _sample_variance(means) if n >= 2 else pooled_variance
+            stratum_se = math.sqrt((1 - n / size) * stratum_variance / n)
+            weight = size / total
+            accuracy += weight * stratum_mean
+            variance += (weight * stratum_se) ** 2
+            strata.append(StratumEstimate(name, size, n, stratum_mean, stratum_se))
+
+        covered = sum(s.population for s in strata if s.sampled)
+        if covered < total:
+            # Strata without results are left out; renormalise over the rest
+            accuracy *= total / covered if covered else math.nan
+            variance *= (total / covered) ** 2 if covered else math.nan
+
+        std_error = math.sqrt(variance)
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return SampleEstimate(
+            accuracy=accuracy,
+            std_error=std_error,
+            ci_lower=max(accuracy - z * std_error, 0.0),
+            ci_upper=min(accuracy + z * std_error, 10.0),
+            confidence=confidence,
+            emails_evaluated=len(all_means),
+            emails_total=total,
+            strata=strata,
+            classification_cost=classification_cost,
+            evaluation_cost=evaluation_cost
+        )
+
+
+def _sample_variance(values: Sequence[float]) -> float:
+    if len(values) < 2:
+        return 0.0
+    mean = sum(values) / len(values)
+    return sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+
+
+def quick_check(
+    pipeline: PromptEvaluationPipeline,
+    sample: StratifiedSample,
+    classification_prompt: Union[str, PromptTemplate],
+    evaluation_prompt: Union[str, PromptTemplate],
+    num_runs: int = 1,
+    output_dir: Optional[str] = None,
+    confidence: float = 0.95
+) -> SampleEstimate:
+    """Evaluate a prompt on ``sample`` only and estimate its full-population accuracy.
+
+    Results are written to ``sample_results_{timestamp}.csv`` and the
+    estimate to ``sample_estimate_{timestamp}.json`` when ``output_dir`` is set.
+    """
+    if not isinstance(pipeline.processor, EmailProcessor):
+        raise TypeError("quick_check requires a pipeline built with PromptExecutor instances")
+
+    classification_prompt = PromptTemplate.for_classification(classification_prompt)
+    evaluation_prompt = PromptTemplate.for_evaluation(evaluation_prompt)
+    results: List[EvaluationResult] = []
+    for run_id in range(num_runs):
+        print(f"\nQuick check run {run_id + 1}/{num_runs} on {len(sample)} emails")
+        pipeline.process_dataset(
+            sample.emails,
+            classification_prompt,
+            evaluation_prompt,
+            run_id,
+            set(),
+            results.append
+        )
+
+    estimate = sample.estimate(results, confidence)
+    if output_dir:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        rows = [{"stratum": sample.strata[r.id], **vars(r)} for r in results]
+        pd.DataFrame(rows).to_csv(os.path.join(output_dir, f"sample_results_{timestamp}.csv"), index=False)
+        with open(os.path.join(output_dir, f"sample_estimate_{timestamp}.json"), "w", encoding="utf-8") as f:
+            json.dump(asdict(estimate), f, indent=2)
+    return estimate
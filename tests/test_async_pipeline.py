@@ -0,0 +1,70 @@
+import json
+
+import pandas as pd
+
+from prompt_evaluation_pipeline import EmailStore, PromptEvaluationPipeline
+from replay import AsyncReplayExecutor, ReplayResponses
+
+CLASSIFICATION_PROMPT = "Classify:\n- **Subject**: `{subject}`\n{sender}\n{recipients}\n{body}"
+EVALUATION_PROMPT = "Judge:\n- **Subject**: `{subject}`\n{sender}\n{recipients}\n{body}\n{output}"
+
+
+def _emails(count):
+    return EmailStore.from_dataframe(pd.DataFrame({
+        "subject": [f"Email {i}" for i in range(count)],
+        "sender": ["a@example.com"] * count,
+        "recipients": ["support@travelagency.com"] * count,
+        "body": ["Please book a room."] * count
+    }))
+
+
+def _executors():
+    responses = ReplayResponses(pd.DataFrame({
+        "subject": ["Email 0"],
+        "predicted_json": [json.dumps({"purpose": "Booking"})],
+        "validation_score": [8.0],
+        "validation_evaluation": ["fine"],
+        "classification_cost": [0.001],
+        "evaluation_cost": [0.001]
+    }))
+    return AsyncReplayExecutor(responses, "classification"), AsyncReplayExecutor(responses, "evaluation")
+
+
+class FailingPipeline(PromptEvaluationPipeline):
+    async def _aprocess_email(self, email_data, classification_prompt, evaluation_prompt, email_id, run_id):
+        if email_id == 1:
+            raise RuntimeError("boom")
+        return await super()._aprocess_email(email_data, classification_prompt, evaluation_prompt, email_id, run_id)
+
+
+def test_failed_async_task_is_reported_and_the_run_continues(tmp_path, capsys):
+    import asyncio
+
+    pipeline = FailingPipeline(*_executors(), max_threads=2, plots=False)
+
+    stats = asyncio.run(pipeline.arun_multiple_evaluations(
+        _emails(3), str(tmp_path), CLASSIFICATION_PROMPT, EVALUATION_PROMPT, num_runs=1
+    ))
+
+    assert "Error processing email: boom" in capsys.readouterr().out
+    results = pd.read_csv(next(tmp_path.glob("all_runs_*.csv")))
+    assert sorted(results["id"]) == [0, 2]
+    # The failed email is missing and counts as 0
+    assert abs(stats.mean_accuracy - 16 / 3) < 1e-9
+
+
+def test_failed_async_task_does_not_abort_a_run_with_spare_concurrency(tmp_path, capsys):
+    import asyncio
+
+    # Every email is in flight at once, so the failure is still pending at the end of the run
+    pipeline = FailingPipeline(*_executors(), max_threads=10, plots=False)
+
+    stats = asyncio.run(pipeline.arun_multiple_evaluations(
+        _emails(3), str(tmp_path), CLASSIFICATION_PROMPT, EVALUATION_PROMPT, num_runs=1
+    ))
+
+    assert "Error processing email: boom" in capsys.readouterr().out
+    results = pd.read_csv(next(tmp_path.glob("all_runs_*.csv")))
+    assert sorted(results["id"]) == [0, 2]
+    assert stats.run_count == 1
+    assert abs(stats.mean_accuracy - 16 / 3) < 1e-9
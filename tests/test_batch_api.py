@@ -0,0 +1,85 @@
+import json
+
+from batch_api import BatchExecutor, LocalBatchBackend
+
+
+class RecordingBackend(LocalBatchBackend):
+    def __init__(self, work_dir, respond):
+        super().__init__(work_dir, respond)
+        self.files = []
+
+    def submit(self, input_path):
+        with open(input_path, "rb") as f:
+            self.files.append(f.read())
+        return super().submit(input_path)
+
+
+def test_byte_limit_splits_request_files(tmp_path):
+    backend = RecordingBackend(str(tmp_path / "backend"), lambda messages: json.dumps({"ok": True}))
+    executor = BatchExecutor(backend, "gpt-4o-mini", work_dir=str(tmp_path), poll_interval=0.0)
+    prompts = {str(i): "x" * 1000 for i in range(5)}
+    line_size = len(executor._request_line("0", prompts["0"]))
+    # Two requests per file by size, far below the request-count limit
+    executor.max_bytes_per_batch = 2 * line_size + 1
+
+    results = executor.execute_batch(prompts)
+
+    assert [content.count(b"\n") for content in backend.files] == [2, 2, 1]
+    assert all(len(content) <= executor.max_bytes_per_batch for content in backend.files)
+    assert all(results[key].output == {"ok": True} for key in prompts)
+
+
+def test_request_count_limit_still_applies(tmp_path):
+    backend = RecordingBackend(str(tmp_path / "backend"), lambda messages: json.dumps({"ok": True}))
+    executor = BatchExecutor(
+        backend, "gpt-4o-mini", work_dir=str(tmp_path), poll_interval=0.0, max_requests_per_batch=3
+    )
+
+    executor.execute_batch({str(i): "prompt" for i in range(7)})
+
+    assert [content.count(b"\n") for content in backend.files] == [3, 3, 1]
+
+
+def _respond(messages):
+    text = "".join(message["content"] for message in messages)
+    if "Judge" in text:
+        return json.dumps({"score": 8, "evaluation": "fine"})
+    return json.dumps({"purpose": "Booking", "sentiment": "Positive"})
+
+
+def test_batch_pipeline_accepts_pipeline_options(tmp_path):
+    import pandas as pd
+    from batch_api import BatchEvaluationPipeline
+    from prompt_evaluation_pipeline import EmailStore
+    from results_store import ResultsStore
+
+    backend = LocalBatchBackend(str(tmp_path / "backend"), _respond)
+    store = ResultsStore(str(tmp_path / "store"))
+    pipeline = BatchEvaluationPipeline(
+        BatchExecutor(backend, "gpt-4o-mini", work_dir=str(tmp_path), poll_interval=0.0),
+        BatchExecutor(backend, "gpt-4o-mini", work_dir=str(tmp_path), poll_interval=0.0),
+        plots=False,
+        results_store=store
+    )
+    emails = EmailStore.from_dataframe(pd.DataFrame({
+        "subject": ["Booking", "Refund"],
+        "sender": ["a@example.com", "b@example.com"],
+        "recipients": ["support@travelagency.com"] * 2,
+        "body": ["Please book a room.", "I want my money back."]
+    }))
+    output_dir = tmp_path / "results"
+    output_dir.mkdir()
+
+    stats = pipeline.run_multiple_evaluations(
+        emails,
+        str(output_dir),
+        "Classify:\n{subject}\n{sender}\n{recipients}\n{body}",
+        "Judge:\n{subject}\n{sender}\n{recipients}\n{body}\n{output}",
+        num_runs=1,
+        prompt_name="batch_test"
+    )
+
+    assert pipeline.max_threads == 1
+    assert stats.mean_accuracy == 8
+    assert not list(output_dir.glob("*.html"))
+    assert len(store.query(["id"], ["batch_test"])) == 2
@@ -0,0 +1,45 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from batching import BatchingExecutor
+from prompt_evaluation_pipeline import (
+    CallStats, CostCalculator, PromptExecutor, RetriesExhaustedError, TokenUsage
+)
+from prompt_template import RenderedPrompt
+
+
+class FailingBatchExecutor(PromptExecutor):
+    """Fails batched calls after billing their tokens; answers single calls."""
+
+    def __init__(self):
+        super().__init__("gpt-4o-mini")
+
+    def execute(self, prompt):
+        return self.execute_with_stats(prompt)[:2]
+
+    def execute_with_stats(self, prompt):
+        if "## Batch Input" in prompt:
+            stats = CallStats(attempts=3, saved_cost=0.3, prompt_tokens=3000, completion_tokens=600)
+            raise RetriesExhaustedError(json.JSONDecodeError("Expecting value", "", 0), stats)
+        return {"purpose": "Booking"}, 0.0, CallStats()
+
+
+def _prompt(body):
+    prefix, suffix = "Instructions\n", "\nAnswer in JSON"
+    return RenderedPrompt(prefix + body + suffix, len(prefix), len(suffix))
+
+
+def test_failed_batch_cost_and_savings_are_split_across_the_batch():
+    executor = BatchingExecutor(FailingBatchExecutor(), max_batch_size=3, max_wait=5.0)
+
+    with ThreadPoolExecutor(3) as pool:
+        calls = list(pool.map(executor.execute_with_stats, [_prompt(f"Email {i}") for i in range(3)]))
+
+    expected = CostCalculator.calculate(TokenUsage(3000, 600), "gpt-4o-mini") / 3
+    assert executor.fallbacks == 3
+    for output, cost, stats in calls:
+        # The single-email fallback is free here, so only the batch share remains
+        assert output == {"purpose": "Booking"}
+        assert abs(cost - expected) < 1e-12
+        assert abs(stats.saved_cost - 0.1) < 1e-12
+        assert stats.prompt_tokens == 1000
@@ -0,0 +1,14 @@
+import pytest
+
+from prompt_evaluation_pipeline import CostCalculator
+
+
+def test_dated_snapshot_uses_base_model_prices():
+    assert CostCalculator.pricing("gpt-4o-mini-2024-07-18") == CostCalculator.pricing("gpt-4o-mini")
+    assert CostCalculator.pricing("gpt-4o-2024-08-06") == CostCalculator.pricing("gpt-4o")
+
+
+@pytest.mark.parametrize("model", ["gpt-4-turbo", "gpt-4-32k", "gpt-4o-mini-tts", "gpt-4-0613"])
+def test_unlisted_variants_raise(model):
+    with pytest.raises(ValueError, match="Unsupported model"):
+        CostCalculator.pricing(model)
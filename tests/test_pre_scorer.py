@@ -0,0 +1,44 @@
+from pre_scorer import LABEL_FIELDS, RuleBasedPreScorer, label_fields_from_prompt
+from prompt_template import PromptTemplate
+from prompts import prompt_02, prompt_03
+
+
+def _output(**labels):
+    output = {
+        "purpose": "Refund Request",
+        "sentiment": "Neutral",
+        "complexity_level": "Low",
+        "agent_type": "Junior",
+        "priority_level": "Low",
+        "customer_status": "Customer",
+        "required_tools": [],
+        "ssr_requests": [],
+        "preferred_language": "English",
+    }
+    output.update(labels)
+    return output
+
+
+def test_label_sets_are_read_from_the_prompt():
+    assert label_fields_from_prompt(prompt_03.system_prompt) == LABEL_FIELDS
+    assert "Pricing and Promotions" in label_fields_from_prompt(prompt_02.system_prompt)["purpose"]
+
+
+def test_uncertainty_labels_are_accepted_on_every_label_field():
+    output = _output(**{name: "Unknown" for name in LABEL_FIELDS})
+    assert RuleBasedPreScorer().check(output).violations == []
+    assert RuleBasedPreScorer().check(_output(priority_level="Unclear")).violations == []
+
+
+def test_each_prompt_is_checked_against_its_own_labels():
+    scorer = RuleBasedPreScorer()
+    output = _output(purpose="Pricing and Promotions")
+    assert scorer.check(output, PromptTemplate.for_classification(prompt_02.system_prompt)).violations == []
+    assert scorer.check(output, prompt_03.system_prompt).violations == [
+        "purpose 'Pricing and Promotions' is not a predefined label"
+    ]
+
+
+def test_explicit_label_fields_apply_to_every_prompt():
+    scorer = RuleBasedPreScorer(label_fields={**LABEL_FIELDS, "purpose": ("Booking",)})
+    assert scorer.check(_output(purpose="Booking"), prompt_03.system_prompt).violations == []
@@ -0,0 +1,49 @@
+import json
+
+import pandas as pd
+
+from prompt_comparison import PromptComparison
+from prompt_evaluation_pipeline import EmailStore, PromptExecutor
+
+CLASSIFICATION_PROMPT = "Classify:\n- **Subject**: `{subject}`\n{sender}\n{recipients}\n{body}"
+OTHER_PROMPT = "Classify this:\n- **Subject**: `{subject}`\n{sender}\n{recipients}\n{body}"
+EVALUATION_PROMPT = "Judge:\n- **Subject**: `{subject}`\n{sender}\n{recipients}\n{body}\n{output}"
+
+
+class FixedExecutor(PromptExecutor):
+    def __init__(self, output):
+        super().__init__("gpt-4o-mini")
+        self.output = output
+
+    def execute(self, prompt):
+        return self.output, 0.0
+
+
+def _emails(count):
+    return EmailStore.from_dataframe(pd.DataFrame({
+        "subject": [f"Email {i}" for i in range(count)],
+        "sender": ["a@example.com"] * count,
+        "recipients": ["support@travelagency.com"] * count,
+        "body": ["Please book a room."] * count
+    }))
+
+
+def test_prompt_without_results_does_not_lose_the_report(capsys):
+    comparison = PromptComparison(
+        FixedExecutor({"purpose": "Booking"}), FixedExecutor({"score": 8, "evaluation": "fine"}), permutations=10
+    )
+    process = comparison.processor.process_single_email
+
+    def failing_for_other_prompt(email_data, classification_prompt, *args):
+        if classification_prompt.template == OTHER_PROMPT:
+            raise RuntimeError("boom")
+        return process(email_data, classification_prompt, *args)
+
+    comparison.processor.process_single_email = failing_for_other_prompt
+    report = comparison.run(_emails(3), {"a": CLASSIFICATION_PROMPT, "b": OTHER_PROMPT}, EVALUATION_PROMPT)
+
+    assert "Error processing email: boom" in capsys.readouterr().out
+    assert report.accuracies["a"] == 8.0
+    assert report.pairs[0].emails == 0
+    assert all(matrix.empty for matrix in report.disagreements[("a", "b")].values())
+    json.dumps(report.to_dict())
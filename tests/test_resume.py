@@ -0,0 +1,53 @@
+import json
+from dataclasses import asdict
+
+import pandas as pd
+
+from prompt_evaluation_pipeline import EmailStore, EvaluationResult, PromptEvaluationPipeline, PromptExecutor
+
+CLASSIFICATION_PROMPT = "Classify:\n- **Subject**: `{subject}`\n{sender}\n{recipients}\n{body}"
+EVALUATION_PROMPT = "Judge:\n- **Subject**: `{subject}`\n{sender}\n{recipients}\n{body}\n{output}"
+
+
+class UnusedExecutor(PromptExecutor):
+    def __init__(self):
+        super().__init__("gpt-4o-mini")
+
+    def execute(self, prompt):
+        raise AssertionError("every email is already in the checkpoint")
+
+
+def _result(email_id, score, saved_cost):
+    return EvaluationResult(
+        id=email_id,
+        subject=f"Email {email_id}",
+        predicted_json=None if score is None else json.dumps({"purpose": "Booking"}),
+        validation_score=score,
+        validation_evaluation="",
+        classification_cost=0.01,
+        evaluation_cost=0.0 if score is None else 0.01,
+        run_id=0,
+        saved_cost=saved_cost
+    )
+
+
+def test_resumed_run_counts_a_redone_email_once(tmp_path):
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    # Email 0 errored first and was redone before the interruption
+    records = [_result(0, None, 0.5), _result(1, 6.0, 0.25), _result(0, 8.0, 0.5)]
+    checkpoint.write_text("".join(json.dumps(asdict(r)) + "\n" for r in records), encoding="utf-8")
+    emails = EmailStore.from_dataframe(pd.DataFrame({
+        "subject": ["Email 0", "Email 1"],
+        "sender": ["a@example.com"] * 2,
+        "recipients": ["support@travelagency.com"] * 2,
+        "body": ["Please book a room."] * 2
+    }))
+    pipeline = PromptEvaluationPipeline(UnusedExecutor(), UnusedExecutor(), max_threads=2, plots=False)
+
+    stats = pipeline.run_multiple_evaluations(
+        emails, str(tmp_path), CLASSIFICATION_PROMPT, EVALUATION_PROMPT, num_runs=1, resume=str(checkpoint)
+    )
+
+    assert stats.mean_accuracy == 7.0
+    assert abs(stats.total_saved_cost - 0.75) < 1e-12
+    assert abs(stats.total_classification_cost - 0.02) < 1e-12
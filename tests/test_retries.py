@@ -0,0 +1,42 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from prompt_evaluation_pipeline import OpenAIExecutor, RetriesExhaustedError, RetryPolicy
+
+
+def _response(content):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, prompt_tokens_details=None)
+    )
+
+
+def _executor(contents):
+    executor = OpenAIExecutor(api_key="sk-test", model="gpt-4o-mini")
+    replies = iter(contents)
+    create = lambda **kwargs: _response(next(replies))
+    executor.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return executor
+
+
+def test_missing_content_is_retried_like_invalid_json():
+    output, _, stats = _executor([None, json.dumps({"score": 7})]).execute_with_stats("prompt")
+    assert output == {"score": 7}
+    assert stats.attempts == 2
+
+
+def test_missing_content_exhausts_the_json_budget_with_stats():
+    with pytest.raises(RetriesExhaustedError) as raised:
+        _executor([None, None, None]).execute_with_stats("prompt")
+    assert raised.value.stats.attempts == 3
+    assert raised.value.stats.prompt_tokens == 30
+
+
+def test_retry_after_hint_is_capped_at_max_delay():
+    error = Exception("rate limited")
+    error.response = SimpleNamespace(headers={"retry-after": "7200"})
+    assert RetryPolicy(max_delay=5.0).backoff(1, error) == 5.0
+    error.response = SimpleNamespace(headers={"retry-after": "2"})
+    assert RetryPolicy(max_delay=5.0).backoff(1, error) == 2.0
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from prompt_evaluation_pipeline import EmailStore, EvaluationResult
+from sampling import StratifiedPopulation
+
+
+def _population(ids):
+    emails = EmailStore(
+        ids=ids,
+        subjects=[f"Subject {i}" for i in ids],
+        senders=["a@example.com"] * len(ids),
+        recipients=["b@example.com"] * len(ids),
+        bodies=["Body"] * len(ids)
+    )
+    return StratifiedPopulation(emails, ["work"] * len(ids))
+
+
+def _result(email_id, purpose):
+    return EvaluationResult(
+        id=email_id,
+        subject="",
+        predicted_json=json.dumps({"purpose": purpose}),
+        validation_score=10.0,
+        validation_evaluation="",
+        classification_cost=0.0,
+        evaluation_cost=0.0,
+        run_id=0
+    )
+
+
+def test_predicted_purpose_is_joined_on_email_ids():
+    population = _population([100, 200, 300])
+    refined = population.with_predicted_purpose(
+        [_result(300, "invoice"), _result(100, "meeting")], min_stratum_size=1
+    )
+    assert refined.strata == ("work / meeting", "work / other", "work / invoice")
+
+
+def test_results_of_unknown_emails_raise():
+    population = _population([100, 200, 300])
+    with pytest.raises(ValueError):
+        population.with_predicted_purpose([_result(0, "invoice")])
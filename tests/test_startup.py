@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("module", ["prompt_evaluation_pipeline", "batch_api", "replay", "benchmark"])
+def test_import_does_not_load_heavy_dependencies(module):
+    code = (
+        f"import sys, {module}; "
+        "print(','.join(m for m in ('openai', 'pandas', 'plotly') if m in sys.modules))"
+    )
+    loaded = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout.strip()
+    assert loaded == ""
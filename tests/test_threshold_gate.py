@@ -0,0 +1,32 @@
+from threshold_gate import DatasetThreshold, GateSettings, _DatasetState
+
+
+def _state(scores, threshold, total=200):
+    state = _DatasetState(DatasetThreshold("test", "unused.csv", threshold), list(range(total)), list(range(total)))
+    state.scores = list(scores)
+    return state
+
+
+def test_identical_scores_do_not_give_a_zero_width_interval():
+    mean, lower, upper = _state([9.0] * 20, threshold=8.5).bounds(GateSettings.confidence_z)
+    assert mean == 9.0
+    assert lower < 8.5 < upper
+
+
+def test_identical_scores_near_threshold_do_not_decide_early():
+    settings = GateSettings(min_samples=20)
+    for score, threshold in ((9.0, 8.5), (10.0, 9.5), (5.0, 5.5)):
+        state = _state([score] * 20, threshold)
+        state.update_decision(settings)
+        assert state.decision is None
+
+
+def test_clear_cases_still_stop_early():
+    settings = GateSettings(min_samples=20)
+    passing = _state([9.0] * 20, threshold=6.0)
+    passing.update_decision(settings)
+    assert passing.decision is True and passing.early_stopped
+
+    failing = _state([2.0] * 20, threshold=6.0)
+    failing.update_decision(settings)
+    assert failing.decision is False and failing.early_stopped
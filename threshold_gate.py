@@ -0,0 +1,245 @@
+import json
+import math
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from prompt_evaluation_pipeline import (
+    EmailProcessor,
+    EmailStore,
+    EvaluationResult,
+    PromptExecutor,
+)
+from pre_scorer import RuleBasedPreScorer
+from prompt_template import PromptTemplate
+
+
+# Validation scores lie in this range
+SCORE_MIN, SCORE_MAX = 0.0, 10.0
+
+
+@dataclass
+class DatasetThreshold:
+    """One dataset of the gate and the accuracy (mean score, 0-10) it must reach."""
+    name: str
+    path: str
+    threshold: float
+
+
+@dataclass
+class GateSettings:
+    confidence_z: float = 2.576
+    min_samples: int = 20
+
+
+def load_manifest(path: str) -> Tuple[List[DatasetThreshold], GateSettings]:
+    """Read a dataset/threshold manifest such as config/dataset_thresholds.json."""
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    datasets = [DatasetThreshold(**entry) for entry in manifest["datasets"]]
+    settings = GateSettings(
+        confidence_z=manifest.get("confidence_z", GateSettings.confidence_z),
+        min_samples=manifest.get("min_samples", GateSettings.min_samples)
+    )
+    return datasets, settings
+
+
+@dataclass
+class DatasetGateResult:
+    name: str
+    threshold: float
+    accuracy: float
+    lower_bound: float
+    upper_bound: float
+    emails_evaluated: int
+    emails_total: int
+    passed: bool
+    early_stopped: bool
+    classification_cost: float
+    evaluation_cost: float
+
+
+@dataclass
+class GateReport:
+    results: List[DatasetGateResult]
+
+    @property
+    def passed(self) -> bool:
+        return all(r.passed for r in self.results)
+
+    def to_dict(self) -> dict:
+        return {"passed": self.passed, "datasets": [asdict(r) for r in self.results]}
+
+
+@dataclass
+class _DatasetState:
+    """Sampling progress of one dataset while the gate runs."""
+    spec: DatasetThreshold
+    emails: EmailStore
+    order: List[int]
+    next_position: int = 0
+    scores: List[float] = field(default_factory=list)
+    classification_cost: float = 0.0
+    evaluation_cost: float = 0.0
+    decision: Optional[bool] = None
+    early_stopped: bool = False
+
+    @property
+    def has_work(self) -> bool:
+        return self.decision is None and self.next_position < len(self.order)
+
+    def bounds(self, z: float) -> Tuple[float, float, float]:
+        """Mean score and its confidence bounds, with a finite population correction.
+        
+        The variance is at least that of the scores plus one pseudo-score at
+        each end of the range, in the spirit of the Agresti-Coull interval.
+        Identical scores, e.g. from a cached judge, therefore never give a
+        zero-width interval.
+        """
+        n = len(self.scores)
+        total = len(self.emails)
+        if n == 0:
+            return 0.0, SCORE_MIN, SCORE_MAX
+        mean = sum(self.scores) / n
+        if n >= total or n < 2:
+            half_width = 0.0 if n >= total else SCORE_MAX - SCORE_MIN
+        else:
+            variance = sum((s - mean) ** 2 for s in self.scores) / (n - 1)
+            padded = self.scores + [SCORE_MIN, SCORE_MAX]
+            padded_mean = sum(padded) / len(padded)
+            variance_floor = sum((s - padded_mean) ** 2 for s in padded) / (len(padded) - 1)
+            fpc = math.sqrt((total - n) / (total - 1))
+            half_width = z * math.sqrt(max(variance, variance_floor) / n) * fpc
+        return mean, max(mean - half_width, SCORE_MIN), min(mean + half_width, SCORE_MAX)
+
+    def update_decision(self, settings: GateSettings) -> None:
+        if self.decision is not None:
+            return
+        n = len(self.scores)
+        if n >= len(self.emails):
+            mean, _, _ = self.bounds(settings.confidence_z)
+            self.decision = mean >= self.spec.threshold
+        elif n >= settings.min_samples:
+            _, lower, upper = self.bounds(settings.confidence_z)
+            if lower >= self.spec.threshold:
+                self.decision, self.early_stopped = True, True
+            elif upper < self.spec.threshold:
+                self.decision, self.early_stopped = False, True
+
+
+class ThresholdGate:
+    """Evaluates a prompt against several datasets with per-dataset accuracy thresholds.
+
+    All datasets share one thread pool and are sampled round-robin in a seeded
+    random order. A dataset stops early once the confidence interval of its
+    accuracy lies entirely above (pass) or below (fail) its threshold; an
+    email that errors counts as a score of 0, as in the main pipeline.
+    """
+
+    def __init__(
+        self,
+        classification_executor: PromptExecutor,
+        evaluation_executor: PromptExecutor,
+        max_threads: int = 5,
+        settings: Optional[GateSettings] = None,
+        seed: int = 0,
+        pre_scorer: Optional[RuleBasedPreScorer] = None
+    ):
+        self.processor = EmailProcessor(classification_executor, evaluation_executor, pre_scorer)
+        self.max_threads = max_threads
+        self.settings = settings or GateSettings()
+        self.seed = seed
+
+    def run(
+        self,
+        datasets: List[DatasetThreshold],
+        classification_prompt: Union[str, PromptTemplate],
+        evaluation_prompt: Union[str, PromptTemplate],
+        output_dir: Optional[str] = None
+    ) -> GateReport:
+        classification_prompt = PromptTemplate.for_classification(classification_prompt)
+        evaluation_prompt = PromptTemplate.for_evaluation(evaluation_prompt)
+        rng = random.Random(self.seed)
+        states = []
+        for spec in datasets:
+            emails = EmailStore.from_csv(spec.path)
+            order = list(range(len(emails)))
+            rng.shuffle(order)
+            states.append(_DatasetState(spec=spec, emails=emails, order=order))
+
+        rows: List[dict] = []
+        owners: Dict[Future, _DatasetState] = {}
+        max_pending = 2 * self.max_threads
+
+        with ThreadPoolExecutor(self.max_threads) as executor:
+            while True:
+                # Top up the pool round-robin across undecided datasets
+                while len(owners) < max_pending:
+                    active = [s for s in states if s.has_work]
+                    if not active:
+                        break
+                    for state in active:
+                        if len(owners) >= max_pending:
+                            break
+                        position = state.order[state.next_position]
+                        state.next_position += 1
+                        future = executor.submit(
+                            self.processor.process_single_email,
+                            state.emails[position],
+                            classification_prompt,
+                            evaluation_prompt,
+                            state.emails.ids[position],
+                            0
+                        )
+                        owners[future] = state
+                if not owners:
+                    break
+
+                done, _ = wait(owners, return_when=FIRST_COMPLETED)
+                for future in done:
+                    state = owners.pop(future)
+                    if future.cancelled():
+                        continue
+                    result: EvaluationResult = future.result()
+                    state.scores.append(result.validation_score or 0.0)
+                    state.classification_cost += result.classification_cost
+                    state.evaluation_cost += result.evaluation_cost
+                    rows.append({"dataset": state.spec.name, **vars(result)})
+                    was_undecided = state.decision is None
+                    state.update_decision(self.settings)
+                    if was_undecided and state.decision is not None:
+                        print(f"{state.spec.name}: {'PASS' if state.decision else 'FAIL'} "
+                              f"after {len(state.scores)}/{len(state.emails)} emails")
+                        # Drop this dataset's queued emails; running ones still finish
+                        for pending, owner in list(owners.items()):
+                            if owner is state and pending.cancel():
+                                owners.pop(pending)
+
+        report = GateReport([self._dataset_result(state) for state in states])
+        if output_dir:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            pd.DataFrame(rows).to_csv(os.path.join(output_dir, f"gate_results_{timestamp}.csv"), index=False)
+            with open(os.path.join(output_dir, f"gate_report_{timestamp}.json"), "w", encoding="utf-8") as f:
+                json.dump(report.to_dict(), f, indent=2)
+        return report
+
+    def _dataset_result(self, state: _DatasetState) -> DatasetGateResult:
+        mean, lower, upper = state.bounds(self.settings.confidence_z)
+        return DatasetGateResult(
+            name=state.spec.name,
+            threshold=state.spec.threshold,
+            accuracy=mean,
+            lower_bound=lower,
+            upper_bound=upper,
+            emails_evaluated=len(state.scores),
+            emails_total=len(state.emails),
+            passed=bool(state.decision),
+            early_stopped=state.early_stopped,
+            classification_cost=state.classification_cost,
+            evaluation_cost=state.evaluation_cost
+        )